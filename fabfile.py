@@ -125,6 +125,51 @@ def install_ats_chrony():
 
 
 
+@task
+@runs_once
+def rolling(name, window="10%", max_failures="0", check=None, pause=0):
+    """
+    Runs a task on the hosts in waves, e.g. fab rolling:update,window=10%
+    """
+    # Imported here since geonet.config requires the AWS environment, which
+    # the tasks that only use SSH do not.
+    from geonet.remote import Host
+    from geonet.rollout import Rollout, fabric_task
+
+    config = load_ssh_config(SSH_CONFIG)
+    hosts = [Host.from_config(host, config[host]) for host in env.hosts]
+
+    def progress(idx, nwaves, wave, results):
+        failed = [result for result in results if not result.ok]
+        print("wave {}/{}: {} ok, {} failed".format(
+            idx + 1, nwaves, len(results) - len(failed), len(failed)
+        ))
+        for result in failed:
+            print("  {}: {}".format(result.host, result.summary()))
+
+    rollout = Rollout(
+        fabric_task(globals()[name]), window=window,
+        max_failures=max_failures, pause=float(pause), callback=progress,
+        check=fabric_task(globals()[check]) if check else None,
+    )
+    report = rollout.run(hosts)
+
+    table = [["Succeeded", "Failed", "Skipped"]]
+    table.append([len(report.succeeded), len(report.failed), len(report.skipped)])
+    print(tabulate(table))
+    if report.halted:
+        print("rollout halted after {} hosts failed".format(len(report.failed)))
+
+
+@task
+@parallel
+def uptime():
+    """
+    Prints the uptime of the hosts, e.g. as the health check of a rollout
+    """
+    run("uptime")
+
+
 ##########################################################################
 ## Helper Functions
 ##########################################################################
@@ -8,40 +8,96 @@
 
 """
 Commands for the GeoNet CLI Utility
+
+The commands are listed in a manifest rather than imported here, since the
+command modules import libraries such as boto3, requests and numpy that are
+slow to import, as well as the user configuration. The console registers
+every command by name and help text and only imports the module of the
+command that is actually run.
 """
 
 ##########################################################################
 ## Imports
 ##########################################################################
 
-from .config import ConfigCommand
-from .status import StatusCommand
-from .regions import RegionsCommand
-from .descr import DescribeCommand
-from .template import TemplateCommand
-from .launch import LaunchCommand
-from .list import ListCommand
-from .stop import StopCommand
-from .start import StartCommand
-from .destroy import DestroyCommand
-from .hosts import HostsCommand
-from .sgs import SecurityGroupCreateCommand
-from .sgs import SecurityGroupAuthCommand
-from .sgs import SecurityGroupDestroyCommand
-from .sgs import SecurityGroupRevokeCommand
-from .kahu import KahuStatusCommand
-from .kahu import KahuListCommand
-from .kahu import KahuTokensCommand
-from .kahu import KahuCreateReplicaCommand
-from .kahu import KahuActivateCommand
-
-
-# List of all commands
+from importlib import import_module
+
+
+##########################################################################
+## Command Manifest
+##########################################################################
+
+# List of all commands as (name, module:class, help) -- the name and help must
+# match the command class, which is checked by the test suite.
 COMMANDS = [
-    ConfigCommand, StatusCommand, RegionsCommand, DescribeCommand,
-    TemplateCommand, LaunchCommand, ListCommand, StopCommand, StartCommand,
-    DestroyCommand, HostsCommand, SecurityGroupCreateCommand,
-    SecurityGroupDestroyCommand, SecurityGroupAuthCommand,
-    SecurityGroupRevokeCommand, KahuStatusCommand, KahuListCommand,
-    KahuTokensCommand, KahuCreateReplicaCommand, KahuActivateCommand
+    ("config", "geonet.commands.config:ConfigCommand",
+     "show the current config and environment"),
+    ("status", "geonet.commands.status:StatusCommand",
+     "lists the status of managed instances"),
+    ("regions", "geonet.commands.regions:RegionsCommand",
+     "describe configured regions"),
+    ("descr", "geonet.commands.descr:DescribeCommand",
+     "describe available ec2 resources"),
+    ("template", "geonet.commands.template:TemplateCommand",
+     "create and manage launch templates"),
+    ("launch", "geonet.commands.launch:LaunchCommand",
+     "launch instances using the alia template"),
+    ("list", "geonet.commands.list:ListCommand",
+     "list and edit instances under management"),
+    ("stop", "geonet.commands.stop:StopCommand",
+     "stop instances under management"),
+    ("start", "geonet.commands.start:StartCommand",
+     "start instances under management"),
+    ("destroy", "geonet.commands.destroy:DestroyCommand",
+     "destroy instances under management"),
+    ("hosts", "geonet.commands.hosts:HostsCommand",
+     "get the SSH host information for running instances"),
+    ("exec", "geonet.commands.remote:ExecCommand",
+     "run a shell command on the managed hosts over pooled SSH"),
+    ("rollout", "geonet.commands.remote:RolloutCommand",
+     "roll a shell command out to the managed hosts in waves"),
+    ("distribute", "geonet.commands.remote:DistributeCommand",
+     "copy an artifact to the hosts through a seed replica per region"),
+    ("daemon", "geonet.commands.daemon:DaemonCommand",
+     "serve a continuously refreshed inventory to other commands"),
+    ("shell", "geonet.commands.shell:ShellCommand",
+     "run geonet commands interactively with warm clients and caches"),
+    ("sg:create", "geonet.commands.sgs:SecurityGroupCreateCommand",
+     "create the default alia security group"),
+    ("sg:destroy", "geonet.commands.sgs:SecurityGroupDestroyCommand",
+     "delete security group from specified region"),
+    ("sg:auth", "geonet.commands.sgs:SecurityGroupAuthCommand",
+     "add ingress rule to security group"),
+    ("sg:revoke", "geonet.commands.sgs:SecurityGroupRevokeCommand",
+     "revoke ingress rule for security group"),
+    ("kahu", "geonet.commands.kahu:KahuStatusCommand",
+     "report the Kahu service status and version"),
+    ("kahu:list", "geonet.commands.kahu:KahuListCommand",
+     "list the active replicas in Kahu"),
+    ("kahu:tokens", "geonet.commands.kahu:KahuTokensCommand",
+     "fetch the replica API keys from Kahu"),
+    ("kahu:create", "geonet.commands.kahu:KahuCreateReplicaCommand",
+     "create a Kahu replica from an AWS instance"),
+    ("kahu:activate", "geonet.commands.kahu:KahuActivateCommand",
+     "activate the replicas that geonet is managing and deactivate all others"),
+    ("latency:ingest", "geonet.commands.latency:LatencyIngestCommand",
+     "aggregate raw latency probe logs into a latency data set"),
+    ("latency:convert", "geonet.commands.latency:LatencyConvertCommand",
+     "convert a latencies csv into a memory-mapped latency dataset"),
+    ("latency:quantiles", "geonet.commands.latency:LatencyQuantilesCommand",
+     "report link or quorum latency quantiles from dataset sketches"),
+    ("latency:simulate", "geonet.commands.latency:LatencySimulateCommand",
+     "simulate quorum round latencies for a leader and replicas"),
+    ("latency:relays", "geonet.commands.latency:LatencyRelaysCommand",
+     "report pairs of hosts that are faster through a relay than direct"),
+    ("latency:tiers", "geonet.commands.latency:LatencyTiersCommand",
+     "cluster hosts into latency tiers and annotate the region data"),
 ]
+
+
+def load_command(path):
+    """
+    Imports and returns the command class from a "module:class" path.
+    """
+    module, klass = path.split(":")
+    return getattr(import_module(module), klass)
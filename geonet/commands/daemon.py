@@ -0,0 +1,86 @@
+# geonet.commands.daemon
+# Runs the inventory daemon or reports its status.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Sat Oct 24 11:32:06 2026 -0400
+#
+# ID: daemon.py [] benjamin@bengfort.com $
+
+"""
+Runs the inventory daemon or reports its status.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from commis import Command
+
+from geonet.daemon import DaemonClient, SOCKET
+from geonet.inventory import Inventory, InventoryServer, POLL_INTERVAL
+
+
+##########################################################################
+## Command Description
+##########################################################################
+
+class DaemonCommand(Command):
+
+    name = "daemon"
+    help = "serve a continuously refreshed inventory to other commands"
+    args = {
+        ('-s', '--socket'): {
+            'default': SOCKET, 'metavar': 'PATH',
+            'help': 'path of the unix socket to listen on',
+        },
+        ('-i', '--interval'): {
+            'type': float, 'default': POLL_INTERVAL, 'metavar': 'SEC',
+            'help': 'seconds between refreshes of changing instances',
+        },
+        '--status': {
+            'action': 'store_true',
+            'help': 'report the status of the running daemon and exit',
+        },
+        '--stop': {
+            'action': 'store_true',
+            'help': 'stop the running daemon and exit',
+        },
+    }
+
+    def handle(self, args):
+        """
+        Runs the daemon in the foreground until it is interrupted or stopped.
+        """
+        if args.status or args.stop:
+            return self.control(args)
+
+        server = InventoryServer(Inventory(interval=args.interval), args.socket)
+
+        print("serving inventory on {} (ctrl+c to stop)".format(args.socket))
+        try:
+            server.serve()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    def control(self, args):
+        """
+        Reports the status of or stops the daemon listening on the socket.
+        """
+        client = DaemonClient(args.socket)
+        if args.stop:
+            client.request("shutdown")
+            print("stopped daemon on {}".format(args.socket))
+            return
+
+        status = client.request("status")
+
+        print((
+            "daemon {pid} up {uptime:0.0f}s serving {entries} calls in "
+            "{nregions} regions: {hits} hits, {misses} misses, "
+            "{refreshes} refreshes, {errors} errors"
+        ).format(nregions=len(status["regions"]), **status))
+
+        for region, state in sorted(status["unhealthy"].items()):
+            print("{}: circuit {}".format(region, state))
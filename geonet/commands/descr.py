@@ -19,6 +19,7 @@ from commis import color
 from commis import Command
 from tabulate import tabulate
 
+from geonet.health import health
 from geonet.region import Regions
 from geonet.utils.timer import Timer
 from geonet.ec2 import Instance, Volume
@@ -120,6 +121,17 @@ class DescribeCommand(Command):
         if args.timer:
             print("request took {}".format(timer))
 
+    def display(self, table, args):
+        """
+        Prints the table with a footer noting the regions that were skipped
+        or served from cache because they are unhealthy.
+        """
+        print(tabulate(table, tablefmt=args.format, headers='firstrow'))
+
+        footer = health.footer()
+        if footer:
+            print(color.format(footer, color.LIGHT_YELLOW))
+
     def handle_instances(self, args):
         """
         Describe instances in each region
@@ -132,11 +144,11 @@ class DescribeCommand(Command):
 
         for instance in instances:
             table.append([
-                instance.state_light(), instance.region.name, instance.zone,
+                instance.state_light(), health.label(instance.region), instance.zone,
                 str(instance), instance.name, instance.vm_type, instance.ipaddr,
             ])
 
-        print(tabulate(table, tablefmt=args.format, headers='firstrow'))
+        self.display(table, args)
 
     def handle_volumes(self, args):
         """
@@ -150,12 +162,12 @@ class DescribeCommand(Command):
 
         for volume in volumes:
             table.append([
-                volume.state_light(), volume.region.name,
+                volume.state_light(), health.label(volume.region),
                 str(volume), volume.name,
                 ", ".join(list(volume.attached_to()))
             ])
 
-        print(tabulate(table, tablefmt=args.format, headers='firstrow'))
+        self.display(table, args)
 
     def handle_security_groups(self, args):
         """
@@ -175,10 +187,10 @@ class DescribeCommand(Command):
             ])
 
             table.append([
-                group.region.name, str(group), group.name, ports
+                health.label(group.region), str(group), group.name, ports
             ])
 
-        print(tabulate(table, tablefmt=args.format, headers='firstrow'))
+        self.display(table, args)
 
 
     def handle_placement_groups(self, args):
@@ -194,10 +206,10 @@ class DescribeCommand(Command):
 
         for group in groups:
             table.append([
-                group.region.name, group.name, group.state, group.strategy, group.partition_count(),
+                health.label(group.region), group.name, group.state, group.strategy, group.partition_count(),
             ])
 
-        print(tabulate(table, tablefmt=args.format, headers='firstrow'))
+        self.display(table, args)
 
 
     def handle_launch_templates(self, args):
@@ -216,10 +228,10 @@ class DescribeCommand(Command):
             )
 
             table.append([
-                template.region.name, str(template), template.name, version,
+                health.label(template.region), str(template), template.name, version,
             ])
 
-        print(tabulate(table, tablefmt=args.format, headers='firstrow'))
+        self.display(table, args)
 
     def handle_images(self, args):
         """
@@ -233,10 +245,10 @@ class DescribeCommand(Command):
         table = [["Region", "AMI", "Name", "Size", "Disk"]]
         for image in images:
             table.append([
-                image.region.name, str(image), image.name, image.size, image.disk
+                health.label(image.region), str(image), image.name, image.size, image.disk
             ])
 
-        print(tabulate(table, tablefmt=args.format, headers='firstrow'))
+        self.display(table, args)
 
     def handle_key_pairs(self, args):
         """
@@ -251,11 +263,11 @@ class DescribeCommand(Command):
 
         for key in pairs:
             table.append([
-                key.region.name, key.name, key.fingerprint,
+                health.label(key.region), key.name, key.fingerprint,
                 CHECKS[key.has_valid_key()]
             ])
 
-        print(tabulate(table, tablefmt=args.format, headers='firstrow'))
+        self.display(table, args)
 
     def handle_availability_zones(self, args):
         """
@@ -269,7 +281,7 @@ class DescribeCommand(Command):
         table = [["Region", "Name", "State", "Messages"]]
         for zone in zones:
             table.append([
-                zone.region.name, zone.name, zone.state, ", ".join(list(zone.messages()))
+                health.label(zone.region), zone.name, zone.state, ", ".join(list(zone.messages()))
             ])
 
-        print(tabulate(table, tablefmt=args.format, headers='firstrow'))
\ No newline at end of file
+        self.display(table, args)
\ No newline at end of file
@@ -8,6 +8,14 @@
 
 """
 Creates a host file for instances currently running.
+
+The hosts are written sorted by name so that the output only changes when the
+hosts do. When an outpath is given, the hosts already in it are compared to
+the hosts of the running instances and the file is only replaced (atomically)
+if a host was added, removed or changed, so that the command can be run in a
+loop without touching the file and the tools watching it. Hosts are not
+removed while a region is skipped because it is unhealthy, so that an outage
+of EC2 does not remove the hosts of the region from the file.
 """
 
 ##########################################################################
@@ -17,12 +25,25 @@ Creates a host file for instances currently running.
 import os
 import sys
 import json
+import stat
 
 from commis import Command
-from collections import defaultdict
-from contextlib import contextmanager
 
+from geonet.health import health
 from geonet.managed import ManagedInstances
+from geonet.utils.ssh import load_ssh_config, parse_ssh_config
+from geonet.utils.ssh import ssh_hosts, diff_hosts
+
+
+# Template of each host in the SSH config
+CONFIG = (
+    "Host {host}\n"
+    "    HostName {hostname}\n"
+    "    User {user}\n"
+    "    Port {port}\n"
+    "    IdentityFile {key}\n"
+    "    ForwardAgent {forward_agent}\n\n"
+)
 
 
 ##########################################################################
@@ -70,57 +91,151 @@ class HostsCommand(Command):
         # Load the instance manager and get instance information
         manager = ManagedInstances.load()
 
-        # Default host data
-        defaults = {
-            'user': args.user,
-            'port': args.port,
-            'forward_agent': False if args.no_forward_agent else True
-        }
-
         # Get the SSH information for each instance
-        hosts = defaultdict(lambda: defaults.copy())
-        for instance in manager.status():
-            host = hosts[instance.name]
-            host["hostname"] = instance.ipaddr if args.ipaddr else instance.hostname
-            host["key"] = os.path.join(args.ssh_dir, "{}.pem".format(instance["KeyName"]))
-
-        # Write out the data to the outpath
-        if args.format == 'json':
-            self.write_json(hosts, args.outpath)
-
-        elif args.format == 'config':
-            self.write_config(hosts, args.outpath)
-
-        else:
-            raise ValueError("unknown hosts format '{}'".format(args.format))
-
-    def write_json(self, hosts, outpath):
-        """
-        Write JSON hosts to specified otuput
-        """
-        with self.open(outpath) as f:
-            json.dump(hosts, f, indent=2)
-
-    def write_config(self, hosts, outpath):
-        """
-        Write SSH config file data to specified output
-        """
-        with self.open(outpath) as f:
-            for host, info in hosts.items():
-                output = (
-                    "Host {host}\n"
-                    "    HostName {hostname}\n"
-                    "    User {user}\n"
-                    "    Port {port}\n"
-                    "    IdentityFile {key}\n"
-                    "    ForwardAgent {forward_agent}\n\n"
-                )
-                f.write(output.format(host=host, **info))
-
-    @contextmanager
-    def open(self, outpath):
-        if outpath is None:
-            yield sys.stdout
-        else:
-            with open(outpath, 'w') as f:
-                yield f
+        hosts = ssh_hosts(
+            manager.status(), user=args.user, port=args.port,
+            ssh_dir=args.ssh_dir, ipaddr=args.ipaddr,
+            forward_agent=not args.no_forward_agent,
+        )
+
+        if args.outpath is None:
+            sys.stdout.write(self.render(hosts, args.format))
+            return
+
+        return self.update(args.outpath, hosts, args.format)
+
+    def render(self, hosts, format):
+        """
+        Returns the hosts rendered in the output format
+        """
+        if format == 'json':
+            return self.render_json(hosts)
+
+        if format == 'config':
+            return self.render_config(hosts)
+
+        raise ValueError("unknown hosts format '{}'".format(format))
+
+    def render_json(self, hosts):
+        """
+        Returns the JSON hosts sorted by name
+        """
+        return json.dumps(hosts, indent=2, sort_keys=True) + "\n"
+
+    def render_config(self, hosts):
+        """
+        Returns the SSH config of the hosts sorted by name
+        """
+        return "".join(
+            CONFIG.format(
+                host=host, hostname=info["hostname"], user=info["user"],
+                port=info["port"], key=info["key"],
+                forward_agent="yes" if info["forward_agent"] else "no",
+            )
+            for host, info in sorted(hosts.items())
+        )
+
+    def parse(self, output, format):
+        if format == 'json':
+            return json.loads(output)
+        return parse_ssh_config(output.splitlines())
+
+    def read(self, outpath, format):
+        """
+        Returns the hosts currently in the outpath, None if it does not exist
+        or empty if it cannot be parsed so that it is rewritten.
+        """
+        if not os.path.exists(outpath):
+            return None
+
+        try:
+            if format == 'json':
+                with open(outpath, 'r') as f:
+                    return json.load(f)
+            return load_ssh_config(outpath)
+        except ValueError:
+            return {}
+
+    def preamble(self, outpath):
+        """
+        Returns the lines of the SSH config before the first Host verbatim,
+        e.g. global options and comments, so that they are written back.
+        """
+        lines = []
+        with open(outpath, 'r') as f:
+            for line in f:
+                words = line.split()
+                if words and words[0].lower() == "host":
+                    break
+                lines.append(line)
+
+        preamble = "".join(lines)
+        if preamble and not preamble.endswith("\n"):
+            preamble += "\n"
+        return preamble
+
+    def keep(self, current, hosts, format):
+        """
+        Returns the hosts in current that are not in hosts but may be in a
+        region that was skipped because it is unhealthy, in the format of
+        ssh_hosts. Without the region of a host in the SSH config, every
+        missing host is kept while any region was skipped.
+        """
+        skipped = set(region for region, cached in health.skipped.items() if not cached)
+        if not skipped:
+            return {}
+
+        kept = {}
+        for name, info in current.items():
+            if name is None or name in hosts:
+                continue
+
+            if format == 'json':
+                if info.get("region") in skipped or not info.get("region"):
+                    kept[name] = info
+                continue
+
+            kept[name] = {
+                "hostname": info.get("HostName", name),
+                "user": info.get("User"),
+                "port": info.get("Port"),
+                "key": info.get("IdentityFile"),
+                "forward_agent": info.get("ForwardAgent", "no") == "yes",
+            }
+        return kept
+
+    def update(self, outpath, hosts, format):
+        """
+        Replaces the outpath with the hosts if they have changed, writing them
+        to a temporary file with the mode of the outpath that is renamed over
+        it. Hosts of unhealthy regions that were skipped are kept.
+        """
+        current = self.read(outpath, format)
+        kept = self.keep(current or {}, hosts, format)
+        hosts = dict(hosts)
+        hosts.update(kept)
+
+        output = self.render(hosts, format)
+        if format == 'config' and current is not None:
+            output = self.preamble(outpath) + output
+
+        added, removed, changed = diff_hosts(current or {}, self.parse(output, format))
+        note = " (kept {} hosts of skipped regions)".format(len(kept)) if kept else ""
+
+        if current is not None and not (added or removed or changed):
+            return "{} is up to date{}".format(outpath, note)
+
+        tmp = "{}.{}".format(outpath, os.getpid())
+        try:
+            with open(tmp, 'w') as f:
+                f.write(output)
+            if current is not None:
+                os.chmod(tmp, stat.S_IMODE(os.stat(outpath).st_mode))
+            os.rename(tmp, outpath)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        return "updated {}: {} added, {} removed, {} changed{}".format(
+            outpath, len(added), len(removed), len(changed), note
+        )
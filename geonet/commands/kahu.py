@@ -23,6 +23,7 @@ from commis import Command
 from tabulate import tabulate
 
 from geonet.kahu import Kahu
+from geonet.utils.stats import recorder
 from geonet.managed import ManagedInstances
 
 CHECKMARK  = color.format(u"✓", color.LIGHT_GREEN)
@@ -168,6 +169,7 @@ class KahuCreateReplicaCommand(Command):
 
         # Look up instance details
         ec2 = boto3.resource('ec2', region_name=str(region))
+        recorder.instrument(ec2.meta.client)
         instance = ec2.Instance(instance_id)
 
         try:
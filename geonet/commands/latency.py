@@ -0,0 +1,344 @@
+# geonet.commands.latency
+# Commands for analyzing network latencies between replicas.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 11:48:20 2026 -0400
+#
+# ID: latency.py [] benjamin@bengfort.com $
+
+"""
+Commands for analyzing network latencies between replicas.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import sys
+
+from commis import color
+from commis import Command
+from tabulate import tabulate
+
+from geonet.region import Regions
+from geonet.latency import LatencyAggregator, LatencyDataset
+from geonet.latency.ingest import ingest, find_logs
+from geonet.latency.sketch import QUANTILES
+from geonet.latency.simulate import QuorumSimulator
+from geonet.latency.paths import RelayPaths
+from geonet.latency.cluster import LatencyTiers, LINKAGES, annotate_regions
+
+
+CSV_EXTENSIONS = (".csv", ".csv.gz")
+
+
+##########################################################################
+## Latency Ingest Command
+##########################################################################
+
+class LatencyIngestCommand(Command):
+
+    name = "latency:ingest"
+    help = "aggregate raw latency probe logs into a latency data set"
+    args = {
+        ('-o', '--outpath'): {
+            'required': True, 'metavar': 'PATH',
+            'help': 'latencies csv or dataset directory to write to',
+        },
+        ('-m', '--merge'): {
+            'default': None, 'metavar': 'PATH',
+            'help': 'existing latencies csv to fold the logs into',
+        },
+        ('-j', '--processes'): {
+            'type': int, 'default': None, 'metavar': 'N',
+            'help': 'number of processes to parse logs with (default all cores)',
+        },
+        ('-s', '--sketches'): {
+            'action': 'store_true', 'default': False,
+            'help': 'record quantile sketches of every link (requires a dataset directory outpath)',
+        },
+        '--src': {
+            'default': 'src', 'help': 'name of the source hostname column',
+        },
+        '--dst': {
+            'default': 'dst', 'help': 'name of the destination hostname column',
+        },
+        '--rtt': {
+            'default': 'rtt', 'help': 'name of the round trip time column',
+        },
+        'logs': {
+            'nargs': '+', 'metavar': 'PATH',
+            'help': 'raw probe logs or directories of logs to ingest',
+        },
+    }
+
+    def handle(self, args):
+        """
+        Handle the latency ingest command
+        """
+        # Sketches can only be stored in a latency dataset
+        if args.sketches and args.outpath.endswith(CSV_EXTENSIONS):
+            raise ValueError((
+                "cannot write sketches to {}: use a dataset directory as the outpath"
+            ).format(args.outpath))
+
+        logs = find_logs(args.logs)
+        if not logs:
+            raise ValueError("no probe logs found to ingest")
+
+        aggregator = LatencyAggregator.load(args.merge) if args.merge else None
+        aggregator = ingest(
+            logs, aggregator, processes=args.processes, callback=self.progress,
+            src=args.src, dst=args.dst, rtt=args.rtt, sketches=args.sketches,
+        )
+        sys.stderr.write("\n")
+
+        if args.outpath.endswith(CSV_EXTENSIONS):
+            aggregator.dump(args.outpath)
+        else:
+            LatencyDataset.from_aggregator(aggregator).dump(args.outpath)
+
+        return color.format(
+            "wrote {} links between {} hosts to {}", color.LIGHT_GREEN,
+            len(aggregator), len(aggregator.hosts), args.outpath
+        )
+
+    def progress(self, progress):
+        """
+        Report the ingestion throughput on a single line.
+        """
+        sys.stderr.write("\r" + color.format(str(progress), color.CYAN))
+        sys.stderr.flush()
+
+
+##########################################################################
+## Latency Convert Command
+##########################################################################
+
+class LatencyConvertCommand(Command):
+
+    name = "latency:convert"
+    help = "convert a latencies csv into a memory-mapped latency dataset"
+    args = {
+        'csv': {
+            'metavar': 'CSV', 'help': 'latencies csv in the fixture schema',
+        },
+        'dataset': {
+            'metavar': 'DIR', 'help': 'directory to write the dataset to',
+        },
+    }
+
+    def handle(self, args):
+        """
+        Handle the latency convert command
+        """
+        dataset = LatencyDataset.from_csv(args.csv)
+        dataset.dump(args.dataset)
+        return color.format(
+            "wrote dataset of {} hosts to {}", color.LIGHT_GREEN,
+            len(dataset), args.dataset
+        )
+
+
+##########################################################################
+## Latency Quantiles Command
+##########################################################################
+
+class LatencyQuantilesCommand(Command):
+
+    name = "latency:quantiles"
+    help = "report link or quorum latency quantiles from dataset sketches"
+    args = {
+        ('-q', '--quantiles'): {
+            'type': float, 'nargs': '+', 'default': list(QUANTILES),
+            'metavar': 'Q', 'help': 'quantiles to report between 0 and 1',
+        },
+        ('-Q', '--quorum'): {
+            'type': int, 'default': None, 'metavar': 'N',
+            'help': 'quorum size including the leader (default majority)',
+        },
+        'dataset': {
+            'metavar': 'DIR', 'help': 'latency dataset with sketches',
+        },
+        'leader': {
+            'metavar': 'SRC', 'help': 'hostname the messages are sent from',
+        },
+        'replicas': {
+            'nargs': '+', 'metavar': 'DST',
+            'help': 'hostname of a link or hostnames of the quorum replicas',
+        },
+    }
+
+    def handle(self, args):
+        """
+        Handle the latency quantiles command
+        """
+        dataset = LatencyDataset.load(args.dataset)
+        table = [["Quantile", "RTT (ms)"]]
+
+        if len(args.replicas) == 1:
+            values = dataset.quantiles(args.leader, args.replicas[0], args.quantiles)
+        else:
+            values = dataset.quorum_quantiles(
+                args.leader, args.replicas, args.quantiles, args.quorum
+            )
+
+        for q, value in zip(args.quantiles, values):
+            table.append(["p{:g}".format(q * 100), value])
+        print(tabulate(table, tablefmt="simple", headers='firstrow', floatfmt=".3f"))
+
+
+##########################################################################
+## Latency Simulate Command
+##########################################################################
+
+class LatencySimulateCommand(Command):
+
+    name = "latency:simulate"
+    help = "simulate quorum round latencies for a leader and replicas"
+    args = {
+        ('-n', '--trials'): {
+            'type': int, 'default': 1000000, 'metavar': 'N',
+            'help': 'number of rounds to simulate',
+        },
+        ('-q', '--quantiles'): {
+            'type': float, 'nargs': '+', 'default': list(QUANTILES),
+            'metavar': 'Q', 'help': 'quantiles to report between 0 and 1',
+        },
+        ('-Q', '--quorum'): {
+            'type': int, 'default': None, 'metavar': 'N',
+            'help': 'quorum size including the leader (default majority)',
+        },
+        ('-N', '--normal'): {
+            'action': 'store_true', 'default': False,
+            'help': 'sample from a normal fit even if sketches are available',
+        },
+        ('-t', '--timeouts'): {
+            'action': 'store_true', 'default': False,
+            'help': 'drop responses at the measured timeout rate',
+        },
+        '--seed': {
+            'type': int, 'default': None, 'help': 'random seed for reproducibility',
+        },
+        'dataset': {
+            'metavar': 'DIR', 'help': 'latency dataset to sample RTTs from',
+        },
+        'leader': {
+            'metavar': 'LEADER', 'help': 'hostname of the leader',
+        },
+        'replicas': {
+            'nargs': '+', 'metavar': 'REPLICA', 'help': 'hostnames of the replicas',
+        },
+    }
+
+    def handle(self, args):
+        """
+        Handle the latency simulate command
+        """
+        simulator = QuorumSimulator(
+            LatencyDataset.load(args.dataset), args.leader, args.replicas,
+            quorum=args.quorum, empirical=not args.normal,
+            timeouts=args.timeouts, seed=args.seed,
+        )
+
+        values = simulator.quantiles(args.quantiles, args.trials)
+        table = [["Quantile", "Round (ms)"]]
+        for q, value in zip(args.quantiles, values):
+            table.append(["p{:g}".format(q * 100), value])
+        print(tabulate(table, tablefmt="simple", headers='firstrow', floatfmt=".3f"))
+
+
+##########################################################################
+## Latency Relays Command
+##########################################################################
+
+class LatencyRelaysCommand(Command):
+
+    name = "latency:relays"
+    help = "report pairs of hosts that are faster through a relay than direct"
+    args = {
+        ('-t', '--threshold'): {
+            'type': float, 'default': 1.0, 'metavar': 'MS',
+            'help': 'minimum latency saved by relaying to report a pair',
+        },
+        ('-n', '--limit'): {
+            'type': int, 'default': None, 'metavar': 'N',
+            'help': 'maximum number of pairs to report',
+        },
+        'dataset': {
+            'metavar': 'DIR', 'help': 'latency dataset of mean RTTs',
+        },
+    }
+
+    def handle(self, args):
+        """
+        Handle the latency relays command
+        """
+        paths = RelayPaths.from_dataset(LatencyDataset.load(args.dataset))
+        relays = paths.relays(args.threshold)[:args.limit]
+
+        table = [["Source", "Target", "Direct (ms)", "Relayed (ms)", "Saved (ms)", "Path"]]
+        for row in relays:
+            table.append([
+                row["src"], row["dst"], row["direct"], row["relayed"],
+                row["savings"], " > ".join(row["path"][1:-1]),
+            ])
+        print(tabulate(table, tablefmt="simple", headers='firstrow', floatfmt=".3f"))
+
+
+##########################################################################
+## Latency Tiers Command
+##########################################################################
+
+class LatencyTiersCommand(Command):
+
+    name = "latency:tiers"
+    help = "cluster hosts into latency tiers and annotate the region data"
+    args = {
+        ('-k', '--clusters'): {
+            'type': int, 'default': None, 'metavar': 'K',
+            'help': 'number of tiers to split the hosts into',
+        },
+        ('-t', '--threshold'): {
+            'type': float, 'default': None, 'metavar': 'MS',
+            'help': 'split tiers further apart than this latency instead',
+        },
+        ('-m', '--method'): {
+            'choices': LINKAGES, 'default': 'average',
+            'help': 'linkage used to measure the latency between tiers',
+        },
+        ('-w', '--write'): {
+            'action': 'store_true', 'default': False,
+            'help': 'annotate matching regions with their tier in the region data',
+        },
+        'dataset': {
+            'metavar': 'DIR', 'help': 'latency dataset of mean RTTs',
+        },
+    }
+
+    def handle(self, args):
+        """
+        Handle the latency tiers command
+        """
+        if (args.clusters is None) == (args.threshold is None):
+            raise ValueError("specify either the number of tiers or a threshold")
+
+        tiers = LatencyTiers.from_dataset(
+            LatencyDataset.load(args.dataset), method=args.method
+        )
+        assignments = tiers.assign(n_clusters=args.clusters, threshold=args.threshold)
+
+        table = [["Tier", "Host"]]
+        for host, label in sorted(assignments.items(), key=lambda item: (item[1], item[0])):
+            table.append([label, host])
+        print(tabulate(table, tablefmt="simple", headers='firstrow'))
+
+        if args.write:
+            regions = Regions.load()
+            unmatched = annotate_regions(regions, assignments)
+            regions.dump()
+
+            if unmatched:
+                print(color.format(
+                    "no region found for {}", color.LIGHT_YELLOW, ", ".join(unmatched)
+                ))
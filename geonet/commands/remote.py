@@ -0,0 +1,324 @@
+# geonet.commands.remote
+# Runs shell commands on the managed hosts.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 27 10:21:45 2026 -0400
+#
+# ID: remote.py [] benjamin@bengfort.com $
+
+"""
+Runs shell commands on the managed hosts.
+
+The hosts and regions to run a command on are selected with repeated -H and
+-r options so that they are not confused with the command. The commands exit
+with an error status if the command failed on any host.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import pipes
+import threading
+
+from commis import color
+from commis import Command
+from tabulate import tabulate
+from collections import OrderedDict
+
+from geonet.config import settings
+from geonet.exceptions import RemoteCommandFailed
+from geonet.managed import ManagedInstances
+from geonet.utils.ssh import load_ssh_config, ssh_hosts
+from geonet.remote import Executor, Host, make_hosts, summarize
+from geonet.remote import MAX_CONNECTIONS, TIMEOUT
+from geonet.distribute import Distribution
+from geonet.rollout import Rollout, remote_task, CHECK_TIMEOUT, CHECK_INTERVAL
+
+
+##########################################################################
+## Command Description
+##########################################################################
+
+class ExecCommand(Command):
+
+    name = "exec"
+    help = "run a shell command on the managed hosts over pooled SSH"
+    args = {
+        'command': {
+            'nargs': '+', 'metavar': 'CMD',
+            'help': 'the shell command to run on every host',
+        },
+        ('-r', '--region'): {
+            'choices': settings.regions, 'default': None, 'dest': 'regions',
+            'metavar': 'REGION', 'action': 'append',
+            'help': 'region of the hosts to run the command on (repeatable)',
+        },
+        ('-H', '--host'): {
+            'default': None, 'dest': 'hosts', 'metavar': 'HOST', 'action': 'append',
+            'help': 'name of a host to run the command on (repeatable)',
+        },
+        ('-c', '--config'): {
+            'default': None, 'metavar': 'PATH',
+            'help': 'read the hosts from an SSH config instead of the managed instances',
+        },
+        ('-w', '--width'): {
+            'type': int, 'default': MAX_CONNECTIONS, 'metavar': 'N',
+            'help': 'maximum number of hosts to run the command on at once',
+        },
+        ('-t', '--timeout'): {
+            'type': float, 'default': TIMEOUT, 'metavar': 'SEC',
+            'help': 'seconds the command may run on each host',
+        },
+        ('-q', '--quiet'): {
+            'action': 'store_true', 'default': False,
+            'help': 'do not stream the output of the hosts, only summarize it',
+        },
+        '--sudo': {
+            'action': 'store_true', 'default': False,
+            'help': 'run the command as root with sudo',
+        },
+        ('-i', '--ipaddr'): {
+            'action': 'store_true', 'default': False,
+            'help': 'use IP address instead of hostname for SSH',
+        },
+        ('-u', '--user'): {
+            'default': 'ubuntu', 'help': 'default SSH user to connect with'
+        },
+        ('-p', '--port'): {
+            'type': int, 'default': 22,
+            'help': 'default SSH port to connect with',
+        },
+        ('-s', '--ssh-dir') : {
+            'default': '~/.ssh', 'metavar': 'PATH',
+            'help': 'location of SSH configuration and key files',
+        },
+        '--no-forward-agent': {
+            'action': 'store_true', 'default': False,
+            'help': 'do not forward the SSH agent to the hosts'
+        },
+    }
+
+    def handle(self, args):
+        """
+        Runs the command on the hosts, streaming their output, then prints
+        a table of the distinct outputs of the hosts.
+        """
+        hosts = self.hosts(args)
+        if not hosts:
+            return color.format("no hosts to run the command on", color.LIGHT_YELLOW)
+
+        executor = self.executor(args)
+        results = executor.run(hosts, self.command(args))
+
+        print(tabulate(summarize(results), headers='firstrow', floatfmt=".1f"))
+
+        failed = sum(1 for result in results if not result.ok)
+        if failed:
+            raise RemoteCommandFailed(
+                "command failed on {} of {} hosts".format(failed, len(results))
+            )
+
+    def command(self, args):
+        """
+        Returns the shell command to run, with sudo if required.
+        """
+        command = " ".join(args.command)
+        if args.sudo:
+            command = "sudo -n sh -c {}".format(pipes.quote(command))
+        return command
+
+    def executor(self, args):
+        """
+        Returns an executor that streams the output of the hosts unless quiet.
+        """
+        self.lock = threading.Lock()
+        return Executor(
+            width=args.width, timeout=args.timeout,
+            stream=None if args.quiet else self.stream,
+        )
+
+    def hosts(self, args):
+        """
+        Returns the hosts to run the command on, either from the SSH config or
+        the running managed instances in the regions.
+        """
+        if args.config:
+            config = load_ssh_config(os.path.expanduser(args.config))
+            hosts = [
+                Host.from_config(name, info)
+                for name, info in sorted(config.items())
+                if name and "*" not in name
+            ]
+        else:
+            regions = args.regions or settings.regions
+            manager = ManagedInstances.load().filter(regions, regions=True)
+            if len(manager) == 0:
+                return []
+
+            hosts = make_hosts(ssh_hosts(
+                manager.status(), user=args.user, port=args.port,
+                ssh_dir=args.ssh_dir, ipaddr=args.ipaddr,
+                forward_agent=not args.no_forward_agent,
+            ))
+
+            # Stopped instances do not have a hostname to connect to
+            hosts = [host for host in hosts if host.hostname]
+
+        if args.hosts:
+            hosts = [host for host in hosts if host.name in args.hosts]
+        return hosts
+
+    def stream(self, host, line):
+        with self.lock:
+            print("[{}] {}".format(host, line))
+
+
+class RolloutCommand(ExecCommand):
+
+    name = "rollout"
+    help = "roll a shell command out to the managed hosts in waves"
+    args = dict(ExecCommand.args, **{
+        '--window': {
+            'default': '1', 'metavar': 'N[%]',
+            'help': 'number or percent of hosts to run the command on at a time',
+        },
+        '--by-region': {
+            'action': 'store_true', 'default': False,
+            'help': 'only run the command in one region at a time',
+        },
+        '--max-failures': {
+            'default': '0', 'metavar': 'N[%]',
+            'help': 'number or percent of hosts that may fail before halting',
+        },
+        '--check': {
+            'default': None, 'metavar': 'CMD',
+            'help': 'health check command that must pass after each wave',
+        },
+        '--check-timeout': {
+            'type': float, 'default': CHECK_TIMEOUT, 'metavar': 'SEC',
+            'help': 'seconds to wait for the health check of a wave to pass',
+        },
+        '--check-interval': {
+            'type': float, 'default': CHECK_INTERVAL, 'metavar': 'SEC',
+            'help': 'seconds between health checks of hosts that have not passed',
+        },
+        '--pause': {
+            'type': float, 'default': 0, 'metavar': 'SEC',
+            'help': 'seconds to wait between waves',
+        },
+        '--warn-only': {
+            'action': 'store_true', 'default': False,
+            'help': 'only fail hosts on the health check, e.g. for reboots',
+        },
+    })
+
+    def handle(self, args):
+        """
+        Runs the command on the hosts in waves, reporting each wave, then
+        prints a table of the distinct outputs of the hosts.
+        """
+        hosts = self.hosts(args)
+        if not hosts:
+            return color.format("no hosts to run the command on", color.LIGHT_YELLOW)
+
+        executor = self.executor(args)
+        check = None
+        if args.check:
+            check = remote_task(args.check, Executor(width=args.width, timeout=args.timeout))
+
+        rollout = Rollout(
+            remote_task(self.command(args), executor),
+            window=args.window, by_region=args.by_region,
+            max_failures=args.max_failures, check=check,
+            check_timeout=args.check_timeout, check_interval=args.check_interval,
+            pause=args.pause, warn_only=args.warn_only, callback=self.progress,
+        )
+        report = rollout.run(hosts)
+
+        results = [report.results[str(host)] for host in hosts if str(host) in report.results]
+        print(tabulate(summarize(results), headers='firstrow', floatfmt=".1f"))
+
+        if report.halted:
+            raise RemoteCommandFailed(
+                "rollout halted after {} hosts failed, {} hosts were skipped".format(
+                    len(report.failed), len(report.skipped)
+                )
+            )
+
+        if report.failed:
+            raise RemoteCommandFailed(
+                "command failed on {} of {} hosts".format(len(report.failed), len(hosts))
+            )
+
+    def progress(self, idx, nwaves, wave, results):
+        failed = [result for result in results if not result.ok]
+        regions = sorted(set(host.region or "unknown" for host in wave))
+
+        with self.lock:
+            print(color.format("wave {}/{} ({}): {} ok, {} failed".format(
+                idx + 1, nwaves, ", ".join(regions),
+                len(results) - len(failed), len(failed),
+            ), color.LIGHT_RED if failed else color.LIGHT_GREEN))
+
+            for result in failed:
+                print("  {}: {}".format(result.host, result.summary()))
+
+
+class DistributeCommand(ExecCommand):
+
+    name = "distribute"
+    help = "copy an artifact to the hosts through a seed replica per region"
+    # Ordered so that the source is parsed before the destination
+    args = OrderedDict([
+        (key, val) for key, val in ExecCommand.args.items()
+        if key not in ('command', '--sudo', ('-q', '--quiet'))
+    ] + [
+        ('local', {
+            'metavar': 'SRC',
+            'help': 'path of the artifact to distribute',
+        }),
+        ('remote', {
+            'metavar': 'DST',
+            'help': 'path to install the artifact at on the hosts',
+        }),
+    ])
+
+    def handle(self, args):
+        """
+        Distributes the artifact to the hosts, reporting each region, then
+        prints a table of the outcomes of the hosts.
+        """
+        hosts = self.hosts(args)
+        if not hosts:
+            return color.format("no hosts to distribute to", color.LIGHT_YELLOW)
+
+        self.lock = threading.Lock()
+        distribution = Distribution(
+            args.local, args.remote, width=args.width, timeout=args.timeout,
+            callback=self.progress,
+        )
+        results = distribution.run(hosts)
+
+        print(tabulate(summarize(results), headers='firstrow', floatfmt=".1f"))
+        print("uploaded {:0.1f} MB {} times for {} hosts (sha256 {})".format(
+            distribution.size / 1048576.0, distribution.uploads, len(hosts),
+            distribution.digest[:12],
+        ))
+
+        failed = sum(1 for result in results if not result.ok)
+        if failed:
+            raise RemoteCommandFailed(
+                "distribution failed on {} of {} hosts".format(failed, len(results))
+            )
+
+    def progress(self, region, results):
+        failed = [result for result in results if not result.ok]
+        with self.lock:
+            print(color.format("{}: {} hosts, {} failed".format(
+                region or "unknown", len(results), len(failed),
+            ), color.LIGHT_RED if failed else color.LIGHT_GREEN))
+
+            for result in failed:
+                print("  {}: {}".format(result.host, result.summary()))
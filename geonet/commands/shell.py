@@ -0,0 +1,42 @@
+# geonet.commands.shell
+# Runs geonet commands interactively in a single process.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Sun Oct 25 10:02:31 2026 -0400
+#
+# ID: shell.py [] benjamin@bengfort.com $
+
+"""
+Runs geonet commands interactively in a single process.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from commis import Command
+
+from geonet.shell import GeoNetShell
+from geonet.console import GeoNetUtility
+
+
+##########################################################################
+## Command Description
+##########################################################################
+
+class ShellCommand(Command):
+
+    name = "shell"
+    help = "run geonet commands interactively with warm clients and caches"
+    args = {
+        '--no-inventory': {
+            'action': 'store_false', 'dest': 'inventory',
+            'help': 'call EC2 directly rather than through a private inventory',
+        },
+    }
+
+    def handle(self, args):
+        """
+        Runs the shell until it is exited.
+        """
+        GeoNetShell(GeoNetUtility.load(), inventory=args.inventory).loop()
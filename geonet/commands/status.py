@@ -20,6 +20,7 @@ from commis import Command
 from tabulate import tabulate
 
 from geonet.config import settings
+from geonet.health import health
 from geonet.managed import ManagedInstances
 
 
@@ -70,7 +71,7 @@ class StatusCommand(Command):
         table = [
             [
                 instance.state_light(),
-                instance.region.name,
+                health.label(instance.region),
                 instance.name, str(instance),
                 instance.uptime()
 
@@ -79,3 +80,8 @@ class StatusCommand(Command):
         ]
 
         print(tabulate(table, tablefmt="plain"))
+
+        # Note the regions that are skipped or served from cache
+        footer = health.footer()
+        if footer:
+            print(color.format(footer, color.LIGHT_YELLOW))
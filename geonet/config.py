@@ -62,6 +62,14 @@ class AWSAccessConfiguration(Configuration):
     aws_region            = environ_setting("AWS_REGION", required=True)
 
 
+class HedgeConfiguration(Configuration):
+
+    enabled  = False # duplicate describe calls slower than the quantile
+    quantile = 95    # percentile latency of a region to hedge calls at
+    budget   = 0.05  # maximum fraction of calls that are hedged
+    burst    = 2     # maximum number of hedges at once
+
+
 class GeoNetConfiguration(Configuration):
 
     # Search for configuration
@@ -84,10 +92,35 @@ class GeoNetConfiguration(Configuration):
     # Kahu Configuration
     kahu = KahuConfiguration()
 
+    # Hedged describe call configuration
+    hedge = HedgeConfiguration()
+
 
 
 ##########################################################################
-## Load settings immediately on import
+## Load settings on first access
 ##########################################################################
 
-settings = GeoNetConfiguration.load()
+class LazySettings(object):
+    """
+    Proxies a configuration that is loaded from disk the first time one of
+    its settings is accessed, so importing the config does not read YAML.
+    """
+
+    def __init__(self, klass):
+        self._klass = klass
+        self._settings = None
+
+    def _load(self):
+        if self._settings is None:
+            self._settings = self._klass.load()
+        return self._settings
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __str__(self):
+        return str(self._load())
+
+
+settings = LazySettings(GeoNetConfiguration)
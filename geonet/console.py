@@ -8,17 +8,26 @@
 
 """
 The primary command line utility for geonet scripts.
+
+Commands are registered from the manifest in geonet.commands with only their
+name and help text, so that listing the commands does not import boto3 or
+load the configuration. The module of a command is imported and its arguments
+are added to its parser when that command is invoked.
 """
 
 ##########################################################################
 ## Imports
 ##########################################################################
 
+import sys
+
 from commis import color
+from commis import Command
 from commis import ConsoleProgram
+from commis.exceptions import ConsoleError
 
 from geonet.version import get_version
-from geonet.commands import COMMANDS
+from geonet.commands import COMMANDS, load_command
 
 
 ##########################################################################
@@ -29,6 +38,36 @@ DESCRIPTION = "manage AWS resources around the world"
 EPILOG = "used in Alia geo-replication experiments at UMD"
 
 
+##########################################################################
+## Lazy Command
+##########################################################################
+
+class LazyCommand(Command):
+    """
+    A placeholder for a command in the manifest that imports the command
+    class and adds its arguments to the parser only when it is loaded.
+    """
+
+    def __init__(self, name, path, help=None):
+        super(LazyCommand, self).__init__(name=name, help=help, args={})
+        self.path = path
+        self.command = None
+
+    def load(self):
+        """
+        Import the command and add its arguments to the subparser.
+        """
+        if self.command is None:
+            self.command = load_command(self.path)()
+            self.command.parser = self.parser
+            self.command.add_arguments()
+            self.parser.set_defaults(func=self.command.handle)
+        return self.command
+
+    def handle(self, args):
+        return self.load().handle(args)
+
+
 ##########################################################################
 ## CLI Utility
 ##########################################################################
@@ -39,6 +78,9 @@ class GeoNetUtility(ConsoleProgram):
     epilog = color.format(EPILOG, color.MAGENTA)
     version = color.format("v{}", color.CYAN, get_version())
 
+    # Global options that take a value (so the value is not a command name)
+    VALUE_OPTIONS = ("--stats-out", "--trace", "--profile")
+
     @classmethod
     def load(klass, commands=COMMANDS):
         utility = klass()
@@ -46,6 +88,166 @@ class GeoNetUtility(ConsoleProgram):
             utility.register(command)
         return utility
 
+    @property
+    def parser(self):
+        """
+        Adds the global options to the argparse parser
+        """
+        if self._parser is None:
+            parser = super(GeoNetUtility, self).parser
+            parser.add_argument(
+                '--stats', action='store_true', default=False,
+                help='print AWS API call latencies per region and operation at exit',
+            )
+            parser.add_argument(
+                '--stats-out', metavar='PATH', default=None,
+                help='write a record of every AWS API call as NDJSON to path',
+            )
+            parser.add_argument(
+                '--trace', metavar='PATH', default=None,
+                help='write a Chrome trace of the command to path',
+            )
+            parser.add_argument(
+                '--profile', metavar='PATH', default=None,
+                help='write the cProfile stats of the command to path',
+            )
+            parser.add_argument(
+                '--memprofile', action='store_true', default=False,
+                help='print the top memory allocations of the command at exit',
+            )
+        return self._parser
+
+    def register(self, command):
+        """
+        Registers a (name, path, help) manifest entry as a lazy command, or
+        a command class as usual.
+        """
+        if isinstance(command, tuple):
+            command = LazyCommand(*command)
+        else:
+            command = command()
+
+        if command.name in self.commands:
+            raise ConsoleError(
+                "Command {} already registered!".format(command.name)
+            )
+
+        command.create_parser(self.subparsers)
+        self.commands[command.name] = command
+
+    def prepare(self, argv=None):
+        """
+        Loads the command named on the command line (the first positional
+        argument) so that its arguments are parsed. Returns the command name
+        or None if no registered command was specified.
+        """
+        argv = sys.argv[1:] if argv is None else argv
+        skip = False
+        for arg in argv:
+            if skip or arg.startswith("-"):
+                skip = arg in self.VALUE_OPTIONS
+                continue
+
+            command = self.commands.get(arg)
+            if isinstance(command, LazyCommand):
+                command.load()
+            return arg if command is not None else None
+        return None
+
+    def execute(self):
+        argv = sys.argv[1:]
+        name = self.prepare(argv)
+        options, _ = self.parser.parse_known_args(argv)
+        profiler = self.start_profiler(options)
+
+        try:
+            if options.trace:
+                self.execute_traced(name, super(GeoNetUtility, self).execute)
+            else:
+                super(GeoNetUtility, self).execute()
+        finally:
+            self.report_health()
+            self.report_profile(options, profiler)
+            self.report_stats(options)
+            self.report_trace(options)
+
+    def execute_traced(self, name, func, *args):
+        """
+        Executes the command with func(*args) inside of a root span of the
+        trace, returning its result.
+        """
+        # Imported here since tracing loads the time zone configuration
+        from geonet.utils.timer import tracer
+
+        tracer.enabled = True
+        with tracer.span("geonet {}".format(name or "").strip(), command=name):
+            return func(*args)
+
+    def start_profiler(self, options):
+        """
+        Starts profiling the command if requested, returning the profiler.
+        """
+        if not options.profile and not options.memprofile:
+            return None
+
+        from geonet.utils.profiler import Profiler
+        profiler = Profiler(cpu=bool(options.profile), memory=options.memprofile)
+        return profiler.start()
+
+    def report_profile(self, options, profiler):
+        """
+        Stops the profiler, writing the stats and printing a summary.
+        """
+        if profiler is None:
+            return
+
+        profiler.stop()
+        if options.profile:
+            profiler.dump(options.profile)
+        sys.stderr.write(profiler.summary() + "\n")
+
+    def report_trace(self, options):
+        """
+        Writes the trace of the command if requested.
+        """
+        if options.trace:
+            from geonet.utils.timer import tracer
+            with open(options.trace, 'w') as f:
+                tracer.export(f)
+
+    def report_health(self):
+        """
+        Warns about regions the command skipped or served from the daemon's
+        cache because they are unhealthy.
+        """
+        # Only commands that described a region have loaded the health
+        module = sys.modules.get("geonet.health")
+        if module is None:
+            return
+
+        for line in module.health.report():
+            sys.stderr.write(color.format(line, color.YELLOW) + "\n")
+
+    def report_stats(self, options):
+        """
+        Reports the AWS API calls made by the command if requested.
+        """
+        if not options.stats and not options.stats_out:
+            return
+
+        # Imported here since the recorder is only needed to report stats
+        from geonet.utils.stats import recorder
+
+        if options.stats:
+            if len(recorder):
+                sys.stderr.write(recorder.report() + "\n")
+            else:
+                sys.stderr.write("no AWS API calls were made\n")
+
+        if options.stats_out:
+            with open(options.stats_out, 'w') as f:
+                recorder.dump(f)
+
 
 ##########################################################################
 ## Run as a module
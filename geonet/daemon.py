@@ -0,0 +1,186 @@
+# geonet.daemon
+# Client and protocol of the geonet inventory daemon.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Sat Oct 24 10:12:44 2026 -0400
+#
+# ID: daemon.py [] benjamin@bengfort.com $
+
+"""
+Client and protocol of the geonet inventory daemon.
+
+The daemon (see geonet.inventory) keeps warm clients to every region and a
+continuously refreshed cache of describe responses, and serves them over a
+Unix domain socket. Each request and reply is a single line of JSON; a
+request has a method and params and a reply has either a result or an error.
+Datetimes are tagged so that they are decoded as datetimes again.
+
+When the daemon is running, Region.describe asks it for responses rather than
+calling EC2, and any other call made with a connection (e.g. launching or
+terminating instances) invalidates the cached responses of its region. When
+the daemon is not running the client is a no-op and calls go directly to EC2.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import json
+import pytz
+import socket
+
+from datetime import datetime
+from geonet.config import USERDATA
+from geonet.health import health
+from geonet.exceptions import GeoNetException
+from geonet.utils.serialize import Encoder
+from geonet.utils.timez import JSON_DATETIME
+
+
+# Path of the Unix domain socket the daemon listens on
+SOCKET = os.path.join(USERDATA, "daemon.sock")
+
+# Seconds to wait for a reply, which may require calling EC2 on a cache miss
+TIMEOUT = 60
+
+# Key used to tag encoded datetimes
+DATETIME = "__datetime__"
+
+
+##########################################################################
+## Protocol
+##########################################################################
+
+class DaemonError(GeoNetException):
+    """
+    The daemon is not running or could not handle the request.
+    """
+    pass
+
+
+class ProtocolEncoder(Encoder):
+    """
+    Encodes timezone aware datetimes so that they can be decoded.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, datetime) and obj.tzinfo is not None:
+            return {DATETIME: super(ProtocolEncoder, self).default(obj)}
+        return super(ProtocolEncoder, self).default(obj)
+
+
+def decode_datetimes(obj):
+    if len(obj) == 1 and DATETIME in obj:
+        return pytz.utc.localize(datetime.strptime(obj[DATETIME], JSON_DATETIME))
+    return obj
+
+
+def encode(message):
+    """
+    Encodes a request or reply as a line of JSON.
+    """
+    return json.dumps(message, cls=ProtocolEncoder) + "\n"
+
+
+def decode(line):
+    """
+    Decodes a request or reply from a line of JSON.
+    """
+    return json.loads(line, object_hook=decode_datetimes)
+
+
+##########################################################################
+## Daemon Client
+##########################################################################
+
+class DaemonClient(object):
+    """
+    Makes requests to the daemon listening on the socket at path.
+    """
+
+    def __init__(self, path=SOCKET, timeout=TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+
+    def available(self):
+        """
+        Returns True if the daemon may be running (its socket exists).
+        """
+        return os.path.exists(self.path)
+
+    def request(self, method, **params):
+        """
+        Sends a request to the daemon and returns the result of the reply.
+        Raises a DaemonError if the daemon could not be reached or replied
+        with an error.
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+            sock.sendall(encode({"method": method, "params": params}))
+            stream = sock.makefile("rb")
+            line = stream.readline()
+            stream.close()
+        except socket.error as e:
+            raise DaemonError("could not reach daemon at {}: {}".format(self.path, e))
+        finally:
+            sock.close()
+
+        if not line:
+            raise DaemonError("daemon closed the connection without replying")
+
+        reply = decode(line)
+        if "error" in reply:
+            raise DaemonError(reply["error"])
+        return reply["result"]
+
+    def describe(self, region, operation, params):
+        """
+        Returns the daemon's response to the describe operation in the region
+        with the given params, or None if the daemon is not available. If the
+        region is unhealthy, it is noted as served from the daemon's cache.
+        """
+        if not self.available():
+            return None
+
+        try:
+            result = self.request(
+                "describe", region=str(region), operation=operation, params=params
+            )
+        except DaemonError:
+            return None
+
+        if not result["healthy"]:
+            health.skip(region, cached=True)
+        return result["response"]
+
+    def invalidate(self, region):
+        """
+        Drops the daemon's cached responses of the region, if it is running.
+        """
+        if not self.available():
+            return
+
+        try:
+            self.request("invalidate", region=str(region))
+        except DaemonError:
+            pass
+
+    def instrument(self, client):
+        """
+        Registers a hook with a boto3 client that invalidates the daemon's
+        cache of the client's region after every call that is not a describe
+        call, since it may have changed the region's resources. Returns it.
+        """
+        client.meta.events.register("after-call", self.after_call)
+        return client
+
+    def after_call(self, model=None, context=None, **kwargs):
+        if model is not None and not model.name.startswith("Describe"):
+            self.invalidate(context.get("client_region"))
+
+
+# The client of the daemon used by geonet
+daemon = DaemonClient()
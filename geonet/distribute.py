@@ -0,0 +1,303 @@
+# geonet.distribute
+# Distributes an artifact to the replicas through a seed replica per region.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Thu Oct 29 09:26:40 2026 -0400
+#
+# ID: distribute.py [] benjamin@bengfort.com $
+
+"""
+Distributes an artifact to the replicas through a seed replica per region.
+
+Copying a binary to every replica from a laptop sends the same bytes across
+the ocean once per replica. Instead, the artifact is uploaded once to a seed
+replica in each region and then copied from replica to replica within the
+region as a tree: in every round each replica that has the artifact copies
+it to one that does not, so a region of n replicas is complete in about
+log2(n) rounds and the artifact crosses regions once per region.
+
+Every copy is written to a temporary path next to the destination and only
+moved into place once its SHA-256 hash matches the hash of the local artifact,
+so replicas never run a partial or corrupt artifact. Replicas that already
+have the artifact with the same hash are skipped, and a replica that has it
+is used as the seed of its region rather than uploading it again.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import stat
+import hashlib
+import threading
+
+from functools import partial
+from itertools import groupby
+from geonet.utils.async import wait
+from geonet.remote import Executor, Result, MAX_CONNECTIONS, TIMEOUT
+from geonet.remote import pool as connections
+
+
+# Command run on a replica to copy the artifact to a replica in its region,
+# which relies on the SSH agent being forwarded to the replicas.
+COPY = (
+    "scp -q -P {port} -o StrictHostKeyChecking=no "
+    "-o UserKnownHostsFile=/dev/null {path} {user}@{hostname}:{tmp}"
+)
+
+# Number of replicas of a region to try to upload the artifact to
+SEED_ATTEMPTS = 2
+
+# Bytes read from the artifact at a time when hashing it
+CHUNK_SIZE = 1048576
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def sha256(path):
+    """
+    Returns the hex SHA-256 digest of the contents of the file.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(partial(f.read, CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def by_region(hosts):
+    """
+    Returns the hosts grouped by region as (region, hosts) sorted by region;
+    hosts without a region are grouped together.
+    """
+    def region(host):
+        return getattr(host, "region", None) or ""
+
+    return [
+        (name or None, list(group))
+        for name, group in groupby(sorted(hosts, key=region), region)
+    ]
+
+
+##########################################################################
+## Distribution
+##########################################################################
+
+class Distribution(object):
+    """
+    Distributes a local artifact to a path on the replicas.
+
+    Parameters
+    ----------
+    local : str
+        The path of the artifact to distribute.
+
+    remote : str
+        The path to install the artifact at on the replicas, which may be
+        relative to the home directory of the user or start with ~.
+
+    pool : ConnectionPool, default=None
+        The pool of connections to the replicas, by default the global pool.
+
+    width : int, default=MAX_CONNECTIONS
+        The maximum number of replicas to hash or copy to at once.
+
+    timeout : float, default=TIMEOUT
+        Seconds each upload, copy or command may take.
+
+    copy : str, default=COPY
+        The command run on a replica to copy the artifact to another replica,
+        formatted with the path and tmp path of the artifact and the user,
+        hostname, port and name of the destination.
+
+    callback : callable, default=None
+        Called with each region and the results of its replicas once the
+        artifact has been distributed in the region.
+    """
+
+    def __init__(self, local, remote, pool=None, width=MAX_CONNECTIONS,
+                 timeout=TIMEOUT, copy=COPY, callback=None):
+        self.local = local
+        self.remote = remote
+        self.pool = pool if pool is not None else connections
+        self.width = width
+        self.timeout = timeout
+        self.copy = copy
+        self.callback = callback
+
+        self.digest = sha256(local)
+        self.size = os.path.getsize(local)
+        self.mode = "{:o}".format(stat.S_IMODE(os.stat(local).st_mode))
+        self.tmp = "{}.{}".format(remote, self.digest[:12])
+
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(width)
+        self.uploads = 0
+
+    def run(self, hosts):
+        """
+        Distributes the artifact to the hosts of every region in parallel and
+        returns a Result for each host in order.
+        """
+        hosts = list(hosts)
+        hashes = self.hashes(hosts)
+
+        results = {}
+        for region_results in wait([
+            partial(self.distribute, region, group, hashes)
+            for region, group in by_region(hosts)
+        ], schedule=False):
+            for result in region_results:
+                results[result.host.name] = result
+
+        return [results[host.name] for host in hosts]
+
+    def hashes(self, hosts):
+        """
+        Returns the hash of the artifact on every host by name, or None if
+        the host does not have it or could not be reached.
+        """
+        executor = Executor(self.pool, width=self.width, timeout=self.timeout)
+        return dict(
+            (result.host.name, result.output.split()[0] if result.ok and result.output else None)
+            for result in executor.run(hosts, "sha256sum {}".format(self.remote))
+        )
+
+    def distribute(self, region, hosts, hashes):
+        """
+        Seeds the region with the artifact (unless a host already has it) and
+        copies it between the hosts of the region until all of them have it.
+        """
+        results = {}
+        have, need = [], []
+        for host in hosts:
+            if hashes.get(host.name) == self.digest:
+                results[host.name] = Result(host, status=0, output="up to date")
+                have.append(host)
+            else:
+                need.append(host)
+
+        # Only upload from the local machine if no host in the region has it
+        attempts, failed = 0, []
+        while not have and need and attempts < SEED_ATTEMPTS:
+            host = need.pop(0)
+            result = results[host.name] = self.upload(host)
+            if result.ok:
+                have.append(host)
+            else:
+                failed.append(host)
+            attempts += 1
+
+        if not have:
+            for host in need:
+                results[host.name] = Result(host, error="no host in the region has the artifact")
+            need = []
+
+        # Every host that has the artifact copies it to one that does not and
+        # hosts whose copy failed are retried once. Hosts whose upload failed
+        # are copied to as their retry once the region has been seeded.
+        retried = set(host.name for host in failed)
+        if have:
+            need.extend(failed)
+
+        broken = {}
+        while need:
+            pairs = self.pair(have, need, broken)
+            need = need[len(pairs):]
+
+            copies = wait(
+                [partial(self.transfer, *pair) for pair in pairs],
+                width=self.width, schedule=False,
+            )
+            for (source, target), result in zip(pairs, copies):
+                results[target.name] = result
+                if result.ok:
+                    have.append(target)
+                elif target.name not in retried:
+                    retried.add(target.name)
+                    broken[target.name] = source.name
+                    need.append(target)
+
+        results = [results[host.name] for host in hosts]
+        if self.callback is not None:
+            self.callback(region, results)
+        return results
+
+    def pair(self, have, need, broken):
+        """
+        Pairs each host that has the artifact with a host that needs it, in
+        order, avoiding the source whose copy to a host already failed.
+        """
+        sources, pairs = list(have), []
+        for target in need[:len(have)]:
+            source = next(
+                (host for host in sources if host.name != broken.get(target.name)),
+                sources[0],
+            )
+            sources.remove(source)
+            pairs.append((source, target))
+        return pairs
+
+    def install(self):
+        """
+        Returns the command that moves the temporary copy of the artifact into
+        place if its hash matches and otherwise removes it.
+        """
+        return (
+            'if test "$(sha256sum {tmp} | cut -d " " -f 1)" = {digest}; '
+            'then chmod {mode} {tmp} && mv -f {tmp} {path}; '
+            'else rm -f {tmp}; echo "sha256 mismatch"; exit 1; fi'
+        ).format(tmp=self.tmp, digest=self.digest, mode=self.mode, path=self.remote)
+
+    def upload(self, host):
+        """
+        Uploads the artifact from the local machine to the host.
+        """
+        command = 'mkdir -p "$(dirname {})" && cat > {} && {}'.format(
+            self.tmp, self.tmp, self.install()
+        )
+        with self.slots, open(self.local, 'rb') as f:
+            result = self.pool.connection(host).run(command, self.timeout, stdin=f)
+
+        with self.lock:
+            self.uploads += 1
+
+        if result.ok:
+            result.output = "uploaded"
+        return result
+
+    def transfer(self, source, target):
+        """
+        Copies the artifact from the source host to the target host, holding
+        one of the width slots shared by the regions while copying.
+        """
+        with self.slots:
+            return self.copy_to(source, target)
+
+    def copy_to(self, source, target):
+        """
+        Runs the commands that copy the artifact from the source to the target.
+        """
+        result = self.pool.connection(target).run(
+            'mkdir -p "$(dirname {})"'.format(self.tmp), self.timeout
+        )
+
+        if result.ok:
+            command = self.copy.format(
+                path=self.remote, tmp=self.tmp, user=target.user,
+                hostname=target.hostname, port=target.port, name=target.name,
+            )
+            copied = self.pool.connection(source).run(command, self.timeout)
+            if not copied.ok:
+                copied.host = target
+                copied.output = "copy from {} failed: {}".format(source, copied.output.strip())
+                return copied
+
+            result = self.pool.connection(target).run(self.install(), self.timeout)
+
+        if result.ok:
+            result.output = "copied"
+        return result
@@ -16,9 +16,10 @@ Helpers for connecting to EC2 regions with boto
 ##########################################################################
 
 import os
-import boto3
 
 from geonet.config import settings
+from geonet.daemon import daemon
+from geonet.utils.stats import recorder
 from geonet.base import Resource, Collection
 from geonet.utils.timez import parse_datetime
 from geonet.utils.timez import utcnow, humanizedelta
@@ -28,6 +29,11 @@ from collections import defaultdict
 from operator import itemgetter, attrgetter
 
 
+# Callable that creates the clients returned by connect in place of boto3,
+# e.g. a fake EC2 service for testing; set with use_client_factory.
+_client_factory = None
+
+
 ##########################################################################
 ## Helper Methods
 ##########################################################################
@@ -36,15 +42,36 @@ def connect(region=None, **kwargs):
     """
     Create a boto connection to the specified region that closes when done.
     Pass any kwargs to the boto.ec2.connect_to_region function, and defaults
-    will be collected from the primary configuration.
+    will be collected from the primary configuration. Every API call made
+    with the client is recorded by geonet.utils.stats.recorder, and calls
+    that may change resources invalidate the inventory of a running daemon.
     """
     # Get default region if required
     region = region or settings.aws.aws_region
 
+    if _client_factory is not None:
+        client = _client_factory(str(region), **kwargs)
+        return daemon.instrument(recorder.instrument(client))
+
+    # Imported here since boto3 is slow to import and most commands only
+    # need it once they actually connect to a region.
+    import boto3
+
     # Create default configuration arguments
     options = dict(settings.aws.options())
     options.update(kwargs)
-    return boto3.client('ec2', region_name=str(region), **kwargs)
+    client = boto3.client('ec2', region_name=str(region), **kwargs)
+    return daemon.instrument(recorder.instrument(client))
+
+
+def use_client_factory(factory=None):
+    """
+    Creates clients with factory(region, **kwargs) instead of boto3, or with
+    boto3 again if factory is None. Returns the previous factory.
+    """
+    global _client_factory
+    previous, _client_factory = _client_factory, factory
+    return previous
 
 
 ##########################################################################
@@ -198,7 +225,8 @@ class Instances(Collection):
             raise TypeError("cannot update status with no region connection")
 
         # TODO: validate response
-        resp = self.region.conn.describe_instance_status(
+        resp = self.region.describe(
+            "describe_instance_status",
             InstanceIds = [str(instance) for instance in self],
             IncludeAllInstances = False,
         )
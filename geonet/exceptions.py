@@ -26,3 +26,17 @@ class ValidationError(GeoNetException):
     Error validating a resource or a collection.
     """
     pass
+
+
+class RegionUnavailable(GeoNetException):
+    """
+    The region is unhealthy so calls to it are not being made.
+    """
+    pass
+
+
+class RemoteCommandFailed(GeoNetException):
+    """
+    A command run on the hosts over SSH failed on one or more of them.
+    """
+    pass
@@ -0,0 +1,355 @@
+# geonet.health
+# Tracks the health of region endpoints with a circuit breaker per region.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 26 14:05:51 2026 -0400
+#
+# ID: health.py [] benjamin@bengfort.com $
+
+"""
+Tracks the health of region endpoints with a circuit breaker per region.
+
+The outcomes of the recent describe calls to every region are recorded, and
+when too many of them fail with errors that indicate the endpoint is degraded
+(connection errors, timeouts, throttling and server errors) the circuit of
+the region is opened. While it is open, describe calls to the region are not
+made: commands skip the region (or serve it from the daemon's inventory) and
+report that they did so. Once the circuit has been open for its cooldown, a
+single call is let through to probe the region (half-open); if it succeeds
+the circuit is closed again, otherwise it is reopened with twice the cooldown.
+
+The circuits are kept in ~/.geonet so that a degraded region is skipped by
+every command rather than each command waiting on it to learn it is degraded.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import json
+import time
+import atexit
+import socket
+import threading
+
+from geonet.config import USERDATA
+
+
+# Path of the circuits of every region persisted between runs
+HEALTH = os.path.join(USERDATA, "health.json")
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Error codes of responses that indicate the endpoint is degraded
+UNHEALTHY_CODES = frozenset((
+    "RequestLimitExceeded", "Throttling", "ThrottlingException",
+    "ServiceUnavailable", "Unavailable", "InternalError", "InternalFailure",
+))
+
+# Keys of the resources in the response of each describe operation, used to
+# return an empty response for a region that is skipped.
+RESPONSE_KEYS = {
+    "describe_instances": "Reservations",
+    "describe_instance_status": "InstanceStatuses",
+    "describe_volumes": "Volumes",
+    "describe_key_pairs": "KeyPairs",
+    "describe_launch_templates": "LaunchTemplates",
+    "describe_images": "Images",
+    "describe_security_groups": "SecurityGroups",
+    "describe_placement_groups": "PlacementGroups",
+    "describe_availability_zones": "AvailabilityZones",
+}
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def is_unhealthy(error):
+    """
+    Returns True if the error indicates the endpoint is degraded rather than
+    the request being invalid.
+    """
+    if isinstance(error, socket.error):
+        return True
+
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        meta = response.get("ResponseMetadata", {})
+        code = response.get("Error", {}).get("Code")
+        return meta.get("HTTPStatusCode", 0) >= 500 or code in UNHEALTHY_CODES
+
+    # Imported here since botocore is only loaded once a client is created
+    from botocore.exceptions import ConnectionError, HTTPClientError
+    return isinstance(error, (ConnectionError, HTTPClientError))
+
+
+def empty_response(operation):
+    """
+    Returns an empty response to a describe operation, or None if unknown.
+    """
+    key = RESPONSE_KEYS.get(operation)
+    if key is None:
+        return None
+    return {key: []}
+
+
+##########################################################################
+## Circuits
+##########################################################################
+
+class Circuit(object):
+    """
+    The state and recent call outcomes (True if the call failed) of a region.
+    """
+
+    def __init__(self, state=CLOSED, failures=None, opened=None, cooldown=None, error=None):
+        self.state = state
+        self.failures = failures or []
+        self.opened = opened
+        self.cooldown = cooldown
+        self.error = error
+        self.probing = False
+
+    def retry_in(self):
+        """
+        Returns the seconds until the circuit can be probed.
+        """
+        return max(0, self.opened + self.cooldown - time.time())
+
+    def serialize(self):
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "cooldown": self.cooldown,
+            "error": self.error,
+        }
+
+
+class Health(object):
+    """
+    The circuits of every region, loaded from and dumped to path on demand.
+
+    Parameters
+    ----------
+    path : str, default=HEALTH
+        Where the circuits are kept between runs, or None to not keep them.
+
+    window : int, default=20
+        The number of recent calls to a region used to compute its error rate.
+
+    threshold : float, default=0.5
+        The error rate at which the circuit of a region is opened.
+
+    min_calls : int, default=4
+        The number of recent calls needed before the circuit can be opened.
+
+    cooldown : float, default=30
+        Seconds a circuit stays open before it is first probed; the cooldown
+        doubles every time a probe fails up to max_cooldown.
+
+    max_cooldown : float, default=600
+        The maximum seconds a circuit stays open before it is probed.
+    """
+
+    def __init__(self, path=HEALTH, window=20, threshold=0.5, min_calls=4,
+                 cooldown=30, max_cooldown=600):
+        self.path = path
+        self.window = window
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self.lock = threading.RLock()
+        self.circuits = None
+        self.changed = False
+        self.skipped = {}
+
+    def load(self):
+        """
+        Loads the circuits from disk if they have not been loaded yet.
+        """
+        with self.lock:
+            if self.circuits is not None:
+                return
+
+            self.circuits = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r') as f:
+                        data = json.load(f)
+                except ValueError:
+                    # A corrupt file is rebuilt from the next calls
+                    return
+
+                for region, circuit in data.items():
+                    self.circuits[region] = Circuit(**circuit)
+
+    def dump(self):
+        """
+        Writes the circuits to disk if they have changed, replacing the file
+        atomically. Nothing is written if the directory does not exist.
+        """
+        with self.lock:
+            if not self.changed or not self.path:
+                return
+            if not os.path.isdir(os.path.dirname(self.path)):
+                return
+
+            data = dict(
+                (region, circuit.serialize())
+                for region, circuit in self.circuits.items()
+            )
+
+            tmp = "{}.{}".format(self.path, os.getpid())
+            with open(tmp, 'w') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.rename(tmp, self.path)
+            self.changed = False
+
+    def circuit(self, region):
+        self.load()
+        with self.lock:
+            region = str(region)
+            if region not in self.circuits:
+                self.circuits[region] = Circuit()
+            return self.circuits[region]
+
+    def state(self, region):
+        return self.circuit(region).state
+
+    def allow(self, region):
+        """
+        Returns True if a call can be made to the region: its circuit is
+        closed, or it is open and due to be probed by this call.
+        """
+        with self.lock:
+            circuit = self.circuit(region)
+            if circuit.state == CLOSED:
+                return True
+
+            if circuit.probing or circuit.retry_in() > 0:
+                return False
+
+            circuit.state = HALF_OPEN
+            circuit.probing = True
+            return True
+
+    def success(self, region):
+        """
+        Records a call to the region that the endpoint answered.
+        """
+        with self.lock:
+            circuit = self.circuit(region)
+            if circuit.state != CLOSED:
+                circuit.state = CLOSED
+                circuit.failures = []
+                circuit.opened = circuit.cooldown = circuit.error = None
+                circuit.probing = False
+                self.changed = True
+                self.dump()
+            else:
+                self.record(circuit, False)
+
+    def failure(self, region, error):
+        """
+        Records a call to the region that failed because the endpoint is
+        degraded, opening its circuit if it is unhealthy.
+        """
+        with self.lock:
+            circuit = self.circuit(region)
+            circuit.error = "{}: {}".format(error.__class__.__name__, error)
+
+            if circuit.state == CLOSED:
+                self.record(circuit, True)
+                failures = circuit.failures
+                if len(failures) >= self.min_calls and sum(failures) >= self.threshold * len(failures):
+                    self.trip(circuit, self.cooldown)
+            elif circuit.state == HALF_OPEN:
+                # The probe failed so wait longer before probing again
+                self.trip(circuit, min(circuit.cooldown * 2, self.max_cooldown))
+
+    def record(self, circuit, failed):
+        circuit.failures.append(failed)
+        del circuit.failures[:-self.window]
+        self.changed = True
+
+    def trip(self, circuit, cooldown):
+        circuit.state = OPEN
+        circuit.opened = time.time()
+        circuit.cooldown = cooldown
+        circuit.probing = False
+        self.changed = True
+        self.dump()
+
+    def skip(self, region, cached=False):
+        """
+        Notes that a region was skipped (or served from cache) by a command.
+        """
+        with self.lock:
+            self.skipped[str(region)] = cached
+
+    def label(self, region):
+        """
+        Returns the name of the region for a table, marked with a * if the
+        region was served from cache.
+        """
+        name = getattr(region, "name", str(region))
+        with self.lock:
+            return name + "*" if self.skipped.get(str(region)) else name
+
+    def footer(self):
+        """
+        Returns a note to print under a table of the regions served from
+        cache (whose rows are marked by label) and of the regions skipped
+        (which have no rows), or None if every region was described.
+        """
+        with self.lock:
+            cached = sorted(region for region, cached in self.skipped.items() if cached)
+            skipped = sorted(region for region, cached in self.skipped.items() if not cached)
+
+        lines = []
+        if cached:
+            lines.append("* served from cache, region is unhealthy: {}".format(", ".join(cached)))
+        if skipped:
+            lines.append("not listed, region is unhealthy: {}".format(", ".join(skipped)))
+        return "\n".join(lines) or None
+
+    def report(self):
+        """
+        Returns a line for every region skipped or served from cache since the
+        last report, then clears them.
+        """
+        with self.lock:
+            lines = []
+            for region, cached in sorted(self.skipped.items()):
+                circuit = self.circuit(region)
+                lines.append("{} {}: region is unhealthy ({}), retrying in {:0.0f}s".format(
+                    region, "served from cache" if cached else "skipped",
+                    circuit.error or "circuit open", circuit.retry_in() if circuit.opened else 0,
+                ))
+            self.skipped = {}
+            return lines
+
+    def status(self):
+        """
+        Returns the state of the circuit of every region that is not closed.
+        """
+        self.load()
+        with self.lock:
+            return dict(
+                (region, circuit.state)
+                for region, circuit in self.circuits.items()
+                if circuit.state != CLOSED
+            )
+
+
+# The health of every region
+health = Health()
+atexit.register(health.dump)
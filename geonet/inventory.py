@@ -0,0 +1,362 @@
+# geonet.inventory
+# A continuously refreshed inventory of describe responses served by the daemon.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Sat Oct 24 10:48:19 2026 -0400
+#
+# ID: inventory.py [] benjamin@bengfort.com $
+
+"""
+A continuously refreshed inventory of describe responses served by the daemon.
+
+The inventory keeps a warm connection to every region it is asked about and
+a response for every describe call (region, operation and parameters) that
+has been made through it. Responses are refreshed in the background with an
+adaptive interval: instances are polled every interval seconds and other
+resources twelve times less often, and each time a response is unchanged the
+interval of its call doubles up to a maximum backoff, resetting as soon as the
+response changes. Calls that have not been made in a while are expired so
+that the inventory does not poll resources that nobody is looking at.
+
+The InventoryServer serves the inventory over a Unix domain socket using the
+line-delimited JSON protocol of geonet.daemon.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import time
+import socket
+import threading
+import SocketServer
+
+from functools import partial
+from geonet.region import Region
+from geonet.utils.async import wait
+from geonet.exceptions import RegionUnavailable
+from geonet.health import health, is_unhealthy, CLOSED
+from geonet.utils.singleflight import flights, normalize
+from geonet.daemon import encode, decode, DaemonError, SOCKET
+
+
+# Seconds between refreshes of instances when they change
+POLL_INTERVAL = 5
+
+# Operations that are polled at the poll interval, other operations are polled
+# SLOW_FACTOR times less often since their resources rarely change.
+FAST_OPERATIONS = frozenset(("describe_instances", "describe_instance_status"))
+SLOW_FACTOR = 12
+
+# The maximum multiple of the base interval of an unchanged response
+MAX_BACKOFF = 8
+
+# Seconds after which calls that have not been made are no longer refreshed
+EXPIRES = 600
+
+
+##########################################################################
+## Inventory
+##########################################################################
+
+class Entry(object):
+    """
+    The response of a describe call and when it is next due to be refreshed.
+    """
+
+    def __init__(self, region, operation, params, interval):
+        self.region = region
+        self.operation = operation
+        self.params = params
+        self.base = interval
+        self.interval = interval
+        self.response = None
+        self.updated = None
+        self.accessed = time.time()
+        self.due = self.accessed
+
+    def schedule(self, response):
+        """
+        Stores the response, doubling the refresh interval if it is unchanged
+        and resetting it to the base interval if it has changed.
+        """
+        if self.response is not None and content(response) == content(self.response):
+            self.interval = min(self.interval * 2, self.base * MAX_BACKOFF)
+        else:
+            self.interval = self.base
+
+        self.response = response
+        self.updated = time.time()
+        self.due = self.updated + self.interval
+
+
+def content(response):
+    """
+    Returns the response without its metadata, which changes on every call.
+    """
+    return dict(
+        (key, val) for key, val in response.items()
+        if key != "ResponseMetadata"
+    )
+
+
+class Inventory(object):
+    """
+    A thread-safe read-through cache of describe responses by region,
+    operation and parameters that is refreshed by poll.
+
+    Parameters
+    ----------
+    interval : float, default=POLL_INTERVAL
+        Seconds between refreshes of instances when they change.
+
+    expires : float, default=EXPIRES
+        Seconds after which calls that have not been made are dropped.
+    """
+
+    def __init__(self, interval=POLL_INTERVAL, expires=EXPIRES):
+        self.interval = interval
+        self.expires = expires
+
+        self.lock = threading.Lock()
+        self.regions = {}
+        self.entries = {}
+        self.started = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def region(self, name):
+        """
+        Returns the region with the name, which keeps its connection warm.
+        """
+        with self.lock:
+            if name not in self.regions:
+                self.regions[name] = Region({"RegionName": name})
+            return self.regions[name]
+
+    def describe(self, region, operation, params=None):
+        """
+        Returns the response of the describe call, calling it if it is not
+        in the inventory. The call is refreshed in the background by poll
+        for as long as it keeps being made.
+        """
+        params = params or {}
+        if not operation.startswith("describe_"):
+            raise ValueError("'{}' is not a describe operation".format(operation))
+
+        key = (region, operation, normalize(params))
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                interval = self.interval
+                if operation not in FAST_OPERATIONS:
+                    interval *= SLOW_FACTOR
+                entry = self.entries[key] = Entry(region, operation, params, interval)
+            entry.accessed = time.time()
+            response = entry.response
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if response is None:
+            response = self.refresh(entry)
+        return response
+
+    def refresh(self, entry):
+        """
+        Calls the describe operation of the entry and schedules its next
+        refresh. Concurrent refreshes of the same call share the response.
+        While the region is unhealthy its responses are kept rather than
+        refreshed, and a RegionUnavailable error is raised if there is none.
+        """
+        if not health.allow(entry.region):
+            with self.lock:
+                entry.due = time.time() + entry.interval
+            if entry.response is None:
+                raise RegionUnavailable("region {} is unhealthy".format(entry.region))
+            return entry.response
+
+        conn = self.region(entry.region).conn
+        key = (entry.region, entry.operation, normalize(entry.params))
+        try:
+            response = flights.do(key, getattr(conn, entry.operation), **entry.params)
+        except Exception as e:
+            if is_unhealthy(e):
+                health.failure(entry.region, e)
+            else:
+                health.success(entry.region)
+            raise
+        health.success(entry.region)
+
+        with self.lock:
+            entry.schedule(response)
+            self.refreshes += 1
+        return response
+
+    def invalidate(self, region=None):
+        """
+        Drops the responses of the region (or of every region) so that they
+        are fetched again the next time they are described, e.g. after
+        instances have been launched or terminated.
+        """
+        with self.lock:
+            for key in list(self.entries):
+                if region is None or key[0] == region:
+                    del self.entries[key]
+
+    def poll(self):
+        """
+        Refreshes every call that is due in parallel and drops the calls that
+        have expired. Returns the number of calls that were refreshed.
+        """
+        now = time.time()
+        with self.lock:
+            for key, entry in list(self.entries.items()):
+                if now - entry.accessed > self.expires:
+                    del self.entries[key]
+
+            due = [
+                entry for entry in self.entries.values()
+                if entry.response is not None and entry.due <= now
+            ]
+
+        if due:
+            wait([partial(self.safe_refresh, entry) for entry in due])
+        return len(due)
+
+    def safe_refresh(self, entry):
+        """
+        Refreshes the entry, retrying it at its interval if the call failed so
+        that one unreachable region does not stop the others being polled.
+        """
+        try:
+            self.refresh(entry)
+        except Exception:
+            with self.lock:
+                self.errors += 1
+                entry.due = time.time() + entry.interval
+
+    def run(self, stopped, tick=1):
+        """
+        Polls the inventory every tick seconds until the stopped event is set.
+        """
+        while not stopped.wait(tick):
+            self.poll()
+
+    def status(self):
+        """
+        Returns a summary of the inventory.
+        """
+        with self.lock:
+            return {
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started,
+                "regions": sorted(self.regions),
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "errors": self.errors,
+                "unhealthy": health.status(),
+            }
+
+    def __len__(self):
+        return len(self.entries)
+
+
+##########################################################################
+## Inventory Server
+##########################################################################
+
+class InventoryHandler(SocketServer.StreamRequestHandler):
+    """
+    Replies to each line of the connection with the result of its method.
+    """
+
+    def handle(self):
+        for line in iter(self.rfile.readline, ""):
+            try:
+                request = decode(line)
+                method = getattr(self.server, "rpc_" + request["method"], None)
+                if method is None:
+                    raise DaemonError("unknown method '{}'".format(request["method"]))
+                reply = {"result": method(**request.get("params", {}))}
+            except Exception as e:
+                reply = {"error": "{}: {}".format(e.__class__.__name__, e)}
+            self.wfile.write(encode(reply))
+            self.wfile.flush()
+
+
+class InventoryServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+    """
+    Serves the inventory on a Unix domain socket that only the user can
+    connect to while polling it in the background.
+
+    Raises a DaemonError if another daemon is already listening on the path.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, inventory, path=SOCKET):
+        self.inventory = inventory
+        self.path = path
+        self.stopped = threading.Event()
+
+        if os.path.exists(path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except socket.error:
+                # Stale socket left behind by a daemon that did not exit cleanly
+                os.unlink(path)
+            else:
+                raise DaemonError("a daemon is already listening on {}".format(path))
+            finally:
+                probe.close()
+
+        SocketServer.UnixStreamServer.__init__(self, path, InventoryHandler)
+        os.chmod(path, 0o600)
+
+    def serve(self, tick=1):
+        """
+        Polls the inventory in a background thread and serves requests until
+        shutdown is called.
+        """
+        poller = threading.Thread(target=self.inventory.run, args=(self.stopped, tick))
+        poller.daemon = True
+        poller.start()
+        try:
+            self.serve_forever()
+        finally:
+            self.stopped.set()
+            poller.join()
+
+    def server_close(self):
+        SocketServer.UnixStreamServer.server_close(self)
+        self.stopped.set()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def rpc_ping(self):
+        return "pong"
+
+    def rpc_describe(self, region, operation, params=None):
+        response = self.inventory.describe(region, operation, params)
+        return {"response": response, "healthy": health.state(region) == CLOSED}
+
+    def rpc_invalidate(self, region=None):
+        self.inventory.invalidate(region)
+
+    def rpc_status(self):
+        return self.inventory.status()
+
+    def rpc_shutdown(self):
+        # shutdown blocks until serve_forever returns so it can't be called
+        # from the thread handling this request.
+        thread = threading.Thread(target=self.shutdown)
+        thread.daemon = True
+        thread.start()
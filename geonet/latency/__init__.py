@@ -0,0 +1,26 @@
+# geonet.latency
+# Analysis of network latencies measured between geo-replicated hosts.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 09:12:04 2026 -0400
+#
+# ID: __init__.py [] benjamin@bengfort.com $
+
+"""
+Analysis of network latencies measured between geo-replicated hosts.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from .aggregate import LinkStats, LatencyAggregator
+from .aggregate import read_records
+from .sketch import LogHistogram
+from .ingest import ingest, aggregate_log
+from .dataset import LatencyDataset
+from .simulate import QuorumSimulator
+from .distance import DistanceModel, haversine
+from .nearest import ReplicaIndex
+from .paths import RelayPaths
+from .cluster import LatencyTiers
@@ -0,0 +1,381 @@
+# geonet.latency.aggregate
+# Streaming aggregation of raw round trip latency probes.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 09:12:04 2026 -0400
+#
+# ID: aggregate.py [] benjamin@bengfort.com $
+
+"""
+Streaming aggregation of raw round trip latency probes.
+
+Raw probe logs are CSV files (optionally gzip compressed) with a header row
+that contains at least a source hostname, a destination hostname and the
+round trip time of the message in milliseconds. A timeout is recorded as an
+empty, NaN, or non-positive RTT. For example:
+
+    src,dst,rtt
+    sedna,frankfurt,227.788
+    sedna,frankfurt,
+
+The aggregates produced from these logs are in the same schema as the
+fixtures/network_latencies.csv.gz summary data set.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import csv
+import gzip
+import math
+
+from .sketch import LogHistogram
+from collections import defaultdict
+
+
+# Columns of the network latencies summary data set
+FIELDS = (
+    "src_hostname", "src_location", "src_latitude", "src_longitude",
+    "dst_hostname", "dst_location", "dst_latitude", "dst_longitude",
+    "messages", "timeouts", "mean", "stddev", "fastest", "slowest",
+)
+
+# Columns of the raw probe logs
+SRC = "src"
+DST = "dst"
+RTT = "rtt"
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def open_log(path, mode='rb'):
+    """
+    Opens the log at the specified path, decompressing it if it is gzipped.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def parse_rtt(value):
+    """
+    Parses an RTT from a raw log, returning None if the message timed out.
+    """
+    if value is None or value == "":
+        return None
+
+    value = float(value)
+    if math.isnan(value) or value <= 0:
+        return None
+    return value
+
+
+def _float(value):
+    """
+    Parses an optional float from a CSV cell.
+    """
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def read_records(path, src=SRC, dst=DST, rtt=RTT):
+    """
+    Yields (src, dst, rtt) tuples from the raw probe log at the specified
+    path, where rtt is None if the message timed out. The names of the
+    columns to read are looked up in the header of the log.
+    """
+    with open_log(path) as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        try:
+            cols = [header.index(name) for name in (src, dst, rtt)]
+        except ValueError as e:
+            raise ValueError("could not read {}: {}".format(path, e))
+
+        for row in reader:
+            if not row: continue
+            yield row[cols[0]], row[cols[1]], parse_rtt(row[cols[2]])
+
+
+##########################################################################
+## Link Statistics
+##########################################################################
+
+class LinkStats(object):
+    """
+    Online statistics for the round trip latencies of messages sent from one
+    host to another. Statistics are updated in constant memory using
+    Welford's algorithm and partial statistics (e.g. from different logs or
+    processes) can be merged with the parallel variant of the algorithm.
+
+    Messages is the total number of messages sent, including timeouts, and
+    all other statistics are computed over the messages that did not time
+    out. The standard deviation is the sample standard deviation.
+
+    If a sketch is given, every RTT is also recorded in it so that quantiles
+    of the link latency can be queried. Note that statistics loaded from a
+    summary have no sketch, so the sketch of a merged link only describes
+    the messages that were recorded with a sketch.
+    """
+
+    def __init__(self, messages=0, timeouts=0, mean=0.0, m2=0.0, fastest=None, slowest=None, sketch=None):
+        self.messages = messages
+        self.timeouts = timeouts
+        self.mean = mean
+        self.m2 = m2
+        self.fastest = fastest
+        self.slowest = slowest
+        self.sketch = sketch
+
+    @classmethod
+    def from_summary(klass, messages, timeouts, mean, stddev, fastest, slowest):
+        """
+        Creates link statistics from a row of the latencies summary data set
+        so that new probes can be folded into existing aggregates.
+        """
+        messages, timeouts = int(messages), int(timeouts)
+        samples = messages - timeouts
+        m2 = float(stddev) ** 2 * (samples - 1) if samples > 1 else 0.0
+        if samples < 1:
+            return klass(messages, timeouts)
+        return klass(
+            messages, timeouts, float(mean), m2, float(fastest), float(slowest)
+        )
+
+    @property
+    def samples(self):
+        """
+        The number of messages that did not time out.
+        """
+        return self.messages - self.timeouts
+
+    @property
+    def variance(self):
+        if self.samples < 2:
+            return 0.0
+        return self.m2 / (self.samples - 1)
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def update(self, rtt):
+        """
+        Update the statistics with the RTT of a message, which should be None
+        if the message timed out.
+        """
+        self.messages += 1
+        if rtt is None:
+            self.timeouts += 1
+            return
+
+        delta = rtt - self.mean
+        self.mean += delta / self.samples
+        self.m2 += delta * (rtt - self.mean)
+
+        if self.fastest is None or rtt < self.fastest:
+            self.fastest = rtt
+        if self.slowest is None or rtt > self.slowest:
+            self.slowest = rtt
+
+        if self.sketch is not None:
+            self.sketch.update(rtt)
+
+    def merge(self, other):
+        """
+        Merge the statistics of another link into this one in place.
+        """
+        if other.sketch is not None:
+            if self.sketch is None:
+                self.sketch = other.sketch.copy()
+            else:
+                self.sketch.merge(other.sketch)
+
+        na, nb = self.samples, other.samples
+        self.messages += other.messages
+        self.timeouts += other.timeouts
+
+        if nb == 0:
+            return self
+
+        if na == 0:
+            self.mean, self.m2 = other.mean, other.m2
+            self.fastest, self.slowest = other.fastest, other.slowest
+            return self
+
+        n = na + nb
+        delta = other.mean - self.mean
+        self.mean += delta * nb / n
+        self.m2 += other.m2 + delta * delta * na * nb / n
+        self.fastest = min(self.fastest, other.fastest)
+        self.slowest = max(self.slowest, other.slowest)
+        return self
+
+    def serialize(self):
+        return {
+            "messages": self.messages,
+            "timeouts": self.timeouts,
+            "mean": self.mean if self.samples else None,
+            "stddev": self.stddev if self.samples else None,
+            "fastest": self.fastest,
+            "slowest": self.slowest,
+        }
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def __repr__(self):
+        return "<LinkStats {} messages mean={:0.3f}ms>".format(
+            self.messages, self.mean
+        )
+
+
+def sketched_link():
+    """
+    Creates empty link statistics that record a quantile sketch.
+    """
+    return LinkStats(sketch=LogHistogram())
+
+
+##########################################################################
+## Latency Aggregator
+##########################################################################
+
+class LatencyAggregator(object):
+    """
+    Aggregates round trip latencies for every (src, dst) link observed in
+    raw probe logs. Memory is proportional to the number of links and hosts,
+    not to the number of probes, so logs of any size can be streamed through
+    the aggregator. Aggregators are mergeable, so partial aggregates from many
+    files or processes can be combined exactly.
+
+    Parameters
+    ----------
+    hosts : dict, default=None
+        A mapping of hostname to host metadata (location, latitude, longitude)
+        used to populate the host columns of the summary data set.
+
+    sketches : bool, default=False
+        Record a quantile sketch of the RTTs of every link.
+    """
+
+    @classmethod
+    def load(klass, path):
+        """
+        Load an aggregator from a summary data set on disk (e.g. the network
+        latencies fixture) so that new probe logs can be folded into it.
+        """
+        aggregator = klass()
+        with open_log(path) as f:
+            for row in csv.DictReader(f):
+                for end in ("src", "dst"):
+                    aggregator.add_host(
+                        row[end + "_hostname"],
+                        location=row[end + "_location"] or None,
+                        latitude=_float(row[end + "_latitude"]),
+                        longitude=_float(row[end + "_longitude"]),
+                    )
+
+                link = LinkStats.from_summary(
+                    row["messages"], row["timeouts"], row["mean"],
+                    row["stddev"], row["fastest"], row["slowest"],
+                )
+                aggregator.links[(row["src_hostname"], row["dst_hostname"])] += link
+        return aggregator
+
+    def __init__(self, hosts=None, sketches=False):
+        self.hosts = {}
+        self.sketches = sketches
+        self.links = defaultdict(sketched_link if sketches else LinkStats)
+
+        for hostname, meta in (hosts or {}).items():
+            self.add_host(hostname, **meta)
+
+    def add_host(self, hostname, location=None, latitude=None, longitude=None):
+        """
+        Add or update the metadata of a host, keeping any values not given.
+        """
+        host = self.hosts.setdefault(hostname, {
+            "location": None, "latitude": None, "longitude": None,
+        })
+
+        for key, val in (("location", location), ("latitude", latitude), ("longitude", longitude)):
+            if val is not None:
+                host[key] = val
+
+    def update(self, src, dst, rtt):
+        """
+        Update the link from src to dst with the RTT of a message, which
+        should be None if the message timed out.
+        """
+        self.links[(src, dst)].update(rtt)
+
+    def consume(self, records):
+        """
+        Update the aggregator from an iterable of (src, dst, rtt) records.
+        """
+        links = self.links
+        for src, dst, rtt in records:
+            links[(src, dst)].update(rtt)
+        return self
+
+    def consume_log(self, path, **kwargs):
+        """
+        Stream a raw probe log into the aggregator, see read_records.
+        """
+        return self.consume(read_records(path, **kwargs))
+
+    def merge(self, other):
+        """
+        Merge the links and hosts of another aggregator into this one.
+        """
+        for hostname, meta in other.hosts.items():
+            self.add_host(hostname, **meta)
+
+        for link, stats in other.links.items():
+            self.links[link] += stats
+        return self
+
+    def rows(self):
+        """
+        Yields the aggregates as dictionaries in the summary data set schema,
+        sorted by source and destination hostname.
+        """
+        for (src, dst) in sorted(self.links):
+            row = {}
+            for end, hostname in (("src", src), ("dst", dst)):
+                meta = self.hosts.get(hostname, {})
+                row[end + "_hostname"] = hostname
+                row[end + "_location"] = meta.get("location")
+                row[end + "_latitude"] = meta.get("latitude")
+                row[end + "_longitude"] = meta.get("longitude")
+
+            row.update(self.links[(src, dst)].serialize())
+            yield row
+
+    def dump(self, path):
+        """
+        Write the aggregates to a summary data set at the specified path,
+        compressing it if the path ends in .gz.
+        """
+        with open_log(path, 'wb') as f:
+            writer = csv.DictWriter(f, FIELDS, quoting=csv.QUOTE_NONNUMERIC)
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def __len__(self):
+        return len(self.links)
+
+    def __repr__(self):
+        return "<LatencyAggregator {} links between {} hosts>".format(
+            len(self.links), len(self.hosts)
+        )
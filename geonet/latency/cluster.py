@@ -0,0 +1,243 @@
+# geonet.latency.cluster
+# Hierarchical clustering of hosts into latency tiers.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 20 18:10:52 2026 -0400
+#
+# ID: cluster.py [] benjamin@bengfort.com $
+
+"""
+Hierarchical clustering of hosts into latency tiers.
+
+Replicas are grouped into tiers (e.g. continents or sub-quorums) by
+agglomerative clustering of the RTT matrix. Merges are found with the nearest
+neighbor chain algorithm and distances are updated with the Lance-Williams
+formula one row at a time, so the Python-level work is linear in the number
+of hosts while NumPy does the quadratic work.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import numpy as np
+
+
+# Linkage methods supported by the Lance-Williams update
+LINKAGES = ("single", "complete", "average", "weighted")
+
+# The key used to annotate regions with their latency tier
+TIER_KEY = "LatencyTier"
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def symmetrize(latencies):
+    """
+    Returns a symmetric distance matrix from a directed latency matrix by
+    averaging the RTT measured in both directions, using whichever direction
+    was measured if only one was.
+    """
+    latencies = np.array(latencies, dtype=np.float64)
+    if latencies.ndim != 2 or latencies.shape[0] != latencies.shape[1]:
+        raise ValueError("latencies must be a square matrix")
+
+    pairs = np.stack((latencies, latencies.T))
+    measured = np.isfinite(pairs).sum(axis=0)
+    distances = np.where(np.isfinite(pairs), pairs, 0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        distances = distances / measured
+
+    np.fill_diagonal(distances, 0)
+    return distances
+
+
+def linkage(distances, method="average"):
+    """
+    Agglomerative clustering of a symmetric N x N distance matrix. Returns an
+    (N-1) x 4 merge matrix sorted by distance, where each row is the two
+    clusters merged, the distance between them, and the size of the new
+    cluster. Clusters 0..N-1 are the hosts; the cluster created by merge i is
+    numbered N+i (the same layout as scipy.cluster.hierarchy.linkage).
+    """
+    if method not in LINKAGES:
+        raise ValueError("unknown linkage '{}', use one of {}".format(
+            method, ", ".join(LINKAGES)
+        ))
+
+    dist = np.array(distances, dtype=np.float64)
+    n = len(dist)
+    if dist.ndim != 2 or dist.shape != (n, n):
+        raise ValueError("distances must be a square matrix")
+
+    np.fill_diagonal(dist, 0)
+    if not np.isfinite(dist).all():
+        raise ValueError("distances must be measured between every pair of hosts")
+
+    np.fill_diagonal(dist, np.inf)
+    size = np.ones(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+    merges = []
+    chain = []
+
+    # Nearest neighbor chain: follow nearest neighbors until two clusters are
+    # each other's nearest neighbor, then merge them. The merged cluster keeps
+    # the row of b and the row of a is retired by setting it to inf.
+    while len(merges) < n - 1:
+        if not chain:
+            chain.append(int(np.flatnonzero(active)[0]))
+
+        while True:
+            a = chain[-1]
+            b = int(np.argmin(dist[a]))
+            if len(chain) > 1:
+                prev = chain[-2]
+                if dist[a, prev] <= dist[a, b]:
+                    b = prev
+                    break
+            chain.append(b)
+
+        a, b = chain.pop(), chain.pop()
+        merges.append((a, b, dist[a, b]))
+
+        # Lance-Williams update of the distances to the merged cluster
+        if method == "single":
+            row = np.minimum(dist[a], dist[b])
+        elif method == "complete":
+            row = np.maximum(dist[a], dist[b])
+        elif method == "average":
+            row = (size[a] * dist[a] + size[b] * dist[b]) / (size[a] + size[b])
+        else:
+            row = (dist[a] + dist[b]) / 2
+
+        size[b] += size[a]
+        active[a] = False
+        row[~active] = np.inf
+        row[b] = np.inf
+        dist[b, :] = dist[:, b] = row
+        dist[a, :] = dist[:, a] = np.inf
+
+    # Order the merges by height and label clusters with a union-find, since
+    # the row that survives a merge does not identify the new cluster.
+    order = sorted(range(len(merges)), key=lambda idx: merges[idx][2])
+    parent = list(range(2 * n - 1))
+    counts = [1] * n + [0] * (n - 1)
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    Z = np.empty((n - 1, 4), dtype=np.float64)
+    for idx, mdx in enumerate(order):
+        a, b, height = merges[mdx]
+        ca, cb = sorted((find(a), find(b)))
+        parent[ca] = parent[cb] = n + idx
+        counts[n + idx] = counts[ca] + counts[cb]
+        Z[idx] = (ca, cb, height, counts[n + idx])
+    return Z
+
+
+def fcluster(Z, n_clusters=None, threshold=None):
+    """
+    Cuts the tree of a merge matrix into flat clusters, either into the
+    specified number of clusters or by merging clusters closer than the
+    threshold. Returns an array of cluster labels numbered 0..k-1 in the
+    order of the first host of each cluster.
+    """
+    if (n_clusters is None) == (threshold is None):
+        raise ValueError("specify either the number of clusters or a threshold")
+
+    n = len(Z) + 1
+    if n_clusters is not None:
+        if not 0 < n_clusters <= n:
+            raise ValueError("cannot split {} hosts into {} clusters".format(n, n_clusters))
+        nmerges = n - n_clusters
+    else:
+        nmerges = int(np.searchsorted(Z[:, 2], threshold, side="right"))
+
+    # Every node of the tree inherits the root of the merge above it, so a
+    # single pass from the top down labels each host with its cluster.
+    roots = np.arange(2 * n - 1)
+    for idx in range(nmerges - 1, -1, -1):
+        roots[int(Z[idx, 0])] = roots[int(Z[idx, 1])] = roots[n + idx]
+
+    _, first, labels = np.unique(roots[:n], return_index=True, return_inverse=True)
+    return np.argsort(np.argsort(first))[labels]
+
+
+def annotate_regions(regions, assignments, key=TIER_KEY):
+    """
+    Annotates every region whose RegionName or LocaleName matches a host with
+    its tier so that the tiers can be saved in the region data. Returns the
+    hosts that did not match any region.
+    """
+    unmatched = []
+    for host, label in sorted(assignments.items()):
+        region = regions.find(host)
+        if region is None:
+            unmatched.append(host)
+            continue
+        region[key] = label
+    return unmatched
+
+
+##########################################################################
+## Latency Tiers
+##########################################################################
+
+class LatencyTiers(object):
+    """
+    Hierarchical clustering of hosts by the RTT between them.
+
+    Parameters
+    ----------
+    latencies : array-like
+        An N x N matrix of link latencies, NaN for unmeasured links. At least
+        one direction of every link must be measured.
+
+    hosts : list, default=None
+        The hostname of every row of the matrix, by default its index.
+
+    method : str, default="average"
+        The linkage used to compute the distance between clusters, one of
+        single, complete, average or weighted.
+    """
+
+    @classmethod
+    def from_dataset(klass, dataset, model=None, **kwargs):
+        """
+        Cluster the hosts of a LatencyDataset by their mean RTTs. If a
+        DistanceModel is given, unmeasured links are filled with predictions.
+        """
+        latencies = dataset.mean if model is None else model.fill(dataset)[0]
+        return klass(latencies, hosts=dataset.hostnames, **kwargs)
+
+    def __init__(self, latencies, hosts=None, method="average"):
+        self.distances = symmetrize(latencies)
+        self.hosts = list(hosts) if hosts is not None else list(range(len(self.distances)))
+        self.method = method
+        self.merges = linkage(self.distances, method=method)
+
+    def __len__(self):
+        return len(self.hosts)
+
+    def clusters(self, n_clusters=None, threshold=None):
+        """
+        Returns the tier label of every host, cutting the tree into either the
+        specified number of tiers or wherever clusters are further apart than
+        the threshold in ms.
+        """
+        return fcluster(self.merges, n_clusters=n_clusters, threshold=threshold)
+
+    def assign(self, n_clusters=None, threshold=None):
+        """
+        Returns a dict mapping each hostname to its tier label.
+        """
+        labels = self.clusters(n_clusters=n_clusters, threshold=threshold)
+        return {host: int(label) for host, label in zip(self.hosts, labels)}
@@ -0,0 +1,268 @@
+# geonet.latency.dataset
+# Compact, memory-mapped on-disk format for latency matrices.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 13:21:37 2026 -0400
+#
+# ID: dataset.py [] benjamin@bengfort.com $
+
+"""
+Compact, memory-mapped on-disk format for latency matrices.
+
+A latency dataset is a directory that contains a small JSON header with the
+host metadata and one NumPy .npy file per statistic, each an N x N matrix
+indexed by [src, dst] with NaN (or 0 for counts) where a link was not
+measured. The matrices are loaded with mmap so that loading is near instant
+regardless of size and the pages are shared by every process that analyzes
+the same dataset.
+
+If the links were aggregated with quantile sketches, the sketches are stored
+sparsely: sketch_links holds the sorted flat index (src * N + dst) of every
+sketched link and sketches holds one row of bucket counts per link.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import json
+import numpy as np
+
+from .aggregate import LatencyAggregator
+from .sketch import LogHistogram, QUANTILES
+from .sketch import quorum_quantiles
+
+
+# Dataset format version and file names
+VERSION = 1
+HEADER = "header.json"
+
+# Matrices stored in the dataset and their data types
+MATRICES = (
+    ("messages", np.int64),
+    ("timeouts", np.int64),
+    ("mean", np.float64),
+    ("stddev", np.float64),
+    ("fastest", np.float64),
+    ("slowest", np.float64),
+)
+
+# Per-host arrays stored in the dataset
+COORDINATES = ("latitude", "longitude")
+
+# Sparse sketch arrays stored in the dataset
+SKETCH_LINKS = "sketch_links"
+SKETCHES = "sketches"
+
+
+##########################################################################
+## Latency Dataset
+##########################################################################
+
+class LatencyDataset(object):
+    """
+    A latency matrix between hosts along with the location of every host.
+
+    Parameters
+    ----------
+    hosts : list of dict
+        The hostname and location of every host in matrix order.
+
+    arrays : dict
+        A mapping of name to array for every matrix in MATRICES and every
+        coordinate array in COORDINATES, and optionally the sketch arrays.
+
+    sketch : dict, default=None
+        The layout of the sketches if the dataset contains them.
+    """
+
+    @classmethod
+    def load(klass, path, mmap_mode='r'):
+        """
+        Load the dataset in the directory at path. By default the arrays are
+        read-only memory maps of the files on disk; pass mmap_mode=None to
+        read them into memory instead.
+        """
+        with open(os.path.join(path, HEADER), 'r') as f:
+            header = json.load(f)
+
+        if header["version"] != VERSION:
+            raise ValueError("unknown latency dataset version {}".format(header["version"]))
+
+        arrays = {
+            name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode)
+            for name in header["arrays"]
+        }
+        return klass(header["hosts"], arrays, header.get("sketch"))
+
+    @classmethod
+    def from_aggregator(klass, aggregator):
+        """
+        Create a dataset from the links and hosts of a LatencyAggregator.
+        """
+        hostnames = set(aggregator.hosts)
+        for src, dst in aggregator.links:
+            hostnames.update((src, dst))
+        hostnames = sorted(hostnames)
+
+        hosts, coords = [], {key: [] for key in COORDINATES}
+        for hostname in hostnames:
+            meta = aggregator.hosts.get(hostname, {})
+            hosts.append({"hostname": hostname, "location": meta.get("location")})
+            for key in COORDINATES:
+                val = meta.get(key)
+                coords[key].append(np.nan if val is None else val)
+
+        arrays = klass.empty(len(hosts))
+        for key in COORDINATES:
+            arrays[key] = np.array(coords[key], dtype=np.float64)
+
+        index = {hostname: idx for idx, hostname in enumerate(hostnames)}
+        sketches = {}
+        for (src, dst), stats in aggregator.links.items():
+            i, j = index[src], index[dst]
+            for key, val in stats.serialize().items():
+                if val is not None:
+                    arrays[key][i, j] = val
+
+            if stats.sketch is not None:
+                sketches[i * len(hosts) + j] = stats.sketch
+
+        layout = None
+        if sketches:
+            links = sorted(sketches)
+            layout = sketches[links[0]].layout
+            arrays[SKETCH_LINKS] = np.array(links, dtype=np.int64)
+            arrays[SKETCHES] = np.vstack([sketches[link].counts for link in links])
+
+        return klass(hosts, arrays, layout)
+
+    @classmethod
+    def from_csv(klass, path):
+        """
+        Convert a latencies csv in the network_latencies.csv.gz schema.
+        """
+        return klass.from_aggregator(LatencyAggregator.load(path))
+
+    @staticmethod
+    def empty(n):
+        """
+        Returns the matrices for n hosts with no measured links.
+        """
+        arrays = {}
+        for name, dtype in MATRICES:
+            if np.issubdtype(dtype, np.integer):
+                arrays[name] = np.zeros((n, n), dtype=dtype)
+            else:
+                arrays[name] = np.full((n, n), np.nan, dtype=dtype)
+        return arrays
+
+    def __init__(self, hosts, arrays, sketch=None):
+        self.hosts = hosts
+        self.arrays = arrays
+        self.sketch_layout = sketch
+        self.index = {
+            host["hostname"]: idx for idx, host in enumerate(hosts)
+        }
+
+    @property
+    def hostnames(self):
+        return [host["hostname"] for host in self.hosts]
+
+    @property
+    def locations(self):
+        return [host["location"] for host in self.hosts]
+
+    def __getattr__(self, name):
+        # Expose the arrays as attributes (e.g. dataset.mean)
+        arrays = self.__dict__.get("arrays", {})
+        if name in arrays:
+            return arrays[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            self.__class__.__name__, name
+        ))
+
+    def link(self, src, dst):
+        """
+        Returns the statistics of the link between the two hostnames.
+        """
+        i, j = self.index[src], self.index[dst]
+        return {
+            name: self.arrays[name][i, j].item()
+            for name, _ in MATRICES
+        }
+
+    def sketch(self, src, dst):
+        """
+        Returns the LogHistogram of the link between the two hostnames, or
+        None if the link was not sketched.
+        """
+        if self.sketch_layout is None:
+            return None
+
+        code = self.index[src] * len(self) + self.index[dst]
+        links = self.arrays[SKETCH_LINKS]
+        idx = np.searchsorted(links, code)
+        if idx >= len(links) or links[idx] != code:
+            return None
+        return LogHistogram(self.arrays[SKETCHES][idx], **self.sketch_layout)
+
+    def quantiles(self, src, dst, q=QUANTILES):
+        """
+        Returns the quantiles of the RTT of the link from its sketch.
+        """
+        sketch = self.sketch(src, dst)
+        if sketch is None:
+            raise LookupError("no sketch of the link from {} to {}".format(src, dst))
+        return sketch.quantile(q)
+
+    def quorum_quantiles(self, leader, replicas, q=QUANTILES, quorum=None):
+        """
+        Returns the quantiles of the time it takes the leader to collect a
+        quorum of responses from the replicas, computed from the sketches of
+        the links from the leader to each replica. The quorum includes the
+        leader itself and defaults to a majority of the leader and replicas.
+        """
+        replicas = [replica for replica in replicas if replica != leader]
+        quorum = quorum or (len(replicas) + 1) // 2 + 1
+
+        sketches = []
+        for replica in replicas:
+            sketch = self.sketch(leader, replica)
+            if sketch is None:
+                raise LookupError("no sketch of the link from {} to {}".format(leader, replica))
+            sketches.append(sketch)
+
+        return quorum_quantiles(sketches, quorum - 1, q)
+
+    def dump(self, path):
+        """
+        Write the dataset to the directory at path, creating it if required.
+        """
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        for name, arr in self.arrays.items():
+            np.save(os.path.join(path, name + ".npy"), np.ascontiguousarray(arr))
+
+        header = {
+            "version": VERSION,
+            "shape": [len(self), len(self)],
+            "arrays": sorted(self.arrays.keys()),
+            "hosts": self.hosts,
+        }
+
+        if self.sketch_layout is not None:
+            header["sketch"] = self.sketch_layout
+
+        with open(os.path.join(path, HEADER), 'w') as f:
+            json.dump(header, f, indent=2)
+
+    def __len__(self):
+        return len(self.hosts)
+
+    def __repr__(self):
+        return "<LatencyDataset of {} hosts with {} links>".format(
+            len(self), int(np.count_nonzero(self.arrays["messages"]))
+        )
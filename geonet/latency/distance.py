@@ -0,0 +1,157 @@
+# geonet.latency.distance
+# Great-circle distance model to predict unmeasured latencies.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 20 11:14:39 2026 -0400
+#
+# ID: distance.py [] benjamin@bengfort.com $
+
+"""
+Great-circle distance model to predict unmeasured latencies.
+
+Round trip latency between two hosts is dominated by the propagation delay
+over the distance between them, so a linear regression of the measured mean
+RTT on the great-circle distance between hosts gives a reasonable estimate of
+the RTT of links that have not been probed.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import numpy as np
+
+
+# Mean radius of the earth in kilometers
+EARTH_RADIUS = 6371.0088
+
+
+##########################################################################
+## Distance Helpers
+##########################################################################
+
+def haversine(lat1, lon1, lat2, lon2, radius=EARTH_RADIUS):
+    """
+    Returns the great-circle distance in kilometers between points given in
+    degrees. The inputs are broadcast against each other, so this computes
+    distances between arrays of points in a single vectorized pass.
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2 +
+        np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * radius * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def pairwise_distances(latitude, longitude, radius=EARTH_RADIUS):
+    """
+    Returns the N x N matrix of great-circle distances between N points.
+    """
+    latitude = np.asarray(latitude, dtype=np.float64)
+    longitude = np.asarray(longitude, dtype=np.float64)
+    return haversine(
+        latitude[:, None], longitude[:, None],
+        latitude[None, :], longitude[None, :], radius,
+    )
+
+
+##########################################################################
+## Distance Model
+##########################################################################
+
+class DistanceModel(object):
+    """
+    A least squares fit of mean RTT (ms) to great-circle distance (km):
+
+        rtt = intercept + slope * distance
+
+    The model also keeps the residual standard error of the fit so that it
+    can report the standard error of a prediction at any distance.
+    """
+
+    @classmethod
+    def from_dataset(klass, dataset):
+        """
+        Fit the model to the measured links of a LatencyDataset.
+        """
+        distances = pairwise_distances(dataset.latitude, dataset.longitude)
+        return klass().fit(distances, dataset.mean)
+
+    def __init__(self):
+        self.intercept = None
+        self.slope = None
+        self.sigma = None
+        self.n = 0
+        self._xbar = None
+        self._sxx = None
+
+    def fit(self, distances, latencies):
+        """
+        Fit the model to arrays of distances and latencies, ignoring any pairs
+        where either value is NaN and any pairs between the same host.
+        """
+        distances = np.asarray(distances, dtype=np.float64)
+        latencies = np.asarray(latencies, dtype=np.float64)
+
+        mask = np.isfinite(distances) & np.isfinite(latencies)
+        if distances.ndim == 2:
+            np.fill_diagonal(mask, False)
+
+        x, y = distances[mask], latencies[mask]
+        if len(x) < 3:
+            raise ValueError("at least 3 measured links are required to fit the model")
+
+        A = np.column_stack((np.ones_like(x), x))
+        (self.intercept, self.slope), _, _, _ = np.linalg.lstsq(A, y, rcond=None)
+
+        residuals = y - self.predict(x)
+        self.n = len(x)
+        self.sigma = np.sqrt((residuals ** 2).sum() / (self.n - 2))
+        self._xbar = x.mean()
+        self._sxx = ((x - self._xbar) ** 2).sum()
+        return self
+
+    def predict(self, distances):
+        """
+        Returns the predicted mean RTT at the specified distances.
+        """
+        return self.intercept + self.slope * np.asarray(distances, dtype=np.float64)
+
+    def stderr(self, distances):
+        """
+        Returns the standard error of a prediction at the specified distances,
+        which grows with the distance from the mean distance of the fit.
+        """
+        distances = np.asarray(distances, dtype=np.float64)
+        leverage = 1.0 / self.n
+        if self._sxx > 0:
+            leverage = leverage + (distances - self._xbar) ** 2 / self._sxx
+        return self.sigma * np.sqrt(1 + leverage)
+
+    def fill(self, dataset):
+        """
+        Fill the unmeasured (NaN) entries of the dataset mean latency matrix.
+        Returns the filled matrix and a matrix of the standard error of every
+        filled entry, which is 0 for measured links. Links to hosts without
+        coordinates remain NaN, as does the diagonal.
+        """
+        distances = pairwise_distances(dataset.latitude, dataset.longitude)
+        latencies = np.array(dataset.mean, dtype=np.float64)
+        missing = np.isnan(latencies)
+        np.fill_diagonal(missing, False)
+
+        stderr = np.zeros_like(latencies)
+        latencies[missing] = self.predict(distances[missing])
+        stderr[missing] = self.stderr(distances[missing])
+        np.fill_diagonal(stderr, np.nan)
+        return latencies, stderr
+
+    def __repr__(self):
+        if self.slope is None:
+            return "<DistanceModel (unfit)>"
+        return "<DistanceModel rtt = {:0.3f} + {:0.5f} * km (sigma={:0.3f}ms)>".format(
+            self.intercept, self.slope, self.sigma
+        )
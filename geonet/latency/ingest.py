@@ -0,0 +1,348 @@
+# geonet.latency.ingest
+# Parallel ingestion of raw latency probe logs with a process pool.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 11:03:46 2026 -0400
+#
+# ID: ingest.py [] benjamin@bengfort.com $
+
+"""
+Parallel ingestion of raw latency probe logs with a process pool.
+
+Each log is decompressed and parsed by a worker process, which reads the log
+in large chunks and aggregates each chunk with vectorized NumPy operations
+rather than creating Python objects for every line (chunks with quoted fields
+are split by the csv module instead). The workers report their progress after
+every chunk and the partial aggregates they return are merged into a single
+LatencyAggregator.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import os
+import csv
+import time
+import numpy as np
+
+from Queue import Empty
+from StringIO import StringIO
+from functools import partial
+from multiprocessing import Pool, Queue, TimeoutError, cpu_count
+
+from .aggregate import open_log
+from .sketch import LogHistogram
+from .aggregate import LatencyAggregator
+from .aggregate import SRC, DST, RTT
+
+
+# Number of bytes of decompressed log to parse at a time
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# Seconds to wait for a log to complete before reporting chunk progress
+PROGRESS_INTERVAL = 0.2
+
+
+##########################################################################
+## Chunked Log Reading
+##########################################################################
+
+def read_chunks(f, size=CHUNK_SIZE):
+    """
+    Yields blocks of complete lines from the open file, reading roughly size
+    bytes at a time so that only one chunk is held in memory.
+    """
+    remainder = ""
+    while True:
+        block = f.read(size)
+        if not block:
+            break
+
+        block = remainder + block
+        idx = block.rfind("\n")
+        if idx < 0:
+            remainder = block
+            continue
+
+        remainder = block[idx+1:]
+        yield block[:idx+1]
+
+    if remainder.strip():
+        yield remainder
+
+
+def aggregate_chunk(chunk, cols, ncols, sketches=False):
+    """
+    Aggregates a block of complete CSV lines into a LatencyAggregator. The
+    fields are split and converted in bulk and grouped by link with NumPy, so
+    the Python level work is proportional to the number of links in the chunk
+    rather than to the number of lines. If sketches is True, a quantile sketch
+    is also recorded for every link.
+    """
+    aggregator = LatencyAggregator(sketches=sketches)
+    chunk = chunk.replace("\r", "").strip("\n")
+    while "\n\n" in chunk:
+        # Skip blank lines as the csv reader of read_records does
+        chunk = chunk.replace("\n\n", "\n")
+    if not chunk:
+        return aggregator
+
+    if '"' in chunk:
+        # Quoted fields are parsed by the csv module as read_records does
+        rows = [row for row in csv.reader(StringIO(chunk)) if row]
+        if any(len(row) != ncols for row in rows):
+            raise ValueError("malformed log: expected {} columns per line".format(ncols))
+        fields = np.array(rows).reshape(-1, ncols)
+    else:
+        fields = chunk.replace("\n", ",").split(",")
+        if len(fields) % ncols != 0:
+            raise ValueError("malformed log: expected {} columns per line".format(ncols))
+        fields = np.array(fields).reshape(-1, ncols)
+
+    rtt = fields[:, cols[2]]
+    rtt = np.where(rtt == "", "nan", rtt).astype(np.float64)
+
+    # Assign every line an integer link id
+    srcs, isrc = np.unique(fields[:, cols[0]], return_inverse=True)
+    dsts, idst = np.unique(fields[:, cols[1]], return_inverse=True)
+    codes, links = np.unique(isrc * len(dsts) + idst, return_inverse=True)
+    nlinks = len(codes)
+
+    # Compute the per-link statistics of messages that did not time out
+    with np.errstate(invalid="ignore"):
+        ok = rtt > 0
+    rtt, okl = rtt[ok], links[ok]
+    messages = np.bincount(links, minlength=nlinks)
+    samples = np.bincount(okl, minlength=nlinks)
+    sums = np.bincount(okl, weights=rtt, minlength=nlinks)
+    means = np.divide(sums, samples, out=np.zeros(nlinks), where=samples > 0)
+    m2 = np.bincount(okl, weights=(rtt - means[okl]) ** 2, minlength=nlinks)
+
+    # Fastest and slowest via a sort by link then rtt
+    order = np.lexsort((rtt, okl))
+    okl, rtt = okl[order], rtt[order]
+    first = np.searchsorted(okl, np.arange(nlinks), side="left")
+    last = np.searchsorted(okl, np.arange(nlinks), side="right") - 1
+
+    if sketches:
+        layout = LogHistogram()
+        buckets = layout.bucket(rtt)
+
+    for idx, code in enumerate(codes):
+        src, dst = str(srcs[code // len(dsts)]), str(dsts[code % len(dsts)])
+        stats = aggregator.links[(src, dst)]
+        stats.messages = int(messages[idx])
+        stats.timeouts = int(messages[idx] - samples[idx])
+
+        if samples[idx] > 0:
+            stats.mean = float(means[idx])
+            stats.m2 = float(m2[idx])
+            stats.fastest = float(rtt[first[idx]])
+            stats.slowest = float(rtt[last[idx]])
+
+            if sketches:
+                stats.sketch.counts += np.bincount(
+                    buckets[first[idx]:last[idx]+1], minlength=layout.nbins
+                )
+
+    return aggregator
+
+
+def aggregate_log(path, src=SRC, dst=DST, rtt=RTT, chunk_size=CHUNK_SIZE, sketches=False,
+                  progress=None):
+    """
+    Aggregates a single raw probe log chunk by chunk. Returns the aggregator
+    along with the number of decompressed bytes and records read. If given,
+    progress is called with the path and the number of bytes and records
+    read so far after every chunk.
+    """
+    aggregator = LatencyAggregator(sketches=sketches)
+    nbytes, nrecords = 0, 0
+
+    with open_log(path) as f:
+        header = f.readline()
+        nbytes += len(header)
+        header = next(csv.reader([header]))
+
+        try:
+            cols = [header.index(name) for name in (src, dst, rtt)]
+        except ValueError as e:
+            raise ValueError("could not read {}: {}".format(path, e))
+
+        for chunk in read_chunks(f, chunk_size):
+            nbytes += len(chunk)
+            records = aggregate_chunk(chunk, cols, len(header), sketches)
+            nrecords += sum(stats.messages for stats in records.links.values())
+            aggregator += records
+
+            if progress is not None:
+                progress(path, nbytes, nrecords)
+
+    return aggregator, nbytes, nrecords
+
+
+##########################################################################
+## Parallel Ingestion
+##########################################################################
+
+class IngestProgress(object):
+    """
+    Tracks the throughput of an ingestion so that it can be reported.
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.completed = 0
+        self.nbytes = 0
+        self.nrecords = 0
+        self.started = time.time()
+        self.logs = {}
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started
+
+    def advance(self, path, nbytes, nrecords):
+        """
+        Records the bytes and records read so far from a log in progress.
+        Returns False if the log has already completed.
+        """
+        previous = self.logs.get(path, (0, 0, False))
+        if previous[2]:
+            return False
+
+        self.nbytes += nbytes - previous[0]
+        self.nrecords += nrecords - previous[1]
+        self.logs[path] = (nbytes, nrecords, False)
+        return True
+
+    def update(self, path, nbytes, nrecords):
+        """
+        Records that a log has completed with its total bytes and records.
+        """
+        self.advance(path, nbytes, nrecords)
+        self.logs[path] = (nbytes, nrecords, True)
+        self.completed += 1
+
+    def __str__(self):
+        elapsed = max(self.elapsed, 1e-9)
+        return "ingested {}/{} logs: {:0.1f} MB at {:0.1f} MB/s ({:,.0f} records/s)".format(
+            self.completed, self.total, self.nbytes / 1048576.0,
+            self.nbytes / 1048576.0 / elapsed, self.nrecords / elapsed,
+        )
+
+
+def ingest(paths, aggregator=None, processes=None, callback=None, **kwargs):
+    """
+    Ingest raw probe logs in parallel across a process pool, merging the
+    partial aggregates of each log into the aggregator (a new one is created
+    if None). The callback is called with an IngestProgress after every chunk
+    read by the workers and after each log completes. Any kwargs are passed
+    to aggregate_log.
+    """
+    if aggregator is None:
+        aggregator = LatencyAggregator(sketches=kwargs.get("sketches", False))
+    progress = IngestProgress(len(paths))
+    processes = processes or cpu_count()
+
+    # Don't spin up extra processes for a single log
+    if processes == 1 or len(paths) == 1:
+        def advance(path, nbytes, nrecords):
+            progress.advance(path, nbytes, nrecords)
+            if callback is not None:
+                callback(progress)
+
+        for path in paths:
+            result = aggregate_log(path, progress=advance, **kwargs)
+            _merge(aggregator, path, result, progress, callback)
+        return aggregator
+
+    # Workers report the progress of every chunk on a queue
+    queue = Queue()
+    pool = Pool(min(processes, len(paths)), initializer=_init_worker, initargs=(queue,))
+    try:
+        results = pool.imap_unordered(partial(_aggregate_log, kwargs), paths)
+        for _ in range(len(paths)):
+            while True:
+                try:
+                    path, result = results.next(PROGRESS_INTERVAL)
+                    break
+                except TimeoutError:
+                    _drain(queue, progress, callback)
+
+            _drain(queue, progress, callback)
+            _merge(aggregator, path, result, progress, callback)
+        return aggregator
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+# The progress queue of a worker process of the pool
+_progress = None
+
+
+def _init_worker(queue):
+    """
+    Sets the progress queue of a worker process.
+    """
+    global _progress
+    _progress = queue
+
+
+def _report(path, nbytes, nrecords):
+    """
+    Sends the progress of a log from a worker process.
+    """
+    _progress.put((path, nbytes, nrecords))
+
+
+def _aggregate_log(kwargs, path):
+    """
+    Picklable worker function for the process pool.
+    """
+    return path, aggregate_log(path, progress=_report, **kwargs)
+
+
+def _drain(queue, progress, callback):
+    """
+    Report the chunk progress sent by the workers.
+    """
+    while not queue.empty():
+        try:
+            path, nbytes, nrecords = queue.get_nowait()
+        except Empty:
+            return
+        if progress.advance(path, nbytes, nrecords) and callback is not None:
+            callback(progress)
+
+
+def _merge(aggregator, path, result, progress, callback):
+    """
+    Merge the partial result of a log and report that it completed.
+    """
+    partial_aggregator, nbytes, nrecords = result
+    aggregator += partial_aggregator
+    progress.update(path, nbytes, nrecords)
+    if callback is not None:
+        callback(progress)
+
+
+def find_logs(paths, ext=(".csv", ".csv.gz", ".log", ".log.gz")):
+    """
+    Expand the paths to a sorted list of logs, walking any directories.
+    """
+    logs = []
+    for path in paths:
+        if not os.path.isdir(path):
+            logs.append(path)
+            continue
+
+        for root, _, fnames in os.walk(path):
+            for fname in fnames:
+                if fname.endswith(ext):
+                    logs.append(os.path.join(root, fname))
+    return sorted(logs)
@@ -0,0 +1,210 @@
+# geonet.latency.nearest
+# Nearest replica assignment for large client populations.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 20 14:05:51 2026 -0400
+#
+# ID: nearest.py [] benjamin@bengfort.com $
+
+"""
+Nearest replica assignment for large client populations.
+
+Replica and client locations are indexed as unit vectors on the sphere, where
+the chord distance between two points is monotonic in their great-circle
+distance, so nearest neighbors are found with a single matrix product. The
+replicas of a geo-replicated deployment are clustered in a handful of
+regions, so the index stores each distinct site once and queries clients in
+blocks against every site. With tens of sites this is faster than walking a
+tree and it keeps memory bounded for millions of clients.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import numpy as np
+
+from .distance import EARTH_RADIUS
+
+
+# Number of clients to query at a time to bound memory usage
+CHUNK_CLIENTS = 65536
+
+# Maximum number of candidate replicas ranked at a time over all clients
+CHUNK_ELEMENTS = 4194304
+
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def to_unit_vectors(latitude, longitude):
+    """
+    Converts arrays of coordinates in degrees to an (N, 3) array of unit
+    vectors on the sphere.
+    """
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    return np.column_stack((
+        np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)
+    ))
+
+
+##########################################################################
+## Replica Index
+##########################################################################
+
+class ReplicaIndex(object):
+    """
+    A spatial index of replica locations for batch nearest-k queries.
+
+    Parameters
+    ----------
+    latitude, longitude : array-like
+        The location of every replica in degrees.
+
+    labels : list, default=None
+        A label for every replica (e.g. instance ids), by default its index.
+
+    model : DistanceModel, default=None
+        If given, queries rank and report replicas by predicted latency (ms)
+        rather than by great-circle distance (km).
+    """
+
+    @classmethod
+    def from_managed(klass, manager=None, **kwargs):
+        """
+        Create an index of the instances under management, located at the
+        coordinates of their region.
+        """
+        # Imported here so analysis does not require the AWS configuration
+        from geonet.managed import ManagedInstances
+        manager = manager if manager is not None else ManagedInstances.load()
+
+        labels, regions, coords = [], [], []
+        for region, instances in manager.regions():
+            if region.coordinates is None:
+                raise LookupError("no coordinates for region {}".format(region))
+
+            for instance in sorted(instances):
+                labels.append(instance)
+                regions.append(str(region))
+                coords.append(region.coordinates)
+
+        if not labels:
+            raise ValueError("no instances under management to index")
+
+        coords = np.array(coords)
+        index = klass(coords[:, 0], coords[:, 1], labels=labels, **kwargs)
+        index.regions = regions
+        return index
+
+    def __init__(self, latitude, longitude, labels=None, model=None):
+        latitude = np.asarray(latitude, dtype=np.float64)
+        longitude = np.asarray(longitude, dtype=np.float64)
+        if latitude.shape != longitude.shape or latitude.ndim != 1:
+            raise ValueError("latitude and longitude must be 1D arrays of the same length")
+
+        self.labels = list(labels) if labels is not None else list(range(len(latitude)))
+        self.regions = None
+        self.model = model
+
+        # Deduplicate replicas at the same location into sites
+        coords = np.column_stack((latitude, longitude))
+        sites, self.site_of = np.unique(coords, axis=0, return_inverse=True)
+        self.sites = to_unit_vectors(sites[:, 0], sites[:, 1])
+
+        # Position of each replica among the replicas at its site
+        order = np.argsort(self.site_of, kind="mergesort")
+        counts = np.bincount(self.site_of)
+        starts = np.cumsum(counts) - counts
+        self.slot = np.empty_like(self.site_of)
+        self.slot[order] = np.arange(len(order)) - starts[self.site_of[order]]
+        self.colocated = counts[self.site_of]
+
+    def __len__(self):
+        return len(self.site_of)
+
+    def query(self, latitude, longitude, k=1, chunk=CHUNK_CLIENTS):
+        """
+        Find the k nearest replicas to each client. Returns a (M, k) array of
+        distances (or predicted latencies if the index has a model) and a
+        (M, k) array of replica indices, both sorted nearest first. Clients
+        that are equidistant to several replicas (e.g. replicas in the same
+        region) are spread evenly across them.
+
+        The sites are ranked rather than the replicas, and only the k nearest
+        sites of each client are expanded into their replicas, so the memory
+        of each block of clients is bounded by the number of sites and k
+        rather than by the number of replicas.
+        """
+        if not 0 < k <= len(self):
+            raise ValueError("cannot query {} nearest of {} replicas".format(k, len(self)))
+
+        if self.model is not None and not self.model.slope > 0:
+            raise ValueError("distance model must predict latency increasing with distance")
+
+        clients = to_unit_vectors(latitude, longitude)
+        nclients, nsites = len(clients), len(self.sites)
+        distances = np.empty((nclients, k))
+        indices = np.empty((nclients, k), dtype=np.intp)
+
+        # The replicas of every site by their slot, and the number of sites
+        # and replicas per site to expand for each client.
+        counts = np.bincount(self.site_of)
+        ksites, kslots = min(k, nsites), min(k, counts.max())
+        members = np.zeros((nsites, counts.max()), dtype=np.intp)
+        members[self.site_of, self.slot] = np.arange(len(self))
+
+        # Bound the size of the candidate arrays of each block
+        chunk = max(1, min(chunk, CHUNK_ELEMENTS // max(nsites, ksites * kslots)))
+
+        for start in range(0, nclients, chunk):
+            block = clients[start:start+chunk]
+            rows = np.arange(start, start + len(block))[:, None]
+
+            # Great-circle distance from the dot product with each site
+            cosines = np.clip(block.dot(self.sites.T), -1, 1)
+            dist = EARTH_RADIUS * np.arccos(cosines)
+
+            # The nearest sites of each client, nearest first
+            if ksites < nsites:
+                nearest = np.argpartition(dist, ksites - 1, axis=1)[:, :ksites]
+            else:
+                nearest = np.tile(np.arange(nsites), (len(block), 1))
+            order = np.argsort(np.take_along_axis(dist, nearest, axis=1), axis=1, kind="mergesort")
+            nearest = np.take_along_axis(nearest, order, axis=1)
+
+            # Expand every site into its replicas, rotating which of a set of
+            # co-located replicas comes first, and keep the first k of them.
+            ncolocated = counts[nearest][:, :, None]
+            slots = np.arange(kslots)[None, None, :]
+            valid = np.broadcast_to(slots < ncolocated, (len(block), ksites, kslots))
+            slots = (rows[:, :, None] + slots) % ncolocated
+            replicas = members[nearest[:, :, None], slots].reshape(len(block), -1)
+            sitedist = np.broadcast_to(
+                np.take_along_axis(dist, nearest, axis=1)[:, :, None], valid.shape
+            ).reshape(len(block), -1)
+
+            first = np.argsort(~valid.reshape(len(block), -1), axis=1, kind="mergesort")[:, :k]
+            indices[start:start+chunk] = np.take_along_axis(replicas, first, axis=1)
+            distances[start:start+chunk] = np.take_along_axis(sitedist, first, axis=1)
+
+        if self.model is not None:
+            distances = self.model.predict(distances)
+        return distances, indices
+
+    def assign(self, latitude, longitude, chunk=CHUNK_CLIENTS):
+        """
+        Returns the index of the nearest replica for every client.
+        """
+        return self.query(latitude, longitude, k=1, chunk=chunk)[1][:, 0]
+
+    def loads(self, assignments):
+        """
+        Returns the number of clients assigned to each replica.
+        """
+        return np.bincount(np.ravel(assignments), minlength=len(self))
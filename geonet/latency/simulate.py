@@ -0,0 +1,178 @@
+# geonet.latency.simulate
+# Monte Carlo simulation of quorum round latencies.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 20 08:47:13 2026 -0400
+#
+# ID: simulate.py [] benjamin@bengfort.com $
+
+"""
+Monte Carlo simulation of quorum round latencies.
+
+A round is the time it takes a leader to send a message to every replica and
+receive responses from enough of them to form a quorum. The RTT of each link
+is sampled from the latency dataset, either from its quantile sketch or from
+a normal distribution fit to its mean and standard deviation, and the round
+time of every trial is the k-th fastest response. All trials are computed
+with vectorized NumPy operations so that millions of rounds can be simulated
+in well under a second.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import numpy as np
+
+from .sketch import QUANTILES
+
+
+# Number of trials to simulate at a time to bound memory usage
+CHUNK_TRIALS = 262144
+
+
+##########################################################################
+## Link Samplers
+##########################################################################
+
+class NormalLink(object):
+    """
+    Samples RTTs from a normal distribution fit to the summary statistics of
+    a link, clipped to the fastest and slowest observed RTT.
+    """
+
+    def __init__(self, mean, stddev, fastest, slowest, timeout=0.0):
+        self.mean = mean
+        self.stddev = stddev
+        self.fastest = fastest
+        self.slowest = slowest
+        self.timeout = timeout
+
+    def sample(self, rng, size):
+        rtts = rng.normal(self.mean, self.stddev, size)
+        return np.clip(rtts, self.fastest, self.slowest, out=rtts)
+
+
+class EmpiricalLink(object):
+    """
+    Samples RTTs from the quantile sketch of a link by inverse transform
+    sampling, drawing uniformly in log space within the selected bucket.
+    """
+
+    def __init__(self, sketch, timeout=0.0):
+        self.cdf = sketch.cdf()
+        self.edges = sketch.edges()
+        self.gamma = sketch.gamma
+        self.low = sketch.low
+        self.timeout = timeout
+
+    def sample(self, rng, size):
+        idx = np.searchsorted(self.cdf, rng.random_sample(size), side="right")
+        idx = np.minimum(idx, len(self.edges) - 1)
+        rtts = self.edges[idx] / self.gamma ** rng.random_sample(size)
+        return np.maximum(rtts, self.low, out=rtts)
+
+
+##########################################################################
+## Quorum Simulator
+##########################################################################
+
+class QuorumSimulator(object):
+    """
+    Simulates the latency of rounds from a leader to a set of replicas.
+
+    Parameters
+    ----------
+    dataset : LatencyDataset
+        The measured latencies between the leader and the replicas.
+
+    leader : str
+        The hostname of the leader that sends messages to the replicas.
+
+    replicas : list of str
+        The hostnames of the replicas (the leader is ignored if included).
+
+    quorum : int, default=None
+        The size of the quorum including the leader, by default a majority.
+
+    empirical : bool, default=True
+        Sample from the link sketches if the dataset has them, otherwise (or
+        if False) sample from a normal fit of the link summary statistics.
+
+    timeouts : bool, default=False
+        Drop responses at the rate that the link timed out when measured. A
+        round that cannot reach a quorum takes an infinite amount of time.
+
+    seed : int, default=None
+        Seed of the random state so that simulations are reproducible.
+    """
+
+    def __init__(self, dataset, leader, replicas, quorum=None, empirical=True, timeouts=False, seed=None):
+        self.leader = leader
+        self.replicas = [replica for replica in replicas if replica != leader]
+        self.quorum = quorum or (len(self.replicas) + 1) // 2 + 1
+        self.seed = seed
+
+        if not 0 < self.quorum <= len(self.replicas) + 1:
+            raise ValueError("quorum of {} is not possible with {} replicas".format(
+                self.quorum, len(self.replicas) + 1
+            ))
+
+        self.links = [
+            self.make_link(dataset, replica, empirical, timeouts)
+            for replica in self.replicas
+        ]
+
+    def make_link(self, dataset, replica, empirical=True, timeouts=False):
+        """
+        Creates the sampler for the link from the leader to the replica.
+        """
+        stats = dataset.link(self.leader, replica)
+        if stats["messages"] == 0 or np.isnan(stats["mean"]):
+            raise LookupError("no latencies measured from {} to {}".format(
+                self.leader, replica
+            ))
+
+        timeout = stats["timeouts"] / stats["messages"] if timeouts else 0.0
+        sketch = dataset.sketch(self.leader, replica) if empirical else None
+        if sketch is not None and sketch.count > 0:
+            return EmpiricalLink(sketch, timeout)
+
+        return NormalLink(
+            stats["mean"], stats["stddev"], stats["fastest"], stats["slowest"], timeout
+        )
+
+    def sample(self, rng, trials):
+        """
+        Returns a (trials, replicas) array of response times, inf if dropped.
+        """
+        rtts = np.empty((trials, len(self.links)))
+        for idx, link in enumerate(self.links):
+            rtts[:, idx] = link.sample(rng, trials)
+            if link.timeout > 0:
+                rtts[rng.random_sample(trials) < link.timeout, idx] = np.inf
+        return rtts
+
+    def simulate(self, trials=1000000, chunk=CHUNK_TRIALS):
+        """
+        Returns the round time of every trial as an array.
+        """
+        k = self.quorum - 1
+        if k == 0:
+            return np.zeros(trials)
+
+        rng = np.random.RandomState(self.seed)
+        rounds = np.empty(trials)
+        for start in range(0, trials, chunk):
+            stop = min(start + chunk, trials)
+            rtts = self.sample(rng, stop - start)
+            rounds[start:stop] = np.partition(rtts, k - 1, axis=1)[:, k - 1]
+        return rounds
+
+    def quantiles(self, q=QUANTILES, trials=1000000):
+        """
+        Returns the quantiles of the simulated round times.
+        """
+        return np.percentile(self.simulate(trials), np.asarray(q) * 100)
@@ -0,0 +1,220 @@
+# geonet.latency.sketch
+# Mergeable quantile sketches of round trip latency distributions.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 14:37:55 2026 -0400
+#
+# ID: sketch.py [] benjamin@bengfort.com $
+
+"""
+Mergeable quantile sketches of round trip latency distributions.
+
+The sketch is an HDR-style histogram with logarithmically sized buckets: the
+bucket boundaries grow by a constant factor so that any quantile is reported
+with a bounded relative error. Because every sketch with the same layout has
+the same buckets, sketches are merged exactly by adding their counts and the
+memory used per link is fixed no matter how many messages are recorded.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import math
+import numpy as np
+
+
+# Default sketch layout: 1% relative accuracy from 10 microseconds to 100
+# seconds, which requires about 807 buckets (6.4 KB of int64 counts) per link.
+ACCURACY = 0.01
+LOW = 0.01
+HIGH = 100000.0
+
+# Default quantiles to report
+QUANTILES = (0.5, 0.99, 0.999)
+
+
+##########################################################################
+## Log Histogram
+##########################################################################
+
+class LogHistogram(object):
+    """
+    A quantile sketch of RTTs in milliseconds. Values are counted in buckets
+    whose upper edges are low * gamma**i where gamma = (1+a)/(1-a) for the
+    relative accuracy a. Values below low or above high are counted in the
+    first and last buckets respectively.
+
+    Parameters
+    ----------
+    counts : array-like, default=None
+        The bucket counts of an existing sketch with the same layout.
+
+    accuracy : float, default=0.01
+        The relative accuracy of reported quantiles.
+
+    low, high : float
+        The range of values that is tracked at the specified accuracy.
+    """
+
+    def __init__(self, counts=None, accuracy=ACCURACY, low=LOW, high=HIGH):
+        self.accuracy = accuracy
+        self.low = low
+        self.high = high
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._lgamma = math.log(self.gamma)
+
+        nbins = int(math.ceil(math.log(high / low) / self._lgamma)) + 1
+        if counts is None:
+            self.counts = np.zeros(nbins, dtype=np.int64)
+        else:
+            self.counts = np.asarray(counts, dtype=np.int64)
+            if self.counts.shape != (nbins,):
+                raise ValueError("sketch counts do not match the sketch layout")
+
+    @property
+    def layout(self):
+        """
+        The parameters that define the buckets of the sketch.
+        """
+        return {"accuracy": self.accuracy, "low": self.low, "high": self.high}
+
+    @property
+    def nbins(self):
+        return len(self.counts)
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def bucket(self, values):
+        """
+        Returns the bucket index of each of the values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            idx = np.ceil(np.log(values / self.low) / self._lgamma)
+        return np.clip(np.nan_to_num(idx), 0, self.nbins - 1).astype(np.intp)
+
+    def edges(self):
+        """
+        Returns the upper edge of every bucket.
+        """
+        return self.low * self.gamma ** np.arange(self.nbins)
+
+    def values(self):
+        """
+        Returns the value reported for every bucket, which is within the
+        relative accuracy of every value counted in the bucket.
+        """
+        values = self.edges() * 2 / (1 + self.gamma)
+        values[0] = self.low
+        return values
+
+    def update(self, rtt):
+        """
+        Count a single RTT in the sketch.
+        """
+        if rtt <= self.low:
+            idx = 0
+        else:
+            idx = min(int(math.ceil(math.log(rtt / self.low) / self._lgamma)), self.nbins - 1)
+        self.counts[idx] += 1
+
+    def update_many(self, rtts):
+        """
+        Count an array of RTTs in the sketch.
+        """
+        self.counts += np.bincount(self.bucket(rtts), minlength=self.nbins)
+
+    def merge(self, other):
+        """
+        Merge the counts of another sketch with the same layout in place.
+        """
+        if other.layout != self.layout:
+            raise ValueError("cannot merge sketches with different layouts")
+        self.counts += other.counts
+        return self
+
+    def cdf(self):
+        """
+        Returns the fraction of values less than or equal to each bucket edge.
+        """
+        total = self.counts.sum()
+        if total == 0:
+            return np.zeros(self.nbins)
+        return np.cumsum(self.counts) / total
+
+    def quantile(self, q=QUANTILES):
+        """
+        Returns the value at the specified quantile or quantiles.
+        """
+        return quantile_from_cdf(self.cdf(), self.values(), q)
+
+    def copy(self):
+        return self.__class__(self.counts.copy(), **self.layout)
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def __repr__(self):
+        return "<LogHistogram of {} values in {} buckets>".format(
+            self.count, self.nbins
+        )
+
+
+##########################################################################
+## Quantile Helpers
+##########################################################################
+
+def quantile_from_cdf(cdf, values, q=QUANTILES):
+    """
+    Returns the value of the first bucket whose cumulative probability is at
+    least q, or NaN if the cdf never reaches q (e.g. for an empty sketch).
+    """
+    q = np.asarray(q, dtype=np.float64)
+    idx = np.searchsorted(cdf, q - 1e-12, side="left")
+    out = np.where(idx < len(values), values[np.minimum(idx, len(values) - 1)], np.nan)
+    return out if out.ndim else float(out)
+
+
+def order_statistic_cdf(cdfs, k):
+    """
+    Given an (m, B) array of the cdfs of m independent RTTs on the same
+    buckets, returns the cdf of the k-th fastest RTT, i.e. the probability
+    that at least k of the m messages have returned by each bucket edge.
+    """
+    cdfs = np.atleast_2d(cdfs)
+    m, nbins = cdfs.shape
+    if not 0 < k <= m:
+        raise ValueError("cannot wait for {} of {} responses".format(k, m))
+
+    # Poisson binomial distribution of the number of responses per bucket
+    dist = np.zeros((m + 1, nbins))
+    dist[0] = 1.0
+    for p in cdfs:
+        prev = dist.copy()
+        dist *= (1 - p)
+        dist[1:] += prev[:-1] * p
+
+    return dist[k:].sum(axis=0)
+
+
+def quorum_quantiles(sketches, k, q=QUANTILES):
+    """
+    Returns the quantiles of the time to receive k of the responses whose
+    RTT distributions are described by the sketches, e.g. the time for a
+    leader to collect a quorum of votes from its followers.
+    """
+    if k == 0:
+        out = np.zeros_like(np.asarray(q, dtype=np.float64))
+        return out if out.ndim else float(out)
+
+    layouts = set(tuple(sorted(sketch.layout.items())) for sketch in sketches)
+    if len(layouts) != 1:
+        raise ValueError("cannot combine sketches with different layouts")
+
+    cdfs = np.vstack([sketch.cdf() for sketch in sketches])
+    return quantile_from_cdf(order_statistic_cdf(cdfs, k), sketches[0].values(), q)
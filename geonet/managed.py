@@ -58,10 +58,11 @@ class ManagedInstances(Set):
     """
 
     @classmethod
-    def load(klass, path=INSTANCES):
+    def load(klass, path=None):
         """
-        Load the managed instances from a path on disk.
+        Load the managed instances from a path on disk, by default INSTANCES.
         """
+        path = path or INSTANCES
         if not os.path.exists(path):
             # Return empty set
             return klass()
@@ -181,10 +182,12 @@ class ManagedInstances(Set):
             }
         }
 
-    def dump(self, path=INSTANCES):
+    def dump(self, path=None):
         """
-        Dump the managed instances to the specified path on disk.
+        Dump the managed instances to the specified path on disk, by default
+        INSTANCES.
         """
+        path = path or INSTANCES
         with open(path, 'w') as f:
             json.dump(self, f, cls=Encoder, indent=2)
 
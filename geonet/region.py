@@ -20,8 +20,13 @@ import json
 from geonet.ec2 import connect
 from geonet.config import settings
 from geonet.config import USERDATA
+from geonet.daemon import daemon
+from geonet.exceptions import RegionUnavailable
+from geonet.health import health, is_unhealthy, empty_response
 from geonet.utils.async import wait
+from geonet.utils.hedge import hedger
 from geonet.utils.serialize import Encoder
+from geonet.utils.singleflight import flights, normalize
 from geonet.base import Collection, Resource
 from geonet.utils.timez import utcnow, parse_datetime
 from geonet.ec2 import KeyPairs, SecurityGroups, Images
@@ -29,16 +34,54 @@ from geonet.ec2 import Instances, Volumes, LaunchTemplates
 from geonet.ec2 import PlacementGroups
 from geonet.zone import AvailabilityZones
 
+from functools import partial
 from operator import itemgetter
 
 
 REGIONDATA = os.path.join(USERDATA, "regions.json")
 
+# Approximate (latitude, longitude) of the data centers of each region, which
+# can be overridden by setting Latitude and Longitude in the region data.
+REGION_COORDINATES = {
+    "us-east-1": (38.13, -78.45),
+    "us-east-2": (39.96, -83.00),
+    "us-west-1": (37.35, -121.96),
+    "us-west-2": (45.84, -119.70),
+    "ca-central-1": (45.50, -73.57),
+    "sa-east-1": (-23.55, -46.63),
+    "eu-central-1": (50.11, 8.68),
+    "eu-west-1": (53.35, -6.26),
+    "eu-west-2": (51.51, -0.13),
+    "eu-west-3": (48.86, 2.35),
+    "eu-north-1": (59.33, 18.07),
+    "ap-south-1": (19.08, 72.88),
+    "ap-northeast-1": (35.68, 139.69),
+    "ap-northeast-2": (37.57, 126.98),
+    "ap-northeast-3": (34.69, 135.50),
+    "ap-southeast-1": (1.35, 103.82),
+    "ap-southeast-2": (-33.87, 151.21),
+}
+
+
+# Regions loaded from disk by path while the registry is kept, see keep_regions
+_registry = None
+
 
 ##########################################################################
 ## Helper Function
 ##########################################################################
 
+def keep_regions(keep=True):
+    """
+    Keeps the regions loaded from disk in a registry so that loading them
+    again returns the same region objects with their open connections, e.g.
+    between the commands of a shell. The regions are reloaded if their data
+    changes on disk. Pass keep=False to drop the registry.
+    """
+    global _registry
+    _registry = {} if keep else None
+
+
 def parse_region(region, lookup=True):
     """
     Parses the region from the given input.
@@ -140,6 +183,15 @@ class Region(Resource):
         parts[1] = parts[1].title()
         return " ".join(parts)
 
+    @property
+    def coordinates(self):
+        """
+        Returns the (latitude, longitude) of the region or None if unknown.
+        """
+        if self.get('Latitude') is not None and self.get('Longitude') is not None:
+            return float(self['Latitude']), float(self['Longitude'])
+        return REGION_COORDINATES.get(self['RegionName'])
+
     @property
     def conn(self):
         if self._conn is None:
@@ -152,6 +204,58 @@ class Region(Resource):
                     self._conn = None
         return self._conn
 
+    def describe(self, operation, **kwargs):
+        """
+        Calls a describe operation (e.g. describe_instances) with the region's
+        connection. Identical concurrent calls to the region share a single
+        API call and its response. If the inventory daemon is running, the
+        response is fetched from its inventory instead. If hedging is enabled,
+        calls slower than the region's usual latency are sent twice.
+
+        If the region is unhealthy (see geonet.health) the call is not made
+        and the region is skipped with an empty response, which is reported
+        by the command. Calls that fail because the region is degraded are
+        also skipped rather than failing the whole command.
+        """
+        response = daemon.describe(self, operation, kwargs)
+        if response is not None:
+            return response
+
+        if not health.allow(self):
+            return self.skip(operation)
+
+        func = getattr(self.conn, operation)
+        if settings.hedge.enabled:
+            func = partial(hedger.call, (str(self), operation), func)
+
+        key = (str(self), operation, normalize(kwargs))
+        try:
+            response = flights.do(key, func, **kwargs)
+        except Exception as e:
+            if not is_unhealthy(e):
+                health.success(self)
+                raise
+            health.failure(self, e)
+            if empty_response(operation) is None:
+                raise
+            return self.skip(operation)
+
+        health.success(self)
+        return response
+
+    def skip(self, operation):
+        """
+        Returns an empty response to the describe operation and notes that the
+        region was skipped. Raises RegionUnavailable if there is no empty
+        response to the operation.
+        """
+        response = empty_response(operation)
+        if response is None:
+            raise RegionUnavailable("region {} is unhealthy".format(self))
+
+        health.skip(self)
+        return response
+
     def is_configured(self):
         """
         Returns true if the region is configured in the settings
@@ -162,7 +266,7 @@ class Region(Resource):
         """
         Describe the availability zones in the region and their state
         """
-        resp = self.conn.describe_availability_zones(**kwargs)
+        resp = self.describe("describe_availability_zones", **kwargs)
         return AvailabilityZones(resp['AvailabilityZones'], region=self)
 
     def instances(self, **kwargs):
@@ -170,7 +274,7 @@ class Region(Resource):
         Returns all instances associated with the region
         """
         # TODO: validate response
-        resp = self.conn.describe_instances(**kwargs)
+        resp = self.describe("describe_instances", **kwargs)
         instances = []
         for reservation in resp['Reservations']:
             for instance in reservation['Instances']:
@@ -183,7 +287,7 @@ class Region(Resource):
         Returns all volumes associated with the region
         """
         # TODO: validate response
-        resp = self.conn.describe_volumes(**kwargs)
+        resp = self.describe("describe_volumes", **kwargs)
         return Volumes(resp['Volumes'], region=self)
 
     def key_pairs(self, **kwargs):
@@ -191,7 +295,7 @@ class Region(Resource):
         Returns the keys associated with the region.
         """
         # TODO: validate response
-        resp = self.conn.describe_key_pairs(**kwargs)
+        resp = self.describe("describe_key_pairs", **kwargs)
         return KeyPairs(resp['KeyPairs'], region=self)
 
     def launch_templates(self, **kwargs):
@@ -199,7 +303,7 @@ class Region(Resource):
         Returns the launch templates associated with the region.
         """
         # TODO: validate response
-        resp = self.conn.describe_launch_templates(**kwargs)
+        resp = self.describe("describe_launch_templates", **kwargs)
         return LaunchTemplates(resp['LaunchTemplates'], region=self)
 
     def images(self, **kwargs):
@@ -215,7 +319,7 @@ class Region(Resource):
             }]
 
         # TODO: validate response
-        resp = self.conn.describe_images(**kwargs)
+        resp = self.describe("describe_images", **kwargs)
         return Images(resp['Images'], region=self)
 
     def security_groups(self, **kwargs):
@@ -223,14 +327,14 @@ class Region(Resource):
         Returns the security groups associated with the region.
         """
         # TODO: validate repsonse
-        resp = self.conn.describe_security_groups(**kwargs)
+        resp = self.describe("describe_security_groups", **kwargs)
         return SecurityGroups(resp['SecurityGroups'], region=self)
 
     def placement_groups(self, **kwargs):
         """
         REtursn the placement groups associated with the region.
         """
-        resp = self.conn.describe_placement_groups(**kwargs)
+        resp = self.describe("describe_placement_groups", **kwargs)
         return PlacementGroups(resp["PlacementGroups"], region=self)
 
 
@@ -244,11 +348,32 @@ class Regions(Collection):
     RESOURCE = Region
 
     @classmethod
-    def load(klass, path=REGIONDATA):
+    def load(klass, path=None):
         """
-        Load the region data from a path on disk.
+        Load the region data from a path on disk, by default REGIONDATA.
         """
+        path = path or REGIONDATA
+        if _registry is None:
+            return klass.read(path)
 
+        # Reuse the registered regions (and their connections) unless the
+        # region data has changed on disk since they were loaded.
+        version = None
+        if os.path.exists(path):
+            stat = os.stat(path)
+            version = (stat.st_mtime, stat.st_size)
+
+        if path not in _registry or _registry[path][0] != version:
+            _registry[path] = (version, klass.read(path))
+
+        regions = _registry[path][1]
+        return klass(regions.items, **regions.meta)
+
+    @classmethod
+    def read(klass, path):
+        """
+        Read the region data from a path on disk.
+        """
         # Return list of configured regions
         if not os.path.exists(path):
             return klass([
@@ -279,10 +404,11 @@ class Regions(Collection):
         resp = conn.describe_regions()
         return klass(resp["Regions"])
 
-    def dump(self, path=REGIONDATA):
+    def dump(self, path=None):
         """
-        Dump the regions to the specified path on disk
+        Dump the regions to the specified path on disk, by default REGIONDATA.
         """
+        path = path or REGIONDATA
         data = {
             "updated": utcnow(),
             "regions": list(self),
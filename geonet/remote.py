@@ -0,0 +1,359 @@
+# geonet.remote
+# Runs shell commands on many hosts over pooled SSH connections.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 27 09:12:37 2026 -0400
+#
+# ID: remote.py [] benjamin@bengfort.com $
+
+"""
+Runs shell commands on many hosts over pooled SSH connections.
+
+Rather than forking a process per host (as Fabric's parallel tasks do), the
+Executor runs a command on every host from a bounded pool of threads. Each
+host has a single persistent SSH connection in the connection pool and every
+command is run in its own channel multiplexed over that connection, so
+running several commands (e.g. from the shell or in the waves of a rollout)
+only pays for the handshake once per host. Every command has a timeout per
+host, and output is streamed line by line as it arrives as well as collected
+so that the outputs of all hosts can be aggregated.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import os
+import time
+import atexit
+import socket
+import threading
+
+from functools import partial
+from collections import Counter
+from geonet.utils.async import wait
+from geonet.utils.timer import perf_counter
+
+
+# Maximum number of hosts a command is run on at once
+MAX_CONNECTIONS = 50
+
+# Seconds to wait for a host to connect and for a command to complete
+CONNECT_TIMEOUT = 10
+TIMEOUT = 300
+
+# Seconds between keepalives of idle connections in the pool
+KEEPALIVE = 30
+
+# Bytes read from a channel at a time
+BUFSIZE = 32768
+
+
+##########################################################################
+## Hosts
+##########################################################################
+
+class Host(object):
+    """
+    The SSH information needed to connect to a host.
+
+    Parameters
+    ----------
+    name : str
+        The name of the host, e.g. the name of the instance.
+
+    hostname : str
+        The hostname or IP address to connect to.
+
+    user, port, key, forward_agent
+        The user and port to connect with, the path to the identity file and
+        whether or not to forward the local SSH agent to the host.
+
+    region : str, default=None
+        The region of the host if it is known.
+    """
+
+    @classmethod
+    def from_config(klass, name, config):
+        """
+        Creates a host from the options of a Host in an SSH config file (see
+        geonet.utils.ssh.load_ssh_config).
+        """
+        return klass(
+            name, config.get("HostName", name),
+            user=config.get("User", "ubuntu"),
+            port=int(config.get("Port", 22)),
+            key=config.get("IdentityFile"),
+            forward_agent=config.get("ForwardAgent", "no").lower() in ("yes", "true"),
+        )
+
+    def __init__(self, name, hostname, user="ubuntu", port=22, key=None,
+                 forward_agent=False, region=None):
+        self.name = name
+        self.hostname = hostname
+        self.user = user
+        self.port = port
+        self.key = key
+        self.forward_agent = forward_agent
+        self.region = region
+
+    def address(self):
+        return (self.user, self.hostname, self.port)
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return "<Host {} {}@{}:{}>".format(self.name, *self.address())
+
+
+def make_hosts(hosts):
+    """
+    Returns hosts sorted by name from the host information by name in the
+    format of the hosts command (see geonet.utils.ssh.ssh_hosts).
+    """
+    return [
+        Host(name, **info) for name, info in sorted(hosts.items())
+    ]
+
+
+##########################################################################
+## Connections
+##########################################################################
+
+class Result(object):
+    """
+    The outcome of a command on a host: its exit status and output (with
+    stderr combined into stdout), or the error if it could not be run.
+    """
+
+    def __init__(self, host, status=None, output="", error=None, duration=0.0):
+        self.host = host
+        self.status = status
+        self.output = output
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.error is None and self.status == 0
+
+    def summary(self):
+        """
+        Returns the output if the command succeeded or why it failed.
+        """
+        if self.error is not None:
+            return "error: {}".format(self.error)
+        if self.status != 0:
+            return "exit {}: {}".format(self.status, self.output.strip())
+        return self.output.strip()
+
+
+class Connection(object):
+    """
+    A persistent SSH connection to a host that runs each command in a new
+    channel of the connection. The connection is opened by the first command
+    and reopened by the next command if it has dropped.
+    """
+
+    def __init__(self, host, timeout=CONNECT_TIMEOUT):
+        self.host = host
+        self.timeout = timeout
+        self.client = None
+        self.lock = threading.Lock()
+
+    @property
+    def active(self):
+        if self.client is None:
+            return False
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def open(self):
+        """
+        Returns the transport of the connection, connecting if necessary.
+        """
+        # Imported here since paramiko is slow to import
+        import paramiko
+
+        with self.lock:
+            if not self.active:
+                self.close()
+                client = paramiko.SSHClient()
+                client.load_system_host_keys()
+                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+                key = self.host.key
+                client.connect(
+                    self.host.hostname, port=self.host.port,
+                    username=self.host.user,
+                    key_filename=os.path.expanduser(key) if key else None,
+                    timeout=self.timeout, banner_timeout=self.timeout,
+                    auth_timeout=self.timeout,
+                )
+                client.get_transport().set_keepalive(KEEPALIVE)
+                self.client = client
+
+            return self.client.get_transport()
+
+    def run(self, command, timeout=TIMEOUT, stream=None, stdin=None):
+        """
+        Runs the command on the host and returns its Result. Each line of
+        output is passed to stream (with the host) as soon as it is received.
+        The command is abandoned if it does not complete within timeout. If
+        stdin is a file, its contents are sent to the input of the command.
+        """
+        started = perf_counter()
+        deadline = time.time() + timeout
+        result = Result(self.host)
+        output = []
+
+        def emit(line):
+            output.append(line)
+            if stream is not None:
+                stream(self.host, line.rstrip("\r\n"))
+
+        try:
+            channel = self.open().open_session(timeout=self.timeout)
+            try:
+                if self.host.forward_agent:
+                    import paramiko.agent
+                    paramiko.agent.AgentRequestHandler(channel)
+
+                channel.set_combine_stderr(True)
+                channel.exec_command(command)
+
+                if stdin is not None:
+                    for data in iter(partial(stdin.read, BUFSIZE), ""):
+                        channel.sendall(data)
+                    channel.shutdown_write()
+
+                buffer = ""
+                while True:
+                    try:
+                        channel.settimeout(max(deadline - time.time(), 0.001))
+                        data = channel.recv(BUFSIZE)
+                    except socket.timeout:
+                        raise socket.timeout("timed out after {}s".format(timeout))
+
+                    if not data:
+                        break
+
+                    buffer += data
+                    lines = buffer.splitlines(True)
+                    buffer = lines.pop() if not lines[-1].endswith("\n") else ""
+                    for line in lines:
+                        emit(line)
+
+                if buffer:
+                    emit(buffer)
+                result.status = channel.recv_exit_status()
+            finally:
+                channel.close()
+        except Exception as e:
+            result.error = "{}: {}".format(e.__class__.__name__, e)
+
+        result.output = "".join(output)
+        result.duration = perf_counter() - started
+        return result
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+
+class ConnectionPool(object):
+    """
+    Keeps one connection per host open between commands.
+    """
+
+    def __init__(self, timeout=CONNECT_TIMEOUT):
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.connections = {}
+
+    def connection(self, host):
+        """
+        Returns the connection to the host, which is opened on first use.
+        """
+        with self.lock:
+            key = (host.name,) + host.address()
+            if key not in self.connections:
+                self.connections[key] = Connection(host, self.timeout)
+            return self.connections[key]
+
+    def close(self):
+        with self.lock:
+            for conn in self.connections.values():
+                conn.close()
+            self.connections = {}
+
+    def __len__(self):
+        return sum(1 for conn in self.connections.values() if conn.active)
+
+
+# The connections to every host, closed when geonet exits
+pool = ConnectionPool()
+atexit.register(pool.close)
+
+
+##########################################################################
+## Executor
+##########################################################################
+
+class Executor(object):
+    """
+    Runs commands on many hosts at once over the connections of a pool.
+
+    Parameters
+    ----------
+    pool : ConnectionPool, default=None
+        The pool of connections to the hosts, by default the global pool.
+
+    width : int, default=MAX_CONNECTIONS
+        The maximum number of hosts the command is run on at once.
+
+    timeout : float, default=TIMEOUT
+        Seconds the command may take on each host before it is abandoned.
+
+    stream : callable, default=None
+        Called with the host and each line of output as it is received.
+    """
+
+    def __init__(self, pool=None, width=MAX_CONNECTIONS, timeout=TIMEOUT, stream=None):
+        self.pool = pool
+        self.width = width
+        self.timeout = timeout
+        self.stream = stream
+
+    def execute(self, host, command):
+        """
+        Runs the command on a single host and returns its Result.
+        """
+        conns = self.pool if self.pool is not None else pool
+        return conns.connection(host).run(command, self.timeout, self.stream)
+
+    def run(self, hosts, command):
+        """
+        Runs the command on every host and returns the results in the order
+        of the hosts. Errors are reported in the results rather than raised.
+        """
+        return wait(
+            [partial(self.execute, host, command) for host in hosts],
+            width=self.width, schedule=False,
+        )
+
+
+def summarize(results):
+    """
+    Returns a table of the distinct outputs (or failures) of a command with
+    the number and percent of the hosts that had them, most common first.
+    """
+    outputs = Counter(result.summary() for result in results)
+    table = [["Output", "Hosts", "Percent"]]
+    for output, count in outputs.most_common():
+        table.append([output, count, count / len(results) * 100])
+    return table
@@ -0,0 +1,272 @@
+# geonet.rollout
+# Rolls maintenance tasks out to the hosts a few at a time.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Wed Oct 28 09:40:16 2026 -0400
+#
+# ID: rollout.py [] benjamin@bengfort.com $
+
+"""
+Rolls maintenance tasks out to the hosts a few at a time.
+
+Running a task such as an upgrade or a reboot on every host at once stops
+every experiment and saturates the package mirrors, while running it on one
+host at a time takes far too long. A Rollout runs the task in waves: each
+wave is a window of N hosts (or N% of the hosts), optionally taking one
+region at a time. After each wave an optional health check is run on the
+hosts of the wave until it passes or times out (e.g. waiting for the hosts to
+come back from a reboot). Hosts whose task or health check failed count
+against a failure budget, and the rollout halts as soon as the budget is
+exceeded so that a bad task does not take down the whole fleet.
+
+A task is any callable that runs on a wave of hosts and returns a Result for
+each host (see geonet.remote), so rollouts work with the SSH executor with
+remote_task or with Fabric tasks with fabric_task.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import time
+
+from itertools import groupby
+from geonet.remote import Executor, Result
+
+
+# Seconds to wait for the health check of a wave to pass and between checks
+CHECK_TIMEOUT = 300
+CHECK_INTERVAL = 10
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def parse_window(window, total, minimum=1):
+    """
+    Returns the number of hosts of a window given as a number of hosts or a
+    percent of the total hosts, e.g. 5 or "10%", but at least minimum.
+    """
+    window = str(window).strip()
+    if window.endswith("%"):
+        count = int(total * float(window[:-1]) / 100)
+    else:
+        count = int(window)
+
+    if count < 0:
+        raise ValueError("window '{}' cannot be negative".format(window))
+    return max(count, minimum)
+
+
+def remote_task(command, executor=None):
+    """
+    Returns a task that runs the shell command on a wave of hosts with the
+    executor, which by default uses the pooled SSH connections.
+    """
+    executor = executor or Executor()
+
+    def run_command(hosts):
+        return executor.run(hosts, command)
+    return run_command
+
+
+def fabric_task(task, *args, **kwargs):
+    """
+    Returns a task that runs the Fabric task in parallel on a wave of hosts
+    with the arguments, which reports the hosts that aborted as failed
+    rather than aborting the rollout.
+    """
+    # Imported here since Fabric is only required by the fabfile
+    from fabric.api import execute, parallel, settings
+
+    class TaskFailed(Exception):
+        pass
+
+    @parallel
+    def attempt():
+        try:
+            with settings(abort_exception=TaskFailed):
+                task(*args, **kwargs)
+        except Exception as e:
+            return "{}: {}".format(e.__class__.__name__, e)
+        return None
+
+    def run_fabric(hosts):
+        with settings(skip_bad_hosts=True):
+            outcomes = execute(attempt, hosts=[str(host) for host in hosts])
+
+        results = []
+        for host in hosts:
+            error = outcomes.get(str(host))
+            if isinstance(error, BaseException):
+                error = "{}: {}".format(error.__class__.__name__, error)
+            results.append(Result(host, status=0 if error is None else None, error=error))
+        return results
+    return run_fabric
+
+
+##########################################################################
+## Rollout
+##########################################################################
+
+class Report(object):
+    """
+    The results of a rollout by host name and whether it was halted.
+    """
+
+    def __init__(self, hosts):
+        self.hosts = hosts
+        self.results = {}
+        self.waves = 0
+        self.halted = False
+
+    @property
+    def succeeded(self):
+        return [host for host in self.hosts if self.ok(host)]
+
+    @property
+    def failed(self):
+        return [
+            host for host in self.hosts
+            if str(host) in self.results and not self.ok(host)
+        ]
+
+    @property
+    def skipped(self):
+        return [host for host in self.hosts if str(host) not in self.results]
+
+    def ok(self, host):
+        result = self.results.get(str(host))
+        return result is not None and result.ok
+
+
+class Rollout(object):
+    """
+    Runs a task on the hosts in waves with health checks between waves,
+    halting if more hosts fail than the failure budget allows.
+
+    Parameters
+    ----------
+    task : callable
+        Runs the task on a list of hosts and returns their Results.
+
+    window : int or str, default=1
+        The number of hosts in each wave, or the percent of the hosts, e.g.
+        "10%". Every wave has at least one host.
+
+    by_region : bool, default=False
+        Only run the task in one region at a time, hosts without a region are
+        treated as one region.
+
+    max_failures : int or str, default=0
+        The number (or percent) of hosts that may fail before the rollout is
+        halted; the hosts of the waves after the failure are skipped.
+
+    check : callable, default=None
+        A health check that is run like the task on the hosts of each wave
+        whose task succeeded, until it passes on every host or times out.
+
+    check_timeout, check_interval : float
+        Seconds to wait for the check to pass on the hosts of a wave and to
+        wait between checks of the hosts that have not passed.
+
+    pause : float, default=0
+        Seconds to wait between waves.
+
+    warn_only : bool, default=False
+        Do not fail hosts whose task failed (e.g. a reboot that drops the
+        connection), so that they pass or fail on the health check alone.
+
+    callback : callable, default=None
+        Called with the index of each wave, the number of waves, the hosts of
+        the wave and their results once the wave is complete.
+    """
+
+    def __init__(self, task, window=1, by_region=False, max_failures=0,
+                 check=None, check_timeout=CHECK_TIMEOUT,
+                 check_interval=CHECK_INTERVAL, pause=0, warn_only=False,
+                 callback=None):
+        self.task = task
+        self.window = window
+        self.by_region = by_region
+        self.max_failures = max_failures
+        self.check = check
+        self.check_timeout = check_timeout
+        self.check_interval = check_interval
+        self.pause = pause
+        self.warn_only = warn_only
+        self.callback = callback
+
+    def waves(self, hosts):
+        """
+        Returns the hosts split into waves of the window size, which do not
+        cross regions if the rollout is by region.
+        """
+        size = parse_window(self.window, len(hosts))
+        if self.by_region:
+            def region(host):
+                return getattr(host, "region", None) or ""
+            groups = [list(group) for _, group in groupby(sorted(hosts, key=region), region)]
+        else:
+            groups = [hosts]
+
+        return [
+            group[idx:idx+size]
+            for group in groups
+            for idx in range(0, len(group), size)
+        ]
+
+    def run(self, hosts):
+        """
+        Rolls the task out to the hosts and returns a Report of the results.
+        """
+        hosts = list(hosts)
+        budget = parse_window(self.max_failures, len(hosts), minimum=0)
+        waves = self.waves(hosts)
+        report = Report(hosts)
+
+        for idx, wave in enumerate(waves):
+            if idx > 0 and self.pause:
+                time.sleep(self.pause)
+
+            results = self.task(wave)
+            if self.warn_only:
+                results = [Result(result.host, status=0) for result in results]
+
+            passed = [result.host for result in results if result.ok]
+            if self.check is not None and passed:
+                results = [result for result in results if not result.ok]
+                results.extend(self.verify(passed))
+
+            for result in results:
+                report.results[str(result.host)] = result
+            report.waves += 1
+
+            if self.callback is not None:
+                self.callback(idx, len(waves), wave, results)
+
+            if len(report.failed) > budget:
+                report.halted = True
+                break
+
+        return report
+
+    def verify(self, hosts):
+        """
+        Runs the health check on the hosts until it passes on all of them or
+        the check timeout has passed, then returns the last result of each.
+        """
+        deadline = time.time() + self.check_timeout
+        passed = []
+
+        while True:
+            results = self.check(hosts)
+            passed.extend(result for result in results if result.ok)
+            failed = [result for result in results if not result.ok]
+
+            if not failed or time.time() + self.check_interval > deadline:
+                return passed + failed
+
+            time.sleep(self.check_interval)
+            hosts = [result.host for result in failed]
@@ -0,0 +1,272 @@
+# geonet.shell
+# An interactive shell that runs geonet commands in a single process.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Sun Oct 25 09:14:52 2026 -0400
+#
+# ID: shell.py [] benjamin@bengfort.com $
+
+"""
+An interactive shell that runs geonet commands in a single process.
+
+Every command of the utility can be run at the prompt exactly as it is on the
+command line (without the geonet prefix), including the global options. Since
+the commands run in one process, the modules, configuration, region registry
+and their connections are loaded once and kept warm between commands. Unless
+a daemon is already running, the shell also serves a private inventory (see
+geonet.inventory) so that describe calls are cached and refreshed in the
+background between commands. Command names, their options, region names and
+instance ids and names are completed with tab.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import cmd
+import shlex
+import shutil
+import tempfile
+import threading
+import traceback
+
+from commis import color
+from geonet.config import USERDATA
+from geonet.region import Regions, keep_regions
+from geonet.managed import ManagedInstances
+from geonet.inventory import Inventory, InventoryServer
+from geonet.daemon import daemon, DaemonError
+from geonet.utils.stats import recorder
+from geonet.utils.timer import tracer
+
+try:
+    import readline
+except ImportError:
+    readline = None
+
+
+# Path of the history of commands run in the shell
+HISTORY = os.path.join(USERDATA, "shell_history")
+
+INTRO = "geonet shell: run any geonet command, help to list them, exit to quit"
+
+
+##########################################################################
+## GeoNet Shell
+##########################################################################
+
+class GeoNetShell(cmd.Cmd):
+    """
+    Runs the commands of a GeoNetUtility repeatedly in one process.
+
+    Parameters
+    ----------
+    utility : GeoNetUtility
+        The utility whose commands are run by the shell.
+
+    inventory : bool, default=True
+        Serve a private inventory of describe calls if no daemon is running.
+    """
+
+    prompt = "geonet> "
+    intro = INTRO
+
+    def __init__(self, utility, inventory=True, **kwargs):
+        cmd.Cmd.__init__(self, **kwargs)
+        self.utility = utility
+        self.inventory = inventory
+        self.server = None
+        self.daemon_path = None
+        self.tmpdir = None
+
+    def loop(self):
+        """
+        Runs the shell until exit, keeping the regions and inventory warm
+        between commands. An interrupt cancels the current command.
+        """
+        self.start()
+        try:
+            intro = None
+            while True:
+                try:
+                    self.cmdloop(intro)
+                    break
+                except KeyboardInterrupt:
+                    self.stdout.write("^C\n")
+                    intro = ""
+        finally:
+            self.stop()
+
+    def start(self):
+        keep_regions()
+        if self.inventory:
+            self.start_inventory()
+
+        if readline is not None and self.use_rawinput:
+            readline.set_completer_delims(" \t\n")
+            if os.path.exists(HISTORY):
+                readline.read_history_file(HISTORY)
+
+    def stop(self):
+        if readline is not None and self.use_rawinput and os.path.isdir(USERDATA):
+            readline.write_history_file(HISTORY)
+
+        self.stop_inventory()
+        keep_regions(False)
+
+    def start_inventory(self):
+        """
+        Serves a private inventory in a background thread and points the
+        daemon client at it, unless a daemon is already running.
+        """
+        if daemon.available():
+            try:
+                daemon.request("ping")
+                return
+            except DaemonError:
+                pass
+
+        self.tmpdir = tempfile.mkdtemp(prefix="geonet-")
+        path = os.path.join(self.tmpdir, "inventory.sock")
+        self.server = InventoryServer(Inventory(), path)
+
+        thread = threading.Thread(target=self.server.serve)
+        thread.daemon = True
+        thread.start()
+
+        self.daemon_path, daemon.path = daemon.path, path
+
+    def stop_inventory(self):
+        if self.server is None:
+            return
+
+        self.server.shutdown()
+        self.server.server_close()
+        daemon.path = self.daemon_path
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        self.server = None
+
+    def execute(self, argv):
+        """
+        Parses and runs a command with its arguments and the global options,
+        reporting its errors rather than exiting.
+        """
+        name = self.utility.prepare(argv)
+        if name is None or name == "shell":
+            self.error("unknown command '{}'".format(" ".join(argv)))
+            return
+
+        # argparse exits after printing the help or a usage error
+        try:
+            args = self.utility.parser.parse_args(argv)
+        except SystemExit:
+            return
+
+        profiler = self.utility.start_profiler(args)
+        try:
+            if args.trace:
+                msg = self.utility.execute_traced(name, args.func, args)
+            else:
+                msg = args.func(args)
+            if msg:
+                self.stdout.write("{}\n".format(msg))
+        except SystemExit:
+            pass
+        except Exception as e:
+            if getattr(args, "traceback", False):
+                traceback.print_exc()
+            self.error(e)
+        finally:
+            self.utility.report_health()
+            self.utility.report_profile(args, profiler)
+            self.utility.report_stats(args)
+            self.utility.report_trace(args)
+
+            # Each command reports only its own calls and spans
+            recorder.clear()
+            tracer.clear()
+            tracer.enabled = False
+
+    def error(self, message):
+        self.stdout.write(color.format(str(message), color.RED) + "\n")
+
+    def default(self, line):
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            self.error(e)
+            return
+        self.execute(argv)
+
+    def emptyline(self):
+        # Do not repeat the last command
+        pass
+
+    def do_help(self, arg):
+        if arg:
+            self.execute([arg, "--help"])
+        else:
+            self.utility.parser.print_help()
+
+    def do_exit(self, arg):
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg):
+        self.stdout.write("\n")
+        return True
+
+    def completenames(self, text, *ignored):
+        names = list(self.utility.commands) + ["help", "exit", "quit"]
+        return sorted(name for name in names if name.startswith(text) and name != "shell")
+
+    def completedefault(self, text, line, begidx, endidx):
+        """
+        Completes the options of the command, or region and instance names.
+        """
+        if text.startswith("-"):
+            candidates = self.options(line.split()[0])
+        else:
+            candidates = self.names()
+        return sorted(name for name in candidates if name.startswith(text))
+
+    def options(self, name):
+        """
+        Returns the option strings of the named command.
+        """
+        command = self.utility.commands.get(name)
+        if command is None:
+            return []
+
+        if hasattr(command, "load"):
+            command.load()
+        return list(command.parser._option_string_actions)
+
+    def names(self):
+        """
+        Returns the names of the regions and the ids of the managed instances
+        along with the ids and names of the instances in the inventory.
+        """
+        names = set()
+        try:
+            for region in Regions.load():
+                names.add(str(region))
+            for region, instances in ManagedInstances.load().regions():
+                names.update(instances)
+        except Exception:
+            # Completion must not interrupt the prompt
+            return names
+
+        if self.server is not None:
+            for key, entry in list(self.server.inventory.entries.items()):
+                if key[1] != "describe_instances" or entry.response is None:
+                    continue
+                for reservation in entry.response["Reservations"]:
+                    for instance in reservation["Instances"]:
+                        names.add(instance["InstanceId"])
+                        for tag in instance.get("Tags", []):
+                            if tag["Key"] == "Name":
+                                names.add(tag["Value"])
+        return names
@@ -15,6 +15,8 @@ Lightweight async library using threading.
 ##########################################################################
 
 from multiprocessing.pool import ThreadPool
+from geonet.utils.schedule import history, job_key
+from geonet.utils.timer import tracer, propagate, perf_counter
 
 
 MAX_THREADS = 50
@@ -24,17 +26,71 @@ MAX_THREADS = 50
 ## Asynchronous Helpers
 ##########################################################################
 
-def wait(funcs, args=(), kwargs={}):
+def traced(func):
+    """
+    Wraps a function so that each call is recorded as a span named after the
+    function, including the object it is bound to (e.g. the region).
+    """
+    name = getattr(func, "__name__", "task")
+    attributes = {}
+
+    owner = getattr(func, "__self__", None)
+    if owner is not None:
+        name = "{}.{}".format(owner.__class__.__name__, name)
+        attributes["target"] = str(owner)
+
+    def traced_func(*args, **kwargs):
+        with tracer.span(name, **attributes):
+            return func(*args, **kwargs)
+    return traced_func
+
+
+def timed(func, key):
+    """
+    Wraps a function so that the duration of each successful call is
+    observed as the duration of the job with the key.
+    """
+    def timed_func(*args, **kwargs):
+        started = perf_counter()
+        result = func(*args, **kwargs)
+        history.observe(key, perf_counter() - started)
+        return result
+    return timed_func
+
+
+def wait(funcs, args=(), kwargs={}, width=MAX_THREADS, schedule=True):
     """
     Execute all functions asynchronously and return all the results as a list.
+    Spans created by the functions are children of the caller's active span,
+    and each function is recorded as a span if tracing is enabled.
+
+    At most width functions run at once. Functions that run in a region are
+    started longest expected duration first (see geonet.utils.schedule) so
+    that slow regions do not wait for a free thread, and their durations are
+    recorded to schedule the next fan out. Pass schedule=False for jobs that
+    are not EC2 calls (e.g. commands run on hosts over SSH) so that their
+    durations are neither used nor recorded.
     """
-    pool = ThreadPool(MAX_THREADS)
-    results = [
-        pool.apply_async(func, args, kwargs)
-        for func in funcs
+    funcs = list(funcs)
+    if not funcs:
+        return []
+
+    keys = [job_key(func, args) if schedule else None for func in funcs]
+    if tracer.enabled:
+        funcs = [traced(func) for func in funcs]
+
+    funcs = [
+        timed(func, key) if key is not None else func
+        for func, key in zip(funcs, keys)
     ]
+
+    results = [None] * len(funcs)
+    pool = ThreadPool(min(width, len(funcs)))
+    for idx in history.order(keys):
+        results[idx] = pool.apply_async(propagate(funcs[idx]), args, kwargs)
     pool.close()
     pool.join()
+
     return [
         result.get() for result in results
     ]
@@ -0,0 +1,214 @@
+# geonet.utils.hedge
+# Hedges slow idempotent calls by racing a duplicate call.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 26 09:48:33 2026 -0400
+#
+# ID: hedge.py [] benjamin@bengfort.com $
+
+"""
+Hedges slow idempotent calls by racing a duplicate call.
+
+Some regional endpoints occasionally take many times their usual latency to
+answer, and a command that fans out to every region waits for the slowest.
+When hedging is enabled, a describe call that has not returned within the
+observed p95 latency of its region and operation is sent again, and the
+first response is used. Since only calls slower than the p95 are hedged,
+roughly one call in twenty is duplicated, and a token bucket caps the extra
+calls at a fraction of all calls so that hedging cannot double the load on
+an endpoint that is slow for every call.
+
+The latencies of the recent calls to every region and operation are kept in
+~/.geonet, so once enough calls have been observed they are hedged in every
+command that runs rather than only in long running processes.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import sys
+import Queue
+import atexit
+import threading
+
+from geonet.config import settings, USERDATA
+from geonet.utils.stats import percentile
+from geonet.utils.schedule import History
+from geonet.utils.timer import perf_counter
+
+
+# Path of the latencies of recent calls persisted between runs
+LATENCIES = os.path.join(USERDATA, "latencies.json")
+
+# The number of recent calls kept for every region and operation
+WINDOW = 100
+
+# The minimum number of calls to estimate the latency quantile from
+MIN_SAMPLES = 20
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def spawn(target, *args):
+    """
+    Starts target(*args) in a daemon thread and returns the thread.
+    """
+    thread = threading.Thread(target=target, args=args)
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+##########################################################################
+## Latencies
+##########################################################################
+
+class Latencies(History):
+    """
+    The latencies in seconds of the most recent calls by (region, operation)
+    that are loaded from and dumped to path on demand.
+    """
+
+    def __init__(self, path=LATENCIES, window=WINDOW):
+        super(Latencies, self).__init__(path)
+        self.window = window
+
+    def observe(self, key, duration):
+        self.load()
+        with self.lock:
+            samples = self.durations.setdefault(key, [])
+            samples.append(duration)
+            del samples[:-self.window]
+            self.changed = True
+
+    def quantile(self, key, q, min_samples=MIN_SAMPLES):
+        """
+        Returns the q percentile latency of the call or None if it has not
+        been made at least min_samples times.
+        """
+        self.load()
+        with self.lock:
+            samples = sorted(self.durations.get(key, []))
+
+        if len(samples) < min_samples:
+            return None
+        return percentile(samples, q)
+
+
+##########################################################################
+## Hedger
+##########################################################################
+
+class Hedger(object):
+    """
+    Makes calls that are hedged at the quantile latency of their key, with
+    at most budget hedges per call on average and burst hedges at once.
+
+    Parameters
+    ----------
+    config : Configuration, default=settings.hedge
+        The quantile, budget and burst of hedging.
+
+    latencies : Latencies, default=Latencies()
+        The observed latencies of the calls by key.
+    """
+
+    def __init__(self, config=None, latencies=None):
+        self._config = config
+        self.latencies = latencies or Latencies()
+        self.lock = threading.Lock()
+        self.tokens = None
+        self.calls = 0
+        self.hedges = 0
+        self.wins = 0
+
+    @property
+    def config(self):
+        if self._config is None:
+            return settings.hedge
+        return self._config
+
+    def allow(self):
+        """
+        Returns True if the budget allows a hedge, spending a token.
+        """
+        with self.lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.hedges += 1
+                return True
+            return False
+
+    def call(self, key, func, *args, **kwargs):
+        """
+        Calls func(*args, **kwargs), making a duplicate call if it has not
+        returned within the quantile latency of calls with the key, and
+        returns the first result. An error is only raised if every call
+        failed. The func must be idempotent.
+        """
+        config = self.config
+        with self.lock:
+            if self.tokens is None:
+                self.tokens = config.burst
+            self.tokens = min(config.burst, self.tokens + config.budget)
+            self.calls += 1
+
+        threshold = self.latencies.quantile(key, config.quantile)
+        if threshold is None:
+            return self.timed(key, func, *args, **kwargs)
+
+        outcomes = Queue.Queue()
+
+        def attempt(hedge):
+            try:
+                outcomes.put((hedge, self.timed(key, func, *args, **kwargs), None))
+            except Exception:
+                outcomes.put((hedge, None, sys.exc_info()))
+
+        def hedge():
+            if self.allow():
+                attempts.append(spawn(attempt, True))
+
+        attempts = [spawn(attempt, False)]
+        timer = threading.Timer(threshold, hedge)
+        timer.daemon = True
+        timer.start()
+
+        # The timer is cancelled once there is an outcome, so a hedge can no
+        # longer be started and the number of attempts is final after join.
+        hedged, result, error = outcomes.get()
+        timer.cancel()
+        timer.join()
+
+        remaining = len(attempts) - 1
+        while error is not None and remaining:
+            hedged, result, next_error = outcomes.get()
+            remaining -= 1
+            if next_error is None:
+                error = None
+
+        if error is not None:
+            raise error[0], error[1], error[2]
+
+        if hedged:
+            with self.lock:
+                self.wins += 1
+        return result
+
+    def timed(self, key, func, *args, **kwargs):
+        """
+        Calls func and observes its latency if it succeeds.
+        """
+        started = perf_counter()
+        result = func(*args, **kwargs)
+        self.latencies.observe(key, perf_counter() - started)
+        return result
+
+
+# The hedger of region describe calls
+hedger = Hedger()
+atexit.register(hedger.latencies.dump)
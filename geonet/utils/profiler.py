@@ -0,0 +1,246 @@
+# geonet.utils.profiler
+# Profiles the CPU time and memory allocations of a command.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Fri Oct 23 10:21:37 2026 -0400
+#
+# ID: profiler.py [] benjamin@bengfort.com $
+
+"""
+Profiles the CPU time and memory allocations of a command.
+
+cProfile only profiles the thread it is enabled in, so the profiler also
+installs a threading profile hook that enables a separate profile in every
+thread started while profiling (e.g. the thread pool of wait) and combines
+the stats of all of the threads when it is stopped. Memory allocation sites
+are collected with tracemalloc if it is available (Python 3 or the
+pytracemalloc backport), otherwise the growth in the number of live objects
+of each type is reported instead, along with the peak resident memory.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import gc
+import sys
+import pstats
+import cProfile
+import threading
+
+from StringIO import StringIO
+from collections import Counter
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def census():
+    """
+    Returns the number of live objects tracked by the garbage collector of
+    each type and their total size in bytes.
+    """
+    counts, sizes = Counter(), Counter()
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        counts[name] += 1
+        try:
+            sizes[name] += sys.getsizeof(obj)
+        except TypeError:
+            pass
+    return counts, sizes
+
+
+def peak_memory():
+    """
+    Returns the peak resident memory of the process in bytes or None.
+    """
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def kibibytes(nbytes):
+    return "{:0.1f} KiB".format(nbytes / 1024)
+
+
+##########################################################################
+## Profiler
+##########################################################################
+
+class Profiler(object):
+    """
+    Profiles the CPU time of every thread and/or the memory allocations of
+    the process between start and stop.
+
+    Parameters
+    ----------
+    cpu : bool, default=True
+        Profile the functions called by every thread with cProfile.
+
+    memory : bool, default=False
+        Collect the top memory allocation sites or object types.
+
+    limit : int, default=15
+        The number of functions and allocation sites in the summary.
+    """
+
+    def __init__(self, cpu=True, memory=False, limit=15):
+        self.cpu = cpu
+        self.memory = memory
+        self.limit = limit
+
+        self.lock = threading.Lock()
+        self.profiles = []
+        self.running = False
+        self.collected = None
+        self.baseline = None
+        self.snapshot = None
+        self.traced = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self.running = True
+        if self.memory:
+            if tracemalloc is not None:
+                tracemalloc.start()
+            else:
+                self.baseline = census()
+
+        if self.cpu:
+            # Threads started from now on enable their own profile
+            threading.setprofile(self.profile_thread)
+            self.profile_thread()
+
+        return self
+
+    def stop(self):
+        if not self.running:
+            return
+
+        if self.cpu:
+            # No thread may add or keep collecting a profile once stopped
+            threading.setprofile(None)
+            with self.lock:
+                self.running = False
+                for profile in self.profiles:
+                    profile.disable()
+
+                # cProfile can only stop the hook of the calling thread, so
+                # the stats are combined now, before other threads go on
+                if self.profiles:
+                    self.collected = pstats.Stats(*self.profiles)
+
+        if self.memory:
+            if tracemalloc is not None:
+                self.snapshot = tracemalloc.take_snapshot()
+                self.traced = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            else:
+                self.snapshot = census()
+
+        self.running = False
+
+    def profile_thread(self, *args):
+        """
+        Enables a new profile in the calling thread, which replaces this hook
+        as the thread's profile function.
+        """
+        profile = cProfile.Profile()
+        with self.lock:
+            if not self.running:
+                return
+            self.profiles.append(profile)
+            profile.enable()
+
+    def stats(self):
+        """
+        Returns the combined pstats of every profiled thread, as collected
+        when the profiler was stopped.
+        """
+        if self.collected is not None:
+            self.collected.stream = StringIO()
+            return self.collected
+
+        if not self.profiles:
+            raise ValueError("no CPU profile was collected")
+
+        with self.lock:
+            return pstats.Stats(*self.profiles, stream=StringIO())
+
+    def dump(self, path):
+        """
+        Writes the combined pstats to path, e.g. to load with pstats or
+        snakeviz.
+        """
+        self.stats().dump_stats(path)
+
+    def allocations(self):
+        """
+        Returns the top (site, size in bytes, count) allocations, where a
+        site is a file and line number with tracemalloc, or an object type.
+        """
+        if self.snapshot is None:
+            raise ValueError("no memory profile was collected")
+
+        if tracemalloc is not None:
+            return [
+                ("{}:{}".format(stat.traceback[0].filename, stat.traceback[0].lineno), stat.size, stat.count)
+                for stat in self.snapshot.statistics("lineno")[:self.limit]
+            ]
+
+        counts, sizes = self.snapshot
+        before_counts, before_sizes = self.baseline
+        growth = [
+            (name, sizes[name] - before_sizes[name], counts[name] - before_counts[name])
+            for name in counts
+        ]
+        growth.sort(key=lambda row: (row[1], row[2]), reverse=True)
+        return [row for row in growth if row[2] > 0][:self.limit]
+
+    def summary(self):
+        """
+        Returns a printable summary of the slowest functions by cumulative
+        time and the top memory allocations.
+        """
+        sections = []
+        if self.profiles:
+            stats = self.stats()
+            stats.sort_stats("cumulative").print_stats(self.limit)
+            sections.append("profiled {} threads\n{}".format(
+                len(self.profiles), stats.stream.getvalue().strip("\n")
+            ))
+
+        if self.snapshot is not None:
+            site = "Site" if tracemalloc is not None else "Type"
+            lines = ["{:<60} {:>12} {:>10}".format(site, "Size", "Count")]
+            lines.extend(
+                "{:<60} {:>12} {:>10}".format(name, kibibytes(size), count)
+                for name, size, count in self.allocations()
+            )
+
+            peak = self.traced[1] if self.traced else peak_memory()
+            if peak is not None:
+                lines.append("peak memory: {}".format(kibibytes(peak)))
+            sections.append("\n".join(lines))
+
+        return "\n\n".join(sections)
@@ -0,0 +1,197 @@
+# geonet.utils.schedule
+# Orders asynchronous jobs by their expected duration from past runs.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Sun Oct 25 14:27:08 2026 -0400
+#
+# ID: schedule.py [] benjamin@bengfort.com $
+
+"""
+Orders asynchronous jobs by their expected duration from past runs.
+
+When there are more jobs than threads, starting the jobs in the order they
+are given can leave a slow job (e.g. describing a region on the other side
+of the world) until last, so the fan out takes as long as that job plus the
+jobs before it. Starting the longest jobs first (longest processing time
+scheduling) brings the total time close to that of the slowest job.
+
+Jobs are identified by the region they run in and their operation, e.g.
+("ap-southeast-2", "Region.instances"), which is inferred from the function
+and the object it is bound to or its arguments. The duration of every job is
+observed and its expected duration is a moving average that is persisted in
+~/.geonet when geonet exits so it is known the next time geonet runs.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import json
+import atexit
+import threading
+
+from functools import partial
+from collections import Mapping
+from geonet.config import USERDATA
+
+
+# Path of the expected durations of jobs persisted between runs
+HISTORY = os.path.join(USERDATA, "history.json")
+
+# Weight of the latest observation in the moving average of a job's duration
+ALPHA = 0.3
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def is_region(obj):
+    """
+    Returns True if the object is a description of a region.
+    """
+    return isinstance(obj, Mapping) and "RegionName" in obj
+
+
+def region_of(obj):
+    """
+    Returns the name of a region or of the region of a resource, collection
+    or other object whose region attribute is a region or a region name,
+    otherwise None. Region attributes that are methods are ignored.
+    """
+    if is_region(obj):
+        return str(obj)
+
+    region = getattr(obj, "region", None)
+    if is_region(region):
+        return str(region)
+    if isinstance(region, basestring):
+        return region
+    return None
+
+
+def job_key(func, args=()):
+    """
+    Returns the (region, operation) of a job, or None if it does not run in
+    a region. The operation is the name of the function qualified by the
+    class of the object it is bound to. The region is looked for in the
+    arguments of the job before the object it is bound to.
+    """
+    while isinstance(func, partial):
+        args = func.args + tuple(args)
+        func = func.func
+
+    name = getattr(func, "__name__", None)
+    if name is None:
+        return None
+
+    owner = getattr(func, "__self__", None)
+    candidates = list(args) + [owner]
+    if owner is not None:
+        name = "{}.{}".format(owner.__class__.__name__, name)
+
+    for candidate in candidates:
+        region = region_of(candidate)
+        if region is not None:
+            return region, name
+    return None
+
+
+##########################################################################
+## Job History
+##########################################################################
+
+class History(object):
+    """
+    A thread-safe record of the expected duration in seconds of jobs by
+    (region, operation) that is loaded from and dumped to path on demand.
+    """
+
+    def __init__(self, path=HISTORY, alpha=ALPHA):
+        self.path = path
+        self.alpha = alpha
+        self.lock = threading.Lock()
+        self.durations = None
+        self.changed = False
+
+    def load(self):
+        """
+        Loads the durations from disk if they have not been loaded yet.
+        """
+        with self.lock:
+            if self.durations is not None:
+                return
+
+            self.durations = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r') as f:
+                        data = json.load(f)
+                except ValueError:
+                    # A corrupt history is rebuilt by the next runs
+                    return
+
+                for region, operations in data.items():
+                    for operation, duration in operations.items():
+                        self.durations[(region, operation)] = duration
+
+    def dump(self):
+        """
+        Writes the durations to disk if they have changed, replacing the file
+        atomically. Nothing is written if the directory does not exist.
+        """
+        with self.lock:
+            if not self.changed or not self.path:
+                return
+            if not os.path.isdir(os.path.dirname(self.path)):
+                return
+
+            data = {}
+            for (region, operation), duration in self.durations.items():
+                data.setdefault(region, {})[operation] = duration
+
+            tmp = "{}.{}".format(self.path, os.getpid())
+            with open(tmp, 'w') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.rename(tmp, self.path)
+            self.changed = False
+
+    def expected(self, key):
+        """
+        Returns the expected duration of the job or None if it is unknown.
+        """
+        self.load()
+        return self.durations.get(key)
+
+    def observe(self, key, duration):
+        """
+        Updates the expected duration of the job with an observed duration.
+        """
+        self.load()
+        with self.lock:
+            previous = self.durations.get(key)
+            if previous is not None:
+                duration = self.alpha * duration + (1 - self.alpha) * previous
+            self.durations[key] = duration
+            self.changed = True
+
+    def order(self, keys):
+        """
+        Returns the indices of the jobs with the given keys, longest expected
+        job first. Jobs with an unknown duration are started first so that
+        they are observed, otherwise the jobs keep their order.
+        """
+        def expected(idx):
+            duration = self.expected(keys[idx]) if keys[idx] else None
+            return float("inf") if duration is None else duration
+        return sorted(range(len(keys)), key=expected, reverse=True)
+
+    def __len__(self):
+        self.load()
+        return len(self.durations)
+
+
+# The durations of jobs run by wait, persisted once when geonet exits
+history = History()
+atexit.register(history.dump)
@@ -0,0 +1,113 @@
+# geonet.utils.singleflight
+# Coalesces identical concurrent calls into a single call.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Fri Oct 23 14:02:55 2026 -0400
+#
+# ID: singleflight.py [] benjamin@bengfort.com $
+
+"""
+Coalesces identical concurrent calls into a single call.
+
+When a call is made with a key that is already in flight, the caller waits
+for the in-flight call and shares its result (or its exception) rather than
+making the call again. Nothing is cached: once a call returns, the next call
+with the same key is made as usual. Region describe calls are coalesced by
+the region, the operation and the normalized parameters, so concurrent fan
+outs that describe the same resources only make one API call.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import sys
+import json
+import threading
+
+from copy import deepcopy
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def normalize(params):
+    """
+    Returns a hashable representation of the parameters of a call that does
+    not depend on the order of their keys.
+    """
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+##########################################################################
+## Single Flight
+##########################################################################
+
+class Flight(object):
+    """
+    A call that is in flight and the callers waiting for it to land.
+    """
+
+    def __init__(self):
+        self.landed = threading.Event()
+        self.waiting = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    A thread-safe group of in-flight calls by key. Callers that share a call
+    each receive their own copy of its result so they can modify it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.shared = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Calls func(*args, **kwargs) unless a call with the same key is in
+        flight, in which case its result is returned (or its error raised)
+        once it lands.
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+            else:
+                flight.waiting += 1
+                self.shared += 1
+
+        if not leader:
+            flight.landed.wait()
+            if flight.error is not None:
+                raise flight.error[0], flight.error[1], flight.error[2]
+            return deepcopy(flight.result)
+
+        try:
+            flight.result = func(*args, **kwargs)
+        except:
+            flight.error = sys.exc_info()
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+                waiting = flight.waiting
+            flight.landed.set()
+
+        # The waiting callers copy the result, so if it was shared the caller
+        # also gets a copy rather than modifying it while they are copying.
+        if waiting:
+            return deepcopy(flight.result)
+        return flight.result
+
+    def __len__(self):
+        return len(self.flights)
+
+
+# The in-flight calls of all regions
+flights = SingleFlight()
@@ -14,6 +14,8 @@ Helpers for handling SSH configuration files.
 ## Imports
 ##########################################################################
 
+import os
+
 from collections import defaultdict
 
 ##########################################################################
@@ -21,32 +23,75 @@ from collections import defaultdict
 ##########################################################################
 
 def load_ssh_config(path):
+    """
+    Returns the options of every Host in the SSH config file at path.
+    """
+    with open(path, 'r') as f:
+        return parse_ssh_config(f)
+
+
+def parse_ssh_config(lines):
+    """
+    Returns the options of every Host in the lines of an SSH config by host,
+    options before the first Host are returned under None.
+    """
     hosts = defaultdict(dict)
     host = None
 
-    with open(path, 'r') as f:
-        for line in f:
-            # Skip comments and empty lines
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
+    for line in lines:
+        # Skip comments and empty lines
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        # Get key/value pair
+        parts = line.split()
+        key, value = parts[0], " ".join(parts[1:])
+
+        # Check if we're a host
+        if key.lower() == "host":
+            host = value
+            continue
+
+        # Add key/value to config
+        hosts[host][key] = value
+
+    return hosts
 
-            # Get key/value pair
-            parts = line.split()
-            key, value = parts[0], " ".join(parts[1:])
 
-            # Check if we're a host
-            if key.lower() == "host":
-                host = value
-                continue
+def diff_hosts(current, hosts):
+    """
+    Returns the sorted names of the hosts that were added, removed and
+    changed in hosts compared to the current hosts.
+    """
+    added = sorted(name for name in hosts if name not in current)
+    removed = sorted(name for name in current if name not in hosts)
+    changed = sorted(
+        name for name in hosts
+        if name in current and current[name] != hosts[name]
+    )
+    return added, removed, changed
 
-            # Add key/value to config
-            hosts[host][key] = value
 
+def ssh_hosts(instances, user="ubuntu", port=22, ssh_dir="~/.ssh", ipaddr=False, forward_agent=True):
+    """
+    Returns the SSH host information of the instances by name: the hostname
+    (or IP address) to connect to, the user, port and identity file to
+    connect with, whether or not to forward the SSH agent and the region.
+    """
+    hosts = {}
+    for instance in instances:
+        hosts[instance.name] = {
+            "hostname": instance.ipaddr if ipaddr else instance.hostname,
+            "user": user,
+            "port": port,
+            "key": os.path.join(ssh_dir, "{}.pem".format(instance["KeyName"])),
+            "forward_agent": forward_agent,
+            "region": str(instance.region),
+        }
     return hosts
 
 
 if __name__ == '__main__':
-    import os
     import json
     print(json.dumps(load_ssh_config(os.path.expanduser("~/.ssh/geonet.config")), indent=2))
@@ -0,0 +1,219 @@
+# geonet.utils.stats
+# Records the latency of every AWS API call made by geonet.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Wed Oct 21 11:02:17 2026 -0400
+#
+# ID: stats.py [] benjamin@bengfort.com $
+
+"""
+Records the latency of every AWS API call made by geonet.
+
+Clients are instrumented with botocore event hooks that fire at the start of
+each API operation and after it returns (including any retries), so every
+call made in any thread is recorded with its region and operation. The global
+recorder can summarize the calls or dump the raw records as NDJSON, and when
+tracing is enabled every call is also recorded as a span of the trace.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import json
+import math
+import time
+import threading
+
+from collections import defaultdict
+from geonet.utils.timer import tracer
+
+
+# Keys used to stash the start time and span in the botocore request context
+STARTED = "geonet_started"
+SPAN = "geonet_span"
+
+# Fields of every record, in the order they are reported
+FIELDS = (
+    "service", "operation", "region", "started", "duration",
+    "retries", "status", "size", "error",
+)
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def percentile(values, q):
+    """
+    Returns the nearest-rank percentile (0 < q <= 100) of sorted values.
+    """
+    if not values:
+        return None
+    rank = int(math.ceil(q / 100.0 * len(values)))
+    return values[max(rank, 1) - 1]
+
+
+def response_size(http_response):
+    """
+    Returns the size in bytes of a botocore HTTP response body.
+    """
+    length = http_response.headers.get("content-length")
+    if length is not None:
+        return int(length)
+
+    content = getattr(http_response, "content", None)
+    return len(content) if content is not None else None
+
+
+##########################################################################
+## Call Recorder
+##########################################################################
+
+class CallRecorder(object):
+    """
+    A thread-safe, in-memory log of AWS API calls. Instrument each boto3
+    client with the recorder to capture the calls the client makes.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.lock = threading.Lock()
+
+    def instrument(self, client):
+        """
+        Registers the recorder's hooks with a boto3 client and returns it.
+        """
+        # The start time is recorded when the call's parameters are provided
+        # rather than on before-call, since a before-call handler can return
+        # a response (e.g. a stub) that stops later before-call handlers.
+        events = client.meta.events
+        events.register("provide-client-params", self.start_call)
+        events.register("after-call", self.after_call)
+        events.register("after-call-error", self.after_call_error)
+        return client
+
+    def start_call(self, model=None, context=None, **kwargs):
+        context[STARTED] = time.time()
+        if tracer.enabled and model is not None:
+            service = model.service_model.service_name
+            context[SPAN] = tracer.span(
+                "{}.{}".format(service, model.name), category="aws",
+                service=service, operation=model.name,
+                region=context.get("client_region"),
+            ).start()
+
+    def after_call(self, http_response=None, parsed=None, model=None, context=None, **kwargs):
+        meta = parsed.get("ResponseMetadata", {}) if parsed else {}
+        self.record(
+            model, context,
+            retries=meta.get("RetryAttempts", 0),
+            status=http_response.status_code,
+            size=response_size(http_response),
+            error=parsed.get("Error", {}).get("Code") if parsed else None,
+        )
+
+    def after_call_error(self, exception=None, context=None, event_name=None, **kwargs):
+        # The error event does not include the model, so use the event name
+        _, service, operation = event_name.split(".", 2)
+        self.record(
+            None, context, service=service, operation=operation,
+            error=exception.__class__.__name__,
+        )
+
+    def record(self, model, context, **fields):
+        """
+        Appends a record of a call made with the given operation model and
+        request context, along with any extra fields.
+        """
+        finished = time.time()
+        started = context.get(STARTED, finished)
+
+        record = dict.fromkeys(FIELDS)
+        if model is not None:
+            record["service"] = model.service_model.service_name
+            record["operation"] = model.name
+
+        record.update({
+            "region": context.get("client_region"),
+            "started": started,
+            "duration": (finished - started) * 1000.0,
+            "retries": 0,
+        })
+        record.update(fields)
+
+        with self.lock:
+            self.records.append(record)
+
+        span = context.pop(SPAN, None)
+        if span is not None:
+            span.set(retries=record["retries"], status=record["status"], size=record["size"])
+            span.finish(record["error"])
+
+    def clear(self):
+        with self.lock:
+            self.records = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        with self.lock:
+            records = list(self.records)
+        return iter(records)
+
+    def summary(self, key="region"):
+        """
+        Returns a list of dicts, one per value of the key (e.g. region or
+        operation), with the number of calls, errors, and the p50, p95 and
+        max call duration in milliseconds.
+        """
+        groups = defaultdict(list)
+        for record in self:
+            groups[record[key]].append(record)
+
+        rows = []
+        for name, records in sorted(groups.items()):
+            durations = sorted(record["duration"] for record in records)
+            rows.append({
+                key: name,
+                "calls": len(records),
+                "retries": sum(record["retries"] or 0 for record in records),
+                "errors": sum(1 for record in records if record["error"]),
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95),
+                "max": durations[-1],
+            })
+        return rows
+
+    def report(self):
+        """
+        Returns a printable table of the calls per region and per operation.
+        """
+        from tabulate import tabulate
+
+        tables = []
+        for key in ("region", "operation"):
+            columns = [key, "calls", "retries", "errors", "p50", "p95", "max"]
+            table = [[column.title() for column in columns]]
+            table.extend([
+                [row[column] for column in columns] for row in self.summary(key)
+            ])
+            tables.append(tabulate(
+                table, tablefmt="simple", headers="firstrow", floatfmt=".1f"
+            ))
+        return "\n\n".join(tables)
+
+    def dump(self, f):
+        """
+        Writes the raw records to a file-like object as newline delimited JSON.
+        """
+        for record in self:
+            f.write(json.dumps(record, sort_keys=True))
+            f.write("\n")
+
+
+# The recorder of all clients created by geonet
+recorder = CallRecorder()
@@ -8,18 +8,34 @@
 
 """
 Provides timing utilities with human readable results.
+
+Timers can also be used as spans of a trace: spans nest within the span that
+is active in the current thread (or the span that was active when the thread
+was started by geonet.utils.async.wait) and the tracer exports them as Chrome
+trace events, which can be loaded into chrome://tracing or Perfetto.
 """
 
 ##########################################################################
 ## Imports
 ##########################################################################
 
+import os
 import time
+import json
+import threading
 
+from itertools import count
 from functools import wraps
 from .timez import humanizedelta
 
 
+# Monotonic high resolution clock, falling back to time.time on Python 2
+perf_counter = getattr(time, "perf_counter", time.time)
+
+# Process time clock, falling back to the deprecated time.clock on Python 2
+process_time = getattr(time, "process_time", None) or time.clock
+
+
 ##########################################################################
 ## Decorator
 ##########################################################################
@@ -54,12 +70,12 @@ class Timer(object):
 
     def __init__(self, wall_clock=True):
         """
-        If wall_clock is True then use time.time() to get the number of
-        actually elapsed seconds. If wall_clock is False, use time.clock to
-        get the process time instead.
+        If wall_clock is True then use perf_counter() to get the number of
+        actually elapsed seconds. If wall_clock is False, use process_time()
+        to get the process time instead.
         """
         self.wall_clock = wall_clock
-        self.time = time.time if wall_clock else time.clock
+        self.time = perf_counter if wall_clock else process_time
 
         # Stubs for serializing an empty timer.
         self.started  = None
@@ -83,3 +99,195 @@ class Timer(object):
             'finished': self.finished,
             'elapsed':  humanizedelta(seconds=self.elapsed),
         }
+
+
+##########################################################################
+## Tracing
+##########################################################################
+
+# The active span of each thread
+_local = threading.local()
+
+# Unique span ids
+_span_ids = count(1)
+
+
+def current_span():
+    """
+    Returns the span that is active in the current thread, if any.
+    """
+    return getattr(_local, "span", None)
+
+
+def propagate(func, parent=None):
+    """
+    Wraps a function so that spans created when it runs in another thread are
+    children of the parent, by default the span active in the calling thread.
+    """
+    parent = parent if parent is not None else current_span()
+    if parent is None:
+        return func
+
+    def propagated(*args, **kwargs):
+        previous, _local.span = current_span(), parent
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.span = previous
+    return propagated
+
+
+def trace(name=None, **attributes):
+    """
+    Decorator that records each call to the function as a span.
+    """
+    def decorator(func):
+        @wraps(func)
+        def trace_wrapper(*args, **kwargs):
+            with tracer.span(name or func.__name__, **attributes):
+                return func(*args, **kwargs)
+        return trace_wrapper
+    return decorator
+
+
+class Span(Timer):
+    """
+    A timer that records an operation in a trace. Used as a context manager
+    the span becomes the active span of the thread, so that spans created
+    inside of it are its children. Spans can also be started and finished
+    explicitly (e.g. from event hooks) without becoming the active span.
+    """
+
+    def __init__(self, name, parent=None, tracer=None, **attributes):
+        super(Span, self).__init__(wall_clock=True)
+        self.id = next(_span_ids)
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent if parent is not None else current_span()
+        self.tracer = tracer
+        self.thread = None
+        self._previous = None
+
+    def set(self, **attributes):
+        """
+        Attach attributes (e.g. region or operation) to the span.
+        """
+        self.attributes.update(attributes)
+        return self
+
+    def start(self):
+        self.thread = threading.current_thread()
+        self.started = self.time()
+        return self
+
+    def finish(self, error=None):
+        self.finished = self.time()
+        self.elapsed = self.finished - self.started
+        if error is not None:
+            self.attributes["error"] = error
+        if self.tracer is not None:
+            self.tracer.record(self)
+        return self
+
+    def __enter__(self):
+        self._previous, _local.span = current_span(), self
+        return self.start()
+
+    def __exit__(self, type, value, tb):
+        error = type.__name__ if type is not None and not issubclass(type, SystemExit) else None
+        self.finish(error)
+        _local.span = self._previous
+
+    def serialize(self):
+        data = super(Span, self).serialize()
+        data.update({
+            "id": self.id,
+            "name": self.name,
+            "parent": self.parent.id if self.parent is not None else None,
+            "attributes": self.attributes,
+        })
+        return data
+
+
+class Tracer(object):
+    """
+    Collects the finished spans of a trace when enabled. Spans are cheap
+    timers when the tracer is disabled, since nothing is recorded.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.spans = []
+        self.lock = threading.Lock()
+        self.epoch = perf_counter()
+
+    def span(self, name, parent=None, **attributes):
+        """
+        Create a span recorded by this tracer.
+        """
+        return Span(name, parent=parent, tracer=self, **attributes)
+
+    def record(self, span):
+        if self.enabled:
+            with self.lock:
+                self.spans.append(span)
+
+    def clear(self):
+        with self.lock:
+            self.spans = []
+        self.epoch = perf_counter()
+
+    def __len__(self):
+        return len(self.spans)
+
+    def events(self):
+        """
+        Returns the spans as a list of Chrome trace events, with complete
+        ("X") events for the spans, flow events linking spans to children
+        that run in other threads, and metadata events naming the threads.
+        """
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: span.started)
+
+        pid = os.getpid()
+        events, threads = [], {}
+        for span in spans:
+            threads[span.thread.ident] = span.thread.name
+            args = dict(span.attributes, id=span.id)
+            if span.parent is not None:
+                args["parent"] = span.parent.id
+
+            ts = (span.started - self.epoch) * 1e6
+            events.append({
+                "name": span.name,
+                "cat": args.get("category", "geonet"),
+                "ph": "X",
+                "ts": ts,
+                "dur": span.elapsed * 1e6,
+                "pid": pid,
+                "tid": span.thread.ident,
+                "args": args,
+            })
+
+            parent = span.parent
+            if parent is not None and parent.thread is not None and parent.thread is not span.thread:
+                flow = {"name": "spawn", "cat": "flow", "id": span.id, "ts": ts, "pid": pid}
+                events.append(dict(flow, ph="s", tid=parent.thread.ident))
+                events.append(dict(flow, ph="f", bp="e", tid=span.thread.ident))
+
+        for tid, name in threads.items():
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": name},
+            })
+        return events
+
+    def export(self, f):
+        """
+        Writes the trace to a file-like object in the Chrome trace format.
+        """
+        json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+
+
+# The tracer of all spans created by geonet
+tracer = Tracer()
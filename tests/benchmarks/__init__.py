@@ -0,0 +1,21 @@
+# tests.benchmarks
+# Benchmarks of the geonet commands against the fake EC2 service.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Thu Oct 22 14:05:19 2026 -0400
+#
+# ID: __init__.py [] benjamin@bengfort.com $
+
+"""
+Benchmarks of the geonet commands against the fake EC2 service.
+
+The benchmarks are skipped unless pytest is run with --geonet-bench, e.g.
+
+    pytest tests/benchmarks --geonet-bench --geonet-bench-json=benchmarks.json
+
+Every round of a benchmark runs in a forked process so that rounds start from
+the same fleet and the peak memory of each round can be measured. The wall
+time, number of API calls and peak memory of every benchmark are reported at
+the end of the run and saved as JSON in the pytest-benchmark layout so that
+runs can be compared.
+"""
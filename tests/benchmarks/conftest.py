@@ -0,0 +1,253 @@
+# tests.benchmarks.conftest
+# Options, fixtures and reporting of the command benchmarks.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Thu Oct 22 14:11:42 2026 -0400
+#
+# ID: conftest.py [] benjamin@bengfort.com $
+
+"""
+Options, fixtures and reporting of the command benchmarks.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import os
+import sys
+import json
+import codecs
+import pytest
+import platform
+import resource
+import traceback
+
+from collections import Counter
+
+from geonet.utils.stats import recorder
+from geonet.utils.timer import perf_counter
+from geonet.utils.timez import utcnow
+
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+MAXRSS_SCALE = 1 if sys.platform == "darwin" else 1024
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def fork(func):
+    """
+    Calls func in a forked process and returns its (JSON serializable)
+    result, failing the test if the function raised an exception.
+    """
+    read, write = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        os.close(read)
+        try:
+            output = {"result": func()}
+        except BaseException:
+            output = {"error": traceback.format_exc()}
+
+        with os.fdopen(write, "w") as f:
+            json.dump(output, f)
+        os._exit(0)
+
+    os.close(write)
+    with os.fdopen(read) as f:
+        output = json.load(f)
+    os.waitpid(pid, 0)
+
+    if "error" in output:
+        pytest.fail(output["error"], pytrace=False)
+    return output["result"]
+
+
+def max_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * MAXRSS_SCALE
+
+
+def median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    if len(values) % 2:
+        return values[mid]
+    return (values[mid - 1] + values[mid]) / 2
+
+
+##########################################################################
+## Benchmark Fixture
+##########################################################################
+
+class Benchmark(object):
+    """
+    Measures the wall time, the AWS API calls and the peak memory of a
+    function over a number of rounds, each in a forked process.
+    """
+
+    def __init__(self, name, group=None, params=None, rounds=3):
+        self.name = name
+        self.group = group
+        self.params = params or {}
+        self.rounds = rounds
+        self.results = []
+
+    def __call__(self, func, setup=None):
+        """
+        Benchmarks func, calling setup in each round before measuring.
+        """
+        self.results = [self.measure(func, setup) for _ in range(self.rounds)]
+
+    def measure(self, func, setup=None):
+        def run():
+            # Silence the output of the commands
+            sys.stdout = codecs.getwriter("utf-8")(open(os.devnull, "w"))
+            if setup is not None:
+                setup()
+
+            recorder.clear()
+            baseline = max_rss()
+            started = perf_counter()
+            func()
+            elapsed = perf_counter() - started
+
+            return {
+                "time": elapsed,
+                "calls": len(recorder),
+                "operations": Counter(r["operation"] for r in recorder),
+                "memory": max_rss() - baseline,
+            }
+        return fork(run)
+
+    def serialize(self):
+        times = [result["time"] for result in self.results]
+        operations = Counter()
+        for result in self.results:
+            operations |= Counter(result["operations"])
+
+        return {
+            "name": self.name,
+            "group": self.group,
+            "params": self.params,
+            "stats": {
+                "min": min(times),
+                "max": max(times),
+                "mean": sum(times) / len(times),
+                "median": median(times),
+                "rounds": len(times),
+                "data": times,
+            },
+            "extra_info": {
+                "calls": max(result["calls"] for result in self.results),
+                "operations": dict(operations),
+                "peak_memory": max(result["memory"] for result in self.results),
+            },
+        }
+
+
+@pytest.fixture
+def geonet_benchmark(request):
+    """
+    Returns a Benchmark for the test that is reported when the run ends.
+    """
+    params = getattr(request.node, "callspec", None)
+    bench = Benchmark(
+        request.node.name,
+        group=request.node.originalname or request.node.name,
+        params=dict(params.params) if params else None,
+        rounds=request.config.getoption("geonet_bench_rounds", 3),
+    )
+
+    yield bench
+    if bench.results:
+        request.config._benchmarks.append(bench.serialize())
+
+
+##########################################################################
+## Pytest Hooks
+##########################################################################
+
+def pytest_addoption(parser):
+    group = parser.getgroup("geonet-bench")
+    group.addoption(
+        "--geonet-bench", action="store_true", default=False,
+        help="run the command benchmarks",
+    )
+    group.addoption(
+        "--geonet-bench-rounds", type=int, default=3, metavar="N",
+        help="number of rounds to run each benchmark",
+    )
+    group.addoption(
+        "--geonet-bench-latency", type=float, default=10.0, metavar="MS",
+        help="latency of every call to the fake EC2 service",
+    )
+    group.addoption(
+        "--geonet-bench-json", default=None, metavar="PATH",
+        help="save the benchmark results as JSON",
+    )
+
+
+def pytest_configure(config):
+    config._benchmarks = []
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("geonet_bench", False):
+        return
+
+    skip = pytest.mark.skip(reason="use --geonet-bench to run the benchmarks")
+    for item in items:
+        if "geonet_benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip)
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    path = config.getoption("geonet_bench_json", None)
+    if not path or not config._benchmarks:
+        return
+
+    data = {
+        "machine_info": {
+            "node": platform.node(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "python_version": platform.python_version(),
+        },
+        "datetime": utcnow().isoformat(),
+        "options": {
+            "rounds": config.getoption("geonet_bench_rounds", 3),
+            "latency": config.getoption("geonet_bench_latency", 10.0),
+        },
+        "benchmarks": config._benchmarks,
+    }
+
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def pytest_terminal_summary(terminalreporter):
+    benchmarks = getattr(terminalreporter.config, "_benchmarks", None)
+    if not benchmarks:
+        return
+
+    from tabulate import tabulate
+
+    table = [["Benchmark", "Min (s)", "Median (s)", "Calls", "Peak Memory (MiB)"]]
+    for bench in benchmarks:
+        table.append([
+            bench["name"], bench["stats"]["min"], bench["stats"]["median"],
+            bench["extra_info"]["calls"],
+            bench["extra_info"]["peak_memory"] / 1048576,
+        ])
+
+    terminalreporter.write_sep("=", "benchmarks")
+    terminalreporter.write_line(tabulate(
+        table, tablefmt="simple", headers="firstrow", floatfmt=".3f"
+    ))
@@ -0,0 +1,169 @@
+# tests.benchmarks.test_commands
+# Benchmarks of the command hot paths at increasing fleet sizes.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Thu Oct 22 14:48:03 2026 -0400
+#
+# ID: test_commands.py [] benjamin@bengfort.com $
+
+"""
+Benchmarks of the command hot paths at increasing fleet sizes.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import json
+import shutil
+import pytest
+
+import geonet.region
+import geonet.managed
+import geonet.commands.regions
+
+from geonet.config import settings
+from geonet.console import GeoNetUtility
+from geonet.region import Regions, REGION_COORDINATES
+from geonet.utils.serialize import Encoder
+from geonet.utils.timez import utcnow
+
+from tests.fake_ec2 import FakeEC2, constant
+
+
+# The regions of the fleet, the first N of which are used at each scale
+REGIONS = sorted(REGION_COORDINATES)[:16]
+
+# Number of regions and instances per region of the fleet
+SCALES = [(nregions, ninstances) for nregions in (1, 4, 16) for ninstances in (10, 100, 1000)]
+
+
+##########################################################################
+## Fleet Fixture
+##########################################################################
+
+class Fleet(object):
+    """
+    A fake EC2 service with alia resources and running instances in each
+    region, along with the region data and managed instances on disk.
+    """
+
+    def __init__(self, root, nregions, ninstances, latency=0.0):
+        self.root = root
+        self.names = REGIONS[:nregions]
+        self.ninstances = ninstances
+        self.fake = FakeEC2(self.names, latency=constant(latency))
+
+        # Load the EC2 service model before forking, since it is loaded once
+        # per process and would otherwise dominate the smaller benchmarks.
+        self.fake.client(self.names[0])
+
+        self.regions_path = os.path.join(root, "regions.json")
+        self.instances_path = os.path.join(root, "instances.json")
+        self.hosts_path = os.path.join(root, "hosts")
+
+        managed = {}
+        for name in self.names:
+            region = self.fake[name]
+            image = region.add_image("alia-image")
+            region.add_key_pair("alia")
+            region.add_placement_group("alia")
+            region.op_create_security_group({"GroupName": "alia", "Description": "alia"})
+            region.op_create_launch_template({
+                "LaunchTemplateName": "alia",
+                "LaunchTemplateData": {"ImageId": image, "KeyName": "alia"},
+            })
+            managed[name] = region.add_instances(ninstances, KeyName="alia")
+
+        Regions([{"RegionName": name} for name in self.names]).dump(self.regions_path)
+        with open(self.instances_path, "w") as f:
+            json.dump({"updated": utcnow(), "instances": managed}, f, cls=Encoder)
+
+    def activate(self):
+        """
+        Points geonet at the fleet's data on disk and configures its regions.
+        Only called in the forked benchmark process, so nothing is restored.
+        """
+        instances = os.path.join(self.root, "instances-{}.json".format(os.getpid()))
+        shutil.copy(self.instances_path, instances)
+        geonet.managed.INSTANCES = instances
+        geonet.region.REGIONDATA = self.regions_path
+        geonet.commands.regions.REGIONDATA = self.regions_path
+
+        # The command arguments refer to this list for their region choices
+        settings.regions[:] = self.names
+
+
+@pytest.fixture(scope="module", params=SCALES, ids=["r{}_i{}".format(*scale) for scale in SCALES])
+def fleet(request, tmpdir_factory):
+    if not request.config.getoption("geonet_bench", False):
+        pytest.skip("use --geonet-bench to run the benchmarks")
+
+    nregions, ninstances = request.param
+    latency = request.config.getoption("geonet_bench_latency", 10.0) / 1000.0
+    root = str(tmpdir_factory.mktemp("fleet"))
+
+    fleet = Fleet(root, nregions, ninstances, latency=latency)
+    with fleet.fake:
+        yield fleet
+
+
+def command(argv):
+    """
+    Returns a function that runs the command with the arguments, loading the
+    command module before the benchmark so that the import is not timed.
+    """
+    utility = GeoNetUtility.load()
+    utility.prepare(argv)
+
+    def run():
+        args = utility.parser.parse_args(argv)
+        args.func(args)
+    return run
+
+
+##########################################################################
+## Benchmarks
+##########################################################################
+
+def test_descr_instances(geonet_benchmark, fleet):
+    """
+    Benchmark describing the instances in every region
+    """
+    geonet_benchmark(command(["descr", "instances"]), setup=fleet.activate)
+
+
+def test_status(geonet_benchmark, fleet):
+    """
+    Benchmark the status of the managed instances
+    """
+    geonet_benchmark(command(["status"]), setup=fleet.activate)
+
+
+def test_hosts(geonet_benchmark, fleet):
+    """
+    Benchmark writing the SSH config of the managed instances
+    """
+    geonet_benchmark(command(["hosts", "-o", fleet.hosts_path]), setup=fleet.activate)
+
+
+def test_launch(geonet_benchmark, fleet):
+    """
+    Benchmark launching and tagging instances in every region
+    """
+    geonet_benchmark(command(["launch", str(fleet.ninstances)]), setup=fleet.activate)
+
+
+def test_destroy(geonet_benchmark, fleet):
+    """
+    Benchmark terminating the managed instances
+    """
+    geonet_benchmark(command(["destroy", "-f"]), setup=fleet.activate)
+
+
+def test_regions(geonet_benchmark, fleet):
+    """
+    Benchmark counting the resources of every region
+    """
+    geonet_benchmark(command(["regions", "-G", "-T", "-K", "-I"]), setup=fleet.activate)
@@ -0,0 +1,47 @@
+# tests.conftest
+# Fixtures shared by all of the tests.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Sat Oct 31 10:22:05 2026 -0400
+#
+# ID: conftest.py [] benjamin@bengfort.com $
+
+"""
+Fixtures shared by all of the tests.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import pytest
+
+from geonet.health import health
+from geonet.utils.hedge import hedger
+from geonet.utils.schedule import history
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture(autouse=True)
+def userdata(tmpdir_factory, monkeypatch):
+    """
+    Keeps the region health, job history and call latencies recorded by the
+    tests out of ~/.geonet, starting every test with none recorded.
+    """
+    root = tmpdir_factory.mktemp("userdata")
+    stores = (
+        (health, "health.json", "circuits"),
+        (history, "history.json", "durations"),
+        (hedger.latencies, "latencies.json", "durations"),
+    )
+
+    for store, name, data in stores:
+        monkeypatch.setattr(store, "path", str(root.join(name)))
+        monkeypatch.setattr(store, data, None)
+        monkeypatch.setattr(store, "changed", False)
+    monkeypatch.setattr(health, "skipped", {})
+
+    yield root
@@ -0,0 +1,965 @@
+# tests.fake_ec2
+# An in-process fake of the EC2 service for tests and benchmarks.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Thu Oct 22 09:14:08 2026 -0400
+#
+# ID: fake_ec2.py [] benjamin@bengfort.com $
+
+"""
+An in-process fake of the EC2 service for tests and benchmarks.
+
+The fake returns real boto3 clients whose requests are answered in memory by
+a before-call hook instead of being sent to AWS, so parameters are validated
+by botocore and calls are recorded by geonet.utils.stats exactly as they are
+against EC2. Each region keeps its own instances, security groups, launch
+templates, images, key pairs and placement groups, and can be configured with
+a latency distribution, a maximum page size, an instance capacity and a
+request rate limit. Latencies are drawn from a random generator seeded by the
+region name, so runs are repeatable.
+
+Install the fake as the client factory of geonet.ec2.connect with:
+
+    with FakeEC2(["us-east-1", "eu-west-1"], latency=constant(0.01)) as fake:
+        fake["us-east-1"].add_instances(10)
+        Regions.load().instances()
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+from __future__ import division
+
+import json
+import math
+import time
+import zlib
+import boto3
+import random
+import fnmatch
+import threading
+
+from copy import deepcopy
+from itertools import count
+from collections import Counter, OrderedDict
+
+from botocore import xform_name
+from botocore.awsrequest import AWSResponse
+
+from geonet.ec2 import use_client_factory
+from geonet.utils.timez import utcnow
+
+
+# Key used to stash the API parameters in the botocore request context
+PARAMS = "fake_ec2_params"
+
+# Zones of every region and the owner of all resources
+ZONES = ("a", "b", "c")
+OWNER_ID = "123456789012"
+
+# Codes of the instance states
+STATES = {
+    "pending": 0, "running": 16, "shutting-down": 32,
+    "terminated": 48, "stopping": 64, "stopped": 80,
+}
+
+# The state each transitional state settles into on the next describe
+SETTLES = {
+    "pending": "running",
+    "stopping": "stopped",
+    "shutting-down": "terminated",
+}
+
+
+##########################################################################
+## Latency Distributions
+##########################################################################
+
+def constant(seconds):
+    """
+    Every call takes the same number of seconds.
+    """
+    return lambda rng: seconds
+
+
+def uniform(low, high):
+    """
+    Calls take between low and high seconds.
+    """
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median, sigma=0.5):
+    """
+    Calls take a log-normally distributed number of seconds with the given
+    median, which has the long tail of real API latencies.
+    """
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+class FakeError(Exception):
+    """
+    An EC2 error response with a code, message and HTTP status.
+    """
+
+    def __init__(self, code, message, status=400):
+        super(FakeError, self).__init__(message)
+        self.code = code
+        self.status = status
+
+
+def tag_values(resource, key):
+    return [tag["Value"] for tag in resource.get("Tags", []) if tag["Key"] == key]
+
+
+def matches(resource, filters, fields):
+    """
+    Returns True if the resource matches every filter, looking up the values
+    of each filter name with the functions in fields. Filter values can use
+    the * and ? wildcards, as in EC2.
+    """
+    for spec in filters or []:
+        name = spec["Name"]
+        if name.startswith("tag:"):
+            values = tag_values(resource, name[4:])
+        elif name == "tag-key":
+            values = [tag["Key"] for tag in resource.get("Tags", [])]
+        elif name in fields:
+            values = fields[name](resource)
+        else:
+            raise FakeError(
+                "InvalidParameterValue", "the filter '{}' is invalid".format(name)
+            )
+
+        values = [str(value) for value in values if value is not None]
+        if not any(fnmatch.filter(values, pattern) for pattern in spec["Values"]):
+            return False
+    return True
+
+
+def paginate(items, params, page_size=None):
+    """
+    Returns a page of items and the next token (or None) for the MaxResults
+    and NextToken parameters, limited to the region's page size. Like EC2, a
+    request without MaxResults returns every item unless the page size is set.
+    """
+    start = int(params.get("NextToken") or 0)
+    limit = params.get("MaxResults") or page_size
+    if page_size is not None:
+        limit = min(limit, page_size)
+
+    if limit is None:
+        return items[start:], None
+
+    end = start + limit
+    return items[start:end], str(end) if end < len(items) else None
+
+
+def select(resources, ids, code, kind):
+    """
+    Returns the resources with the given ids (or all of them if ids is empty)
+    raising a not found error with the code if any id does not exist.
+    """
+    if not ids:
+        return list(resources.values())
+
+    missing = [rid for rid in ids if rid not in resources]
+    if missing:
+        raise FakeError(code, "the {} '{}' does not exist".format(kind, "', '".join(missing)))
+    return [resources[rid] for rid in ids]
+
+
+##########################################################################
+## Fake Region
+##########################################################################
+
+class FakeRegion(object):
+    """
+    The resources of a single region of the fake EC2 service and how it
+    responds to requests.
+
+    Parameters
+    ----------
+    name : str
+        The name of the region, e.g. us-east-1.
+
+    latency : callable, default=None
+        Called with the region's random generator to get the number of seconds
+        each call takes, e.g. constant(0.05) or lognormal(0.1). If None, calls
+        return immediately.
+
+    page_size : int, default=None
+        The most results returned by a describe call. If None, a describe
+        without MaxResults returns every result.
+
+    capacity : int, default=None
+        The most instances that can be active (not terminated) in the region.
+        Launches beyond the capacity fail with InsufficientInstanceCapacity.
+
+    rate : float, default=None
+        The sustained number of requests per second before calls fail with
+        RequestLimitExceeded, using a token bucket of size burst.
+
+    burst : int, default=20
+        The number of requests that can be made at once with a rate limit.
+
+    seed : int, default=None
+        Seeds the latency distribution, by default with the region name.
+    """
+
+    def __init__(self, name, latency=None, page_size=None, capacity=None,
+                 rate=None, burst=20, seed=None):
+        self.name = name
+        self.latency = latency
+        self.page_size = page_size
+        self.capacity = capacity
+        self.rate = rate
+        self.burst = burst
+
+        self.lock = threading.RLock()
+        self.rng = random.Random(zlib.crc32(name) if seed is None else seed)
+        self.calls = Counter()
+        self.ids = count(1)
+        self.prefix = zlib.crc32(name) & 0xffffffff
+        self.tokens = burst
+        self.refilled = time.time()
+
+        self.instances = OrderedDict()
+        self.reservations = {}
+        self.security_groups = OrderedDict()
+        self.launch_templates = OrderedDict()
+        self.images = OrderedDict()
+        self.key_pairs = OrderedDict()
+        self.placement_groups = OrderedDict()
+
+    def __repr__(self):
+        return "<FakeRegion {} with {} instances>".format(self.name, len(self.instances))
+
+    def new_id(self, kind):
+        return "{}-{:08x}{:09x}".format(kind, self.prefix, next(self.ids))
+
+    def call(self, operation, params):
+        """
+        Handles a request for the operation (e.g. describe_instances) with
+        the API parameters, returning the response or raising a FakeError.
+        """
+        handler = getattr(self, "op_" + operation, None)
+        if handler is None:
+            raise FakeError(
+                "UnsupportedOperation", "the fake does not implement {}".format(operation)
+            )
+
+        with self.lock:
+            self.calls[operation] += 1
+            delay = self.latency(self.rng) if self.latency is not None else 0
+            throttled = self.throttled()
+
+        # Sleep outside the lock so concurrent calls to the region overlap
+        if delay > 0:
+            time.sleep(delay)
+
+        if throttled:
+            raise FakeError("RequestLimitExceeded", "Request limit exceeded.", 503)
+
+        with self.lock:
+            return deepcopy(handler(params))
+
+    def throttled(self):
+        """
+        Takes a token from the bucket, returning True if there were none.
+        """
+        if self.rate is None:
+            return False
+
+        now = time.time()
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+
+        if self.tokens < 1:
+            return True
+        self.tokens -= 1
+        return False
+
+    def settle(self):
+        """
+        Moves every instance in a transitional state into its final state.
+        """
+        for instance in self.instances.values():
+            state = SETTLES.get(instance["State"]["Name"])
+            if state is not None:
+                self.set_state(instance, state)
+
+    def set_state(self, instance, state):
+        previous = deepcopy(instance["State"])
+        instance["State"] = {"Code": STATES[state], "Name": state}
+        return {
+            "InstanceId": instance["InstanceId"],
+            "CurrentState": deepcopy(instance["State"]),
+            "PreviousState": previous,
+        }
+
+    def active(self):
+        return sum(
+            1 for instance in self.instances.values()
+            if instance["State"]["Name"] not in ("shutting-down", "terminated")
+        )
+
+    ##////////////////////////////////////////////////////////////////////
+    ## Fixtures
+    ##////////////////////////////////////////////////////////////////////
+
+    def add_instances(self, n, state="running", **kwargs):
+        """
+        Adds n instances in the given state without making any calls and
+        returns their ids. Keyword arguments are passed to run_instances.
+        """
+        kwargs.setdefault("ImageId", "ami-fake")
+        kwargs.update({"MinCount": n, "MaxCount": n})
+
+        with self.lock:
+            reservation = self.op_run_instances(kwargs)
+            ids = [instance["InstanceId"] for instance in reservation["Instances"]]
+            for rid in ids:
+                self.set_state(self.instances[rid], state)
+        return ids
+
+    def add_image(self, name, size=8, disk="gp2", **fields):
+        image = {
+            "ImageId": self.new_id("ami"),
+            "Name": name,
+            "OwnerId": OWNER_ID,
+            "State": "available",
+            "CreationDate": utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "BlockDeviceMappings": [{
+                "DeviceName": "/dev/sda1",
+                "Ebs": {"VolumeSize": size, "VolumeType": disk},
+            }],
+        }
+        image.update(fields)
+        with self.lock:
+            self.images[image["ImageId"]] = image
+        return image["ImageId"]
+
+    def add_key_pair(self, name):
+        with self.lock:
+            self.key_pairs[name] = {
+                "KeyName": name,
+                "KeyFingerprint": ":".join("{:02x}".format(self.rng.getrandbits(8)) for _ in range(20)),
+            }
+        return name
+
+    def add_placement_group(self, name, strategy="cluster", **fields):
+        group = {"GroupName": name, "State": "available", "Strategy": strategy}
+        group.update(fields)
+        with self.lock:
+            self.placement_groups[name] = group
+        return name
+
+    ##////////////////////////////////////////////////////////////////////
+    ## Region Operations
+    ##////////////////////////////////////////////////////////////////////
+
+    def op_describe_regions(self, params):
+        return {"Regions": [{
+            "RegionName": self.name,
+            "Endpoint": "ec2.{}.amazonaws.com".format(self.name),
+        }]}
+
+    def op_describe_availability_zones(self, params):
+        zones = [{
+            "ZoneName": self.name + zone,
+            "ZoneId": "{}-az{}".format(self.name, idx + 1),
+            "State": "available",
+            "RegionName": self.name,
+            "Messages": [],
+        } for idx, zone in enumerate(ZONES)]
+        return {"AvailabilityZones": zones}
+
+    def op_describe_volumes(self, params):
+        return {"Volumes": []}
+
+    ##////////////////////////////////////////////////////////////////////
+    ## Instance Operations
+    ##////////////////////////////////////////////////////////////////////
+
+    INSTANCE_FILTERS = {
+        "instance-id": lambda i: [i["InstanceId"]],
+        "instance-state-name": lambda i: [i["State"]["Name"]],
+        "instance-type": lambda i: [i["InstanceType"]],
+        "image-id": lambda i: [i["ImageId"]],
+        "key-name": lambda i: [i.get("KeyName")],
+        "availability-zone": lambda i: [i["Placement"]["AvailabilityZone"]],
+    }
+
+    def op_describe_instances(self, params):
+        self.settle()
+        instances = select(
+            self.instances, params.get("InstanceIds"),
+            "InvalidInstanceID.NotFound", "instance ID"
+        )
+        instances = [
+            instance for instance in instances
+            if matches(instance, params.get("Filters"), self.INSTANCE_FILTERS)
+        ]
+        page, token = paginate(instances, params, self.page_size)
+
+        # Group the page of instances into the reservations they launched in
+        reservations = OrderedDict()
+        for instance in page:
+            rid = self.reservations[instance["InstanceId"]]
+            if rid not in reservations:
+                reservations[rid] = {
+                    "ReservationId": rid, "OwnerId": OWNER_ID,
+                    "Groups": [], "Instances": [],
+                }
+            reservations[rid]["Instances"].append(instance)
+
+        resp = {"Reservations": list(reservations.values())}
+        if token is not None:
+            resp["NextToken"] = token
+        return resp
+
+    def op_describe_instance_status(self, params):
+        self.settle()
+        instances = select(
+            self.instances, params.get("InstanceIds"),
+            "InvalidInstanceID.NotFound", "instance ID"
+        )
+        if not params.get("IncludeAllInstances", False):
+            instances = [i for i in instances if i["State"]["Name"] == "running"]
+
+        page, token = paginate(instances, params, self.page_size)
+        statuses = []
+        for instance in page:
+            running = instance["State"]["Name"] == "running"
+            check = {
+                "Status": "ok" if running else "not-applicable",
+                "Details": [{"Name": "reachability", "Status": "passed" if running else "not-applicable"}],
+            }
+            statuses.append({
+                "InstanceId": instance["InstanceId"],
+                "AvailabilityZone": instance["Placement"]["AvailabilityZone"],
+                "InstanceState": deepcopy(instance["State"]),
+                "InstanceStatus": check,
+                "SystemStatus": check,
+            })
+
+        resp = {"InstanceStatuses": statuses}
+        if token is not None:
+            resp["NextToken"] = token
+        return resp
+
+    def op_run_instances(self, params):
+        params = dict(params)
+        tags = []
+
+        # Fill in the parameters from the launch template
+        if "LaunchTemplate" in params:
+            data = self.template_data(params.pop("LaunchTemplate"))
+            for spec in data.get("TagSpecifications", []):
+                if spec["ResourceType"] == "instance":
+                    tags.extend(spec["Tags"])
+            data.update(params)
+            params = data
+
+        if not params.get("ImageId"):
+            raise FakeError("MissingParameter", "the request must contain the parameter ImageId")
+
+        for spec in params.get("TagSpecifications", []):
+            if spec["ResourceType"] == "instance":
+                tags.extend(spec["Tags"])
+
+        n = params["MaxCount"]
+        if self.capacity is not None:
+            n = min(n, self.capacity - self.active())
+            if n < params["MinCount"]:
+                raise FakeError(
+                    "InsufficientInstanceCapacity",
+                    "there is not enough capacity to fulfill the request", 500
+                )
+
+        reservation = self.new_id("r")
+        zone = params.get("Placement", {}).get("AvailabilityZone")
+        launched = utcnow()
+        instances = []
+
+        for _ in range(n):
+            iid = self.new_id("i")
+            seq = len(self.instances)
+            private = "10.{}.{}.{}".format(seq // 65536 % 256, seq // 256 % 256, seq % 256)
+            public = "54.{}.{}.{}".format(self.prefix % 256, seq // 256 % 256, seq % 256)
+            instance = {
+                "InstanceId": iid,
+                "ImageId": params["ImageId"],
+                "InstanceType": params.get("InstanceType", "m1.small"),
+                "LaunchTime": launched,
+                "Placement": {
+                    "AvailabilityZone": zone or self.name + ZONES[seq % len(ZONES)],
+                    "GroupName": "", "Tenancy": "default",
+                },
+                "PrivateIpAddress": private,
+                "PrivateDnsName": "ip-{}.{}.compute.internal".format(private.replace(".", "-"), self.name),
+                "PublicIpAddress": public,
+                "PublicDnsName": "ec2-{}.{}.compute.amazonaws.com".format(public.replace(".", "-"), self.name),
+                "SecurityGroups": [
+                    {"GroupId": gid, "GroupName": self.security_groups[gid]["GroupName"]}
+                    for gid in params.get("SecurityGroupIds", []) if gid in self.security_groups
+                ],
+                "State": {"Code": STATES["pending"], "Name": "pending"},
+                "Tags": deepcopy(tags),
+            }
+            if params.get("KeyName"):
+                instance["KeyName"] = params["KeyName"]
+
+            self.instances[iid] = instance
+            self.reservations[iid] = reservation
+            instances.append(instance)
+
+        return {
+            "ReservationId": reservation, "OwnerId": OWNER_ID,
+            "Groups": [], "Instances": instances,
+        }
+
+    def op_create_tags(self, params):
+        for rid in params["Resources"]:
+            for resources in (self.instances, self.security_groups, self.images):
+                if rid in resources:
+                    resource = resources[rid]
+                    break
+            else:
+                raise FakeError("InvalidID", "the ID '{}' is not valid".format(rid))
+
+            # Replace the values of existing keys, then append new keys
+            tags = resource.setdefault("Tags", [])
+            for tag in params["Tags"]:
+                for existing in tags:
+                    if existing["Key"] == tag["Key"]:
+                        existing["Value"] = tag.get("Value", "")
+                        break
+                else:
+                    tags.append({"Key": tag["Key"], "Value": tag.get("Value", "")})
+        return {}
+
+    def change_states(self, params, changes):
+        """
+        Changes the state of the instances to changes[state], raising an error
+        if any of the instances are in a state that cannot be changed.
+        """
+        instances = select(
+            self.instances, params["InstanceIds"],
+            "InvalidInstanceID.NotFound", "instance ID"
+        )
+        for instance in instances:
+            if instance["State"]["Name"] not in changes:
+                raise FakeError(
+                    "IncorrectInstanceState",
+                    "the instance '{}' is not in a state from which it can be changed".format(
+                        instance["InstanceId"]
+                    )
+                )
+        return [
+            self.set_state(instance, changes[instance["State"]["Name"]])
+            for instance in instances
+        ]
+
+    def op_start_instances(self, params):
+        return {"StartingInstances": self.change_states(params, {
+            "stopped": "pending", "pending": "pending", "running": "running",
+        })}
+
+    def op_stop_instances(self, params):
+        return {"StoppingInstances": self.change_states(params, {
+            "running": "stopping", "pending": "stopping",
+            "stopping": "stopping", "stopped": "stopped",
+        })}
+
+    def op_terminate_instances(self, params):
+        return {"TerminatingInstances": self.change_states(params, {
+            "pending": "shutting-down", "running": "shutting-down",
+            "stopping": "shutting-down", "stopped": "shutting-down",
+            "shutting-down": "shutting-down", "terminated": "terminated",
+        })}
+
+    ##////////////////////////////////////////////////////////////////////
+    ## Security Group Operations
+    ##////////////////////////////////////////////////////////////////////
+
+    def find_group(self, params):
+        if params.get("GroupId"):
+            return select(
+                self.security_groups, [params["GroupId"]],
+                "InvalidGroup.NotFound", "security group"
+            )[0]
+
+        for group in self.security_groups.values():
+            if group["GroupName"] == params.get("GroupName"):
+                return group
+        raise FakeError(
+            "InvalidGroup.NotFound",
+            "the security group '{}' does not exist".format(params.get("GroupName"))
+        )
+
+    def ip_permissions(self, params):
+        if "IpPermissions" in params:
+            return params["IpPermissions"]
+        return [{
+            "IpProtocol": params.get("IpProtocol", "-1"),
+            "FromPort": params.get("FromPort"), "ToPort": params.get("ToPort"),
+            "IpRanges": [{"CidrIp": params["CidrIp"]}] if "CidrIp" in params else [],
+        }]
+
+    def op_describe_security_groups(self, params):
+        groups = select(
+            self.security_groups, params.get("GroupIds"),
+            "InvalidGroup.NotFound", "security group"
+        )
+        if params.get("GroupNames"):
+            groups = [g for g in groups if g["GroupName"] in params["GroupNames"]]
+        groups = [
+            group for group in groups
+            if matches(group, params.get("Filters"), {
+                "group-id": lambda g: [g["GroupId"]],
+                "group-name": lambda g: [g["GroupName"]],
+            })
+        ]
+
+        page, token = paginate(groups, params, self.page_size)
+        resp = {"SecurityGroups": page}
+        if token is not None:
+            resp["NextToken"] = token
+        return resp
+
+    def op_create_security_group(self, params):
+        name = params["GroupName"]
+        if any(g["GroupName"] == name for g in self.security_groups.values()):
+            raise FakeError(
+                "InvalidGroup.Duplicate", "the security group '{}' already exists".format(name)
+            )
+
+        group = {
+            "GroupId": self.new_id("sg"),
+            "GroupName": name,
+            "Description": params["Description"],
+            "OwnerId": OWNER_ID,
+            "IpPermissions": [],
+            "IpPermissionsEgress": [],
+            "Tags": [],
+        }
+        self.security_groups[group["GroupId"]] = group
+        return {"GroupId": group["GroupId"]}
+
+    def op_authorize_security_group_ingress(self, params):
+        group = self.find_group(params)
+        for permission in self.ip_permissions(params):
+            if permission in group["IpPermissions"]:
+                raise FakeError(
+                    "InvalidPermission.Duplicate", "the specified rule already exists"
+                )
+            group["IpPermissions"].append(deepcopy(permission))
+        return {}
+
+    def op_revoke_security_group_ingress(self, params):
+        group = self.find_group(params)
+        for permission in self.ip_permissions(params):
+            if permission not in group["IpPermissions"]:
+                raise FakeError(
+                    "InvalidPermission.NotFound", "the specified rule does not exist"
+                )
+            group["IpPermissions"].remove(permission)
+        return {}
+
+    def op_delete_security_group(self, params):
+        group = self.find_group(params)
+        del self.security_groups[group["GroupId"]]
+        return {}
+
+    ##////////////////////////////////////////////////////////////////////
+    ## Launch Template Operations
+    ##////////////////////////////////////////////////////////////////////
+
+    def find_template(self, params):
+        if params.get("LaunchTemplateId"):
+            return select(
+                self.launch_templates, [params["LaunchTemplateId"]],
+                "InvalidLaunchTemplateId.NotFound", "launch template"
+            )[0]
+
+        for template in self.launch_templates.values():
+            if template["LaunchTemplateName"] == params.get("LaunchTemplateName"):
+                return template
+        raise FakeError(
+            "InvalidLaunchTemplateName.NotFoundException",
+            "the launch template '{}' does not exist".format(params.get("LaunchTemplateName"))
+        )
+
+    def template_data(self, spec):
+        """
+        Returns a copy of the data of the launch template version in a
+        LaunchTemplate specification of run_instances.
+        """
+        template = self.find_template(spec)
+        version = spec.get("Version", "$Default")
+        if version == "$Default":
+            version = template["DefaultVersionNumber"]
+        elif version == "$Latest":
+            version = template["LatestVersionNumber"]
+
+        try:
+            return deepcopy(template["Versions"][int(version)])
+        except (KeyError, ValueError):
+            raise FakeError(
+                "InvalidLaunchTemplateId.VersionNotFound",
+                "the launch template version '{}' does not exist".format(version)
+            )
+
+    def summary(self, template):
+        return {
+            key: value for key, value in template.items() if key != "Versions"
+        }
+
+    def op_describe_launch_templates(self, params):
+        templates = select(
+            self.launch_templates, params.get("LaunchTemplateIds"),
+            "InvalidLaunchTemplateId.NotFound", "launch template"
+        )
+        if params.get("LaunchTemplateNames"):
+            templates = [
+                t for t in templates
+                if t["LaunchTemplateName"] in params["LaunchTemplateNames"]
+            ]
+
+        page, token = paginate(templates, params, self.page_size)
+        resp = {"LaunchTemplates": [self.summary(template) for template in page]}
+        if token is not None:
+            resp["NextToken"] = token
+        return resp
+
+    def op_create_launch_template(self, params):
+        name = params["LaunchTemplateName"]
+        if any(t["LaunchTemplateName"] == name for t in self.launch_templates.values()):
+            raise FakeError(
+                "InvalidLaunchTemplateName.AlreadyExistsException",
+                "the launch template '{}' already exists".format(name)
+            )
+
+        template = {
+            "LaunchTemplateId": self.new_id("lt"),
+            "LaunchTemplateName": name,
+            "CreateTime": utcnow(),
+            "CreatedBy": "arn:aws:iam::{}:user/geonet".format(OWNER_ID),
+            "DefaultVersionNumber": 1,
+            "LatestVersionNumber": 1,
+            "Versions": {1: deepcopy(params["LaunchTemplateData"])},
+        }
+        self.launch_templates[template["LaunchTemplateId"]] = template
+        return {"LaunchTemplate": self.summary(template)}
+
+    def op_create_launch_template_version(self, params):
+        template = self.find_template(params)
+        version = template["LatestVersionNumber"] + 1
+        template["Versions"][version] = deepcopy(params["LaunchTemplateData"])
+        template["LatestVersionNumber"] = version
+        return {"LaunchTemplateVersion": {
+            "LaunchTemplateId": template["LaunchTemplateId"],
+            "LaunchTemplateName": template["LaunchTemplateName"],
+            "VersionNumber": version,
+            "VersionDescription": params.get("VersionDescription", ""),
+            "DefaultVersion": False,
+            "CreateTime": utcnow(),
+            "LaunchTemplateData": params["LaunchTemplateData"],
+        }}
+
+    def op_modify_launch_template(self, params):
+        template = self.find_template(params)
+        if params.get("DefaultVersion"):
+            version = int(params["DefaultVersion"])
+            if version not in template["Versions"]:
+                raise FakeError(
+                    "InvalidLaunchTemplateId.VersionNotFound",
+                    "the launch template version '{}' does not exist".format(version)
+                )
+            template["DefaultVersionNumber"] = version
+        return {"LaunchTemplate": self.summary(template)}
+
+    def op_delete_launch_template_versions(self, params):
+        template = self.find_template(params)
+        deleted, failed = [], []
+        for version in params["Versions"]:
+            result = {
+                "LaunchTemplateId": template["LaunchTemplateId"],
+                "LaunchTemplateName": template["LaunchTemplateName"],
+                "VersionNumber": int(version),
+            }
+            if int(version) == template["DefaultVersionNumber"] or int(version) not in template["Versions"]:
+                failed.append(result)
+            else:
+                del template["Versions"][int(version)]
+                deleted.append(result)
+
+        return {
+            "SuccessfullyDeletedLaunchTemplateVersions": deleted,
+            "UnsuccessfullyDeletedLaunchTemplateVersions": failed,
+        }
+
+    ##////////////////////////////////////////////////////////////////////
+    ## Image, Key Pair and Placement Group Operations
+    ##////////////////////////////////////////////////////////////////////
+
+    def op_describe_images(self, params):
+        images = select(
+            self.images, params.get("ImageIds"), "InvalidAMIID.NotFound", "image"
+        )
+        images = [
+            image for image in images
+            if matches(image, params.get("Filters"), {
+                "owner-id": lambda i: [i["OwnerId"]],
+                "name": lambda i: [i["Name"]],
+                "image-id": lambda i: [i["ImageId"]],
+                "state": lambda i: [i["State"]],
+            })
+        ]
+        return {"Images": images}
+
+    def op_describe_key_pairs(self, params):
+        pairs = select(
+            self.key_pairs, params.get("KeyNames"), "InvalidKeyPair.NotFound", "key pair"
+        )
+        return {"KeyPairs": pairs}
+
+    def op_describe_placement_groups(self, params):
+        groups = select(
+            self.placement_groups, params.get("GroupNames"),
+            "InvalidPlacementGroup.Unknown", "placement group"
+        )
+        return {"PlacementGroups": groups}
+
+
+##########################################################################
+## Fake EC2 Service
+##########################################################################
+
+class FakeEC2(object):
+    """
+    An in-process EC2 service made up of fake regions that are created on
+    demand with the keyword arguments of FakeRegion (e.g. latency, page_size,
+    capacity and rate). Use it as a context manager, or call install and
+    uninstall, to make geonet.ec2.connect return clients of the fake.
+
+    Parameters
+    ----------
+    regions : list or dict, default=None
+        The names of the regions to create, or a dict of region names to the
+        keyword arguments of each FakeRegion, which override the defaults.
+
+    kwargs : dict
+        The default keyword arguments of every FakeRegion.
+    """
+
+    def __init__(self, regions=None, **kwargs):
+        self.defaults = kwargs
+        self.regions = OrderedDict()
+        self.lock = threading.Lock()
+        self.previous = None
+        self.session = boto3.session.Session(
+            aws_access_key_id="fake", aws_secret_access_key="fake",
+        )
+
+        if isinstance(regions, dict):
+            for name, options in sorted(regions.items()):
+                self.add_region(name, **options)
+        else:
+            for name in regions or []:
+                self.add_region(name)
+
+    def add_region(self, name, **kwargs):
+        options = dict(self.defaults)
+        options.update(kwargs)
+        with self.lock:
+            region = self.regions[name] = FakeRegion(name, **options)
+        return region
+
+    def __getitem__(self, name):
+        with self.lock:
+            if name in self.regions:
+                return self.regions[name]
+        return self.add_region(name)
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def install(self):
+        """
+        Makes geonet.ec2.connect create clients of the fake.
+        """
+        self.previous = use_client_factory(self.client)
+        return self
+
+    def uninstall(self):
+        use_client_factory(self.previous)
+        self.previous = None
+
+    def client(self, region, **kwargs):
+        """
+        Returns a boto3 EC2 client whose calls are answered by the region.
+        """
+        # Clients share a session so the service model is only loaded once
+        with self.lock:
+            client = self.session.client("ec2", region_name=str(region), **kwargs)
+
+        events = client.meta.events
+        events.register("before-parameter-build.ec2", self.stash_params)
+        events.register("before-call.ec2", self.respond)
+        return client
+
+    @property
+    def calls(self):
+        """
+        Returns the number of calls of each operation made to every region.
+        """
+        calls = Counter()
+        for region in list(self.regions.values()):
+            calls.update(region.calls)
+        return calls
+
+    def reset_calls(self):
+        for region in list(self.regions.values()):
+            with region.lock:
+                region.calls.clear()
+
+    def stash_params(self, params=None, context=None, **kwargs):
+        context[PARAMS] = params
+
+    def respond(self, model=None, context=None, **kwargs):
+        """
+        Answers the request from the region, returning the HTTP response and
+        the parsed response in place of sending the request to AWS.
+        """
+        region = self[context["client_region"]]
+        params = context.pop(PARAMS, None) or {}
+
+        status = 200
+        try:
+            parsed = region.call(xform_name(model.name), params)
+        except FakeError as e:
+            status = e.status
+            parsed = {"Error": {"Code": e.code, "Message": str(e)}}
+
+        size = len(json.dumps(parsed, default=str))
+        parsed["ResponseMetadata"] = {
+            "RequestId": region.new_id("req"),
+            "HTTPStatusCode": status,
+            "HTTPHeaders": {"content-length": str(size)},
+            "RetryAttempts": 0,
+        }
+
+        url = "https://ec2.{}.amazonaws.com/".format(region.name)
+        return AWSResponse(url, status, {"content-length": str(size)}, None), parsed
@@ -0,0 +1,180 @@
+# tests.fake_sshd
+# A local SSH server stand-in for tests of remote commands.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 27 11:04:12 2026 -0400
+#
+# ID: fake_sshd.py [] benjamin@bengfort.com $
+
+"""
+A local SSH server stand-in for tests of remote commands.
+
+The server listens on a random port of localhost, accepts any public key and
+runs the commands of exec requests with the local shell, streaming their
+input, combined output and exit status over the channel. Every user has its
+own home directory in which their commands are run, so hosts with different
+users behave like hosts with their own file systems. It counts the
+connections and commands it has served so that tests can check connections
+are reused. Use it with:
+
+    with FakeSSHD() as sshd:
+        host = Host("alia-1", "127.0.0.1", port=sshd.port, key=sshd.key)
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import shutil
+import socket
+import paramiko
+import tempfile
+import threading
+import subprocess
+
+
+# The host key of the server, generated once since it is slow to generate
+HOST_KEY = paramiko.RSAKey.generate(1024)
+
+
+##########################################################################
+## Fake SSH Server
+##########################################################################
+
+class Handler(paramiko.ServerInterface):
+    """
+    Handles the requests of a single connection to the server.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.username = None
+
+    def get_allowed_auths(self, username):
+        return "publickey"
+
+    def check_auth_publickey(self, username, key):
+        self.username = username
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_forward_agent_request(self, channel):
+        return True
+
+    def check_channel_exec_request(self, channel, command):
+        with self.server.lock:
+            self.server.commands.append(command)
+
+        thread = threading.Thread(target=self.execute, args=(channel, command))
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def execute(self, channel, command):
+        home = self.server.home(self.username)
+        env = dict(os.environ, HOME=home)
+        proc = subprocess.Popen(
+            command, shell=True, cwd=home, env=env, stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+
+        feeder = threading.Thread(target=self.feed, args=(channel, proc))
+        feeder.daemon = True
+        feeder.start()
+
+        try:
+            for line in iter(proc.stdout.readline, ""):
+                channel.sendall(line)
+            channel.send_exit_status(proc.wait())
+        except (socket.error, EOFError):
+            # The client abandoned the command
+            proc.kill()
+        finally:
+            channel.close()
+
+    def feed(self, channel, proc):
+        try:
+            for data in iter(lambda: channel.recv(32768), ""):
+                proc.stdin.write(data)
+            proc.stdin.close()
+        except (socket.error, EOFError, IOError):
+            # The command exited without reading all of its input
+            pass
+
+
+class FakeSSHD(object):
+    """
+    An SSH server on localhost that runs commands with the local shell.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.commands = []
+        self.transports = []
+        self.tmpdir = None
+
+    def start(self):
+        self.tmpdir = tempfile.mkdtemp(prefix="fake-sshd-")
+        self.key = os.path.join(self.tmpdir, "alia.pem")
+        paramiko.RSAKey.generate(1024).write_private_key_file(self.key)
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(100)
+        self.port = self.sock.getsockname()[1]
+
+        thread = threading.Thread(target=self.serve)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except socket.error:
+                return
+
+            transport = paramiko.Transport(conn)
+            transport.add_server_key(HOST_KEY)
+            with self.lock:
+                self.connections += 1
+                self.transports.append(transport)
+            transport.start_server(server=Handler(self))
+
+    def home(self, user):
+        """
+        Returns the home directory of the user, creating it if necessary.
+        """
+        path = os.path.join(self.tmpdir, "home", user)
+        with self.lock:
+            if not os.path.isdir(path):
+                os.makedirs(path)
+        return path
+
+    def disconnect(self):
+        """
+        Drops every open connection as though the hosts were rebooted.
+        """
+        with self.lock:
+            for transport in self.transports:
+                transport.close()
+            self.transports = []
+
+    def stop(self):
+        self.sock.close()
+        self.disconnect()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
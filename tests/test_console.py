@@ -0,0 +1,152 @@
+# tests.test_console
+# Tests for the command line utility and lazy command loading
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Wed Oct 21 09:12:40 2026 -0400
+#
+# ID: test_console.py [] benjamin@bengfort.com $
+
+"""
+Tests for the command line utility and lazy command loading
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import sys
+import pytest
+import subprocess
+
+from geonet.console import *
+from geonet.commands import COMMANDS, load_command
+
+
+# Modules that must not be imported just to list the commands
+HEAVY_MODULES = (
+    "boto3", "requests", "numpy", "paramiko", "tabulate", "yaml", "geonet.region",
+)
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def startup_modules(*args):
+    """
+    Runs the console with the arguments in a fresh interpreter, returning
+    the modules imported by the time it exits.
+    """
+    script = (
+        "import sys; sys.argv = ['geonet'] + sys.argv[1:]\n"
+        "from geonet.console import main\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass\n"
+        "sys.stderr.write('\\n' + ','.join(sorted(sys.modules)))"
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-c", script] + list(args),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    _, modules = proc.communicate()
+    return set(modules.decode("utf-8").strip().splitlines()[-1].split(","))
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+@pytest.mark.parametrize("name,path,help", COMMANDS)
+def test_manifest(name, path, help):
+    """
+    Test the command manifest matches the command classes
+    """
+    command = load_command(path)
+    assert command.name == name
+    assert command.help == help
+
+
+def test_startup_imports():
+    """
+    Test listing the commands does not import heavy libraries
+    """
+    # The startup time of geonet --help is dominated by these imports, which
+    # are checked rather than timed since timings are noisy on loaded hosts.
+    for args in ((), ("--help",)):
+        modules = startup_modules(*args)
+        assert "geonet.console" in modules
+        for module in HEAVY_MODULES:
+            assert module not in modules
+
+
+class TestGeoNetUtility(object):
+    """
+    GeoNetUtility should
+    """
+
+    def test_lazy_commands(self):
+        """
+        register lazy commands from the manifest
+        """
+        utility = GeoNetUtility.load()
+        assert len(utility.commands) == len(COMMANDS)
+        for command in utility.commands.values():
+            assert isinstance(command, LazyCommand)
+            assert command.command is None
+
+    def test_prepare(self):
+        """
+        load only the invoked command and parse its arguments
+        """
+        utility = GeoNetUtility.load()
+        argv = ["latency:relays", "-t", "5", "dataset"]
+        assert utility.prepare(argv) == "latency:relays"
+
+        relays = utility.commands["latency:relays"]
+        assert relays.command is not None
+        assert utility.commands["latency:tiers"].command is None
+
+        args = utility.parser.parse_args(argv)
+        assert args.threshold == 5.0
+        assert args.dataset == "dataset"
+        assert args.func == relays.command.handle
+
+    def test_prepare_unknown(self):
+        """
+        not load a command if none was specified
+        """
+        utility = GeoNetUtility.load()
+        assert utility.prepare(["--help"]) is None
+        assert utility.prepare(["unknown"]) is None
+        assert all(command.command is None for command in utility.commands.values())
+
+    def test_stats_options(self):
+        """
+        accept the global stats options before the command
+        """
+        utility = GeoNetUtility.load()
+        argv = ["--stats", "--stats-out", "list", "latency:relays", "dataset"]
+        assert utility.prepare(argv) == "latency:relays"
+
+        args = utility.parser.parse_args(argv)
+        assert args.stats is True
+        assert args.stats_out == "list"
+
+    def test_profile_options(self):
+        """
+        accept the global profile options before the command
+        """
+        utility = GeoNetUtility.load()
+        argv = ["--profile", "status", "--memprofile", "latency:relays", "dataset"]
+        assert utility.prepare(argv) == "latency:relays"
+
+        args = utility.parser.parse_args(argv)
+        assert args.profile == "status"
+        assert args.memprofile is True
+
+    def test_register_duplicate(self):
+        """
+        not register the same command twice
+        """
+        utility = GeoNetUtility.load()
+        with pytest.raises(ConsoleError):
+            utility.register(COMMANDS[0])
@@ -0,0 +1,235 @@
+# tests.test_daemon
+# Tests for the inventory daemon and its client
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Sat Oct 24 12:05:41 2026 -0400
+#
+# ID: test_daemon.py [] benjamin@bengfort.com $
+
+"""
+Tests for the inventory daemon and its client
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import time
+import pytz
+import stat
+import pytest
+import threading
+
+from datetime import datetime
+from geonet.daemon import *
+from geonet.inventory import *
+from geonet.region import Region
+
+from tests.fake_ec2 import FakeEC2
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture
+def fake():
+    with FakeEC2(["us-east-1", "eu-west-1"]) as fake:
+        fake["us-east-1"].add_instances(3)
+        fake["eu-west-1"].add_instances(2)
+        yield fake
+
+
+@pytest.fixture
+def server(fake, tmpdir, monkeypatch):
+    """
+    Serves an inventory on a temporary socket used by the geonet daemon client.
+    """
+    path = str(tmpdir.join("daemon.sock"))
+    server = InventoryServer(Inventory(interval=0.1), path)
+    thread = threading.Thread(target=server.serve, kwargs={"tick": 0.05})
+    thread.start()
+
+    monkeypatch.setattr(daemon, "path", path)
+    yield server
+
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_protocol():
+    """
+    Test timezone aware datetimes survive encoding and decoding
+    """
+    launched = datetime(2026, 10, 24, 12, 1, 2, 345000, tzinfo=pytz.utc)
+    message = {"result": {"LaunchTime": launched, "State": {"Name": "running"}}}
+
+    line = encode(message)
+    assert line.endswith("\n") and "\n" not in line[:-1]
+    assert decode(line) == message
+
+
+class TestInventory(object):
+    """
+    Inventory should
+    """
+
+    def test_read_through(self, fake):
+        """
+        call EC2 only on a miss
+        """
+        inventory = Inventory()
+        for _ in range(3):
+            resp = inventory.describe("us-east-1", "describe_instances")
+            assert len(resp["Reservations"][0]["Instances"]) == 3
+
+        assert fake.calls["describe_instances"] == 1
+        assert inventory.hits == 2 and inventory.misses == 1
+
+        # Different parameters are separate calls
+        inventory.describe("us-east-1", "describe_instances", {"MaxResults": 5})
+        assert fake.calls["describe_instances"] == 2
+        assert len(inventory) == 2
+
+        with pytest.raises(ValueError):
+            inventory.describe("us-east-1", "terminate_instances")
+
+    def test_adaptive_polling(self, fake):
+        """
+        back off polling unchanged responses and reset when they change
+        """
+        inventory = Inventory(interval=1)
+        inventory.describe("us-east-1", "describe_instances")
+        inventory.describe("us-east-1", "describe_key_pairs")
+
+        entries = dict((key[1], entry) for key, entry in inventory.entries.items())
+        instances = entries["describe_instances"]
+        assert instances.interval == 1
+        assert entries["describe_key_pairs"].interval == SLOW_FACTOR
+
+        for expected in (2, 4, 8, 8):
+            instances.due = 0
+            inventory.poll()
+            assert instances.interval == expected
+
+        fake["us-east-1"].add_instances(1)
+        instances.due = 0
+        inventory.poll()
+        assert instances.interval == 1
+        assert len(instances.response["Reservations"]) == 2
+
+    def test_expire_invalidate(self, fake):
+        """
+        drop calls that expire or whose region is invalidated
+        """
+        inventory = Inventory(expires=60)
+        for region in ("us-east-1", "eu-west-1"):
+            inventory.describe(region, "describe_instances")
+            inventory.describe(region, "describe_volumes")
+
+        inventory.invalidate("eu-west-1")
+        assert len(inventory) == 2
+        assert all(key[0] == "us-east-1" for key in inventory.entries)
+
+        for entry in inventory.entries.values():
+            entry.accessed -= 120
+        assert inventory.poll() == 0
+        assert len(inventory) == 0
+
+    def test_poll_errors(self, fake, monkeypatch):
+        """
+        keep polling when a region cannot be reached
+        """
+        inventory = Inventory()
+        inventory.describe("us-east-1", "describe_instances")
+        entry = list(inventory.entries.values())[0]
+
+        def unreachable(**kwargs):
+            raise IOError("could not connect")
+
+        conn = inventory.region("us-east-1").conn
+        monkeypatch.setattr(conn, "describe_instances", unreachable)
+        entry.due = 0
+        assert inventory.poll() == 1
+        assert inventory.errors == 1
+        assert entry.due > time.time()
+
+
+class TestDaemon(object):
+    """
+    The daemon should
+    """
+
+    def test_region_describe(self, fake, server):
+        """
+        serve region describe calls from its inventory
+        """
+        region = Region({"RegionName": "us-east-1"})
+        for _ in range(3):
+            instances = region.instances()
+            assert len(instances) == 3
+            assert all(isinstance(i["LaunchTime"], datetime) for i in instances)
+
+        assert fake.calls["describe_instances"] == 1
+        assert server.inventory.hits == 2
+
+        # The inventory is refreshed in the background
+        fake["us-east-1"].add_instances(2)
+        time.sleep(0.4)
+        assert len(region.instances()) == 5
+
+    def test_invalidate(self, fake, server, monkeypatch):
+        """
+        drop the inventory of a region when its resources are changed
+        """
+        # Only count describe calls made after the inventory is invalidated
+        monkeypatch.setattr(server.inventory, "interval", 60)
+        region = Region({"RegionName": "eu-west-1"})
+        instances = region.instances()
+        assert len(instances) == 2
+
+        region.conn.terminate_instances(InstanceIds=[instances[0]["InstanceId"]])
+        assert len(server.inventory) == 0
+        assert fake.calls["describe_instances"] == 1
+
+        region.instances()
+        assert fake.calls["describe_instances"] == 2
+
+    def test_status(self, server):
+        """
+        report its status and refuse to start twice
+        """
+        assert daemon.request("ping") == "pong"
+        assert daemon.request("status")["pid"] == os.getpid()
+        assert stat.S_IMODE(os.stat(daemon.path).st_mode) == 0o600
+
+        with pytest.raises(DaemonError):
+            daemon.request("missing")
+
+        with pytest.raises(DaemonError):
+            InventoryServer(Inventory(), daemon.path)
+
+    def test_fallback(self, fake, tmpdir):
+        """
+        fall back to direct calls when the daemon is not running
+        """
+        path = str(tmpdir.join("daemon.sock"))
+        client = DaemonClient(path)
+        assert not client.available()
+        assert client.describe("us-east-1", "describe_instances", {}) is None
+
+        with pytest.raises(DaemonError):
+            client.request("ping")
+
+        # A stale socket is replaced by a new daemon
+        open(path, "w").close()
+        assert client.describe("us-east-1", "describe_instances", {}) is None
+        server = InventoryServer(Inventory(), path)
+        server.server_close()
+        assert not os.path.exists(path)
@@ -0,0 +1,268 @@
+# tests.test_distribute
+# Tests for distributing artifacts through a seed replica per region
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Thu Oct 29 11:02:18 2026 -0400
+#
+# ID: test_distribute.py [] benjamin@bengfort.com $
+
+"""
+Tests for distributing artifacts through a seed replica per region
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import time
+import pytest
+import threading
+
+from geonet.distribute import *
+from geonet.remote import Host, Result, ConnectionPool
+from geonet.console import GeoNetUtility
+
+from tests.fake_sshd import FakeSSHD
+
+
+# Copies between the home directories of the users of the fake SSH server
+COPY = "cp {path} ../{user}/{tmp}"
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture
+def sshd():
+    with FakeSSHD() as sshd:
+        yield sshd
+
+
+@pytest.fixture
+def artifact(tmpdir):
+    path = tmpdir.join("alia")
+    path.write("#!/bin/sh\necho alia v1.0\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def make_fleet(sshd, regions=(("us-east-1", 4), ("eu-west-1", 3))):
+    """
+    Returns hosts in the regions with their own home directory (user).
+    """
+    return [
+        Host(
+            "{}-{}".format(region, idx), "127.0.0.1", user="{}-{}".format(region, idx),
+            port=sshd.port, key=sshd.key, region=region,
+        )
+        for region, count in regions
+        for idx in range(count)
+    ]
+
+
+def installed(sshd, host, path="bin/alia"):
+    path = os.path.join(sshd.home(host.user), path)
+    if not os.path.exists(path):
+        return None
+    return sha256(path)
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_by_region():
+    """
+    Test hosts are grouped by region with hosts without a region together
+    """
+    hosts = [
+        Host("a", "a", region="us-east-1"), Host("b", "b"),
+        Host("c", "c", region="eu-west-1"), Host("d", "d", region="us-east-1"),
+    ]
+    groups = by_region(hosts)
+    assert [(region, [str(host) for host in group]) for region, group in groups] == [
+        (None, ["b"]), ("eu-west-1", ["c"]), ("us-east-1", ["a", "d"]),
+    ]
+
+
+class TestDistribution(object):
+    """
+    Distribution should
+    """
+
+    def test_distribute(self, sshd, artifact):
+        """
+        upload once per region and copy between the replicas of the region
+        """
+        pool = ConnectionPool()
+        hosts = make_fleet(sshd)
+        regions = []
+
+        try:
+            distribution = Distribution(
+                artifact, "bin/alia", pool=pool, copy=COPY,
+                callback=lambda region, results: regions.append(region),
+            )
+            results = distribution.run(hosts)
+        finally:
+            pool.close()
+
+        assert all(result.ok for result in results)
+        assert sorted(regions) == ["eu-west-1", "us-east-1"]
+        assert distribution.uploads == 2
+        assert [result.output for result in results].count("uploaded") == 2
+        assert [result.output for result in results].count("copied") == 5
+
+        # The copies are made in rounds from every replica that has it
+        assert len([cmd for cmd in sshd.commands if cmd.startswith("cp ")]) == 5
+
+        for host in hosts:
+            assert installed(sshd, host) == distribution.digest
+            path = os.path.join(sshd.home(host.user), "bin", "alia")
+            assert os.stat(path).st_mode & 0o777 == 0o755
+            assert os.listdir(os.path.dirname(path)) == ["alia"]
+
+    def test_up_to_date(self, sshd, artifact):
+        """
+        skip replicas with the artifact and seed their regions from them
+        """
+        pool = ConnectionPool()
+        hosts = make_fleet(sshd)
+
+        try:
+            Distribution(artifact, "bin/alia", pool=pool, copy=COPY).run(hosts[-1:])
+            sshd.commands[:] = []
+
+            distribution = Distribution(artifact, "bin/alia", pool=pool, copy=COPY)
+            results = distribution.run(hosts)
+        finally:
+            pool.close()
+
+        assert all(result.ok for result in results)
+        assert results[-1].output == "up to date"
+        assert distribution.uploads == 1
+        assert len([cmd for cmd in sshd.commands if "cat >" in cmd]) == 1
+
+    def test_hash_mismatch(self, sshd, artifact):
+        """
+        not install copies whose hash does not match the artifact
+        """
+        pool = ConnectionPool()
+        hosts = make_fleet(sshd, [("us-east-1", 2)])
+        corrupt = "echo corrupt > ../{user}/{tmp}"
+
+        try:
+            results = Distribution(artifact, "bin/alia", pool=pool, copy=corrupt).run(hosts)
+        finally:
+            pool.close()
+
+        assert results[0].ok and results[0].output == "uploaded"
+        assert not results[1].ok
+        assert results[1].summary() == "exit 1: sha256 mismatch"
+        assert installed(sshd, hosts[1]) is None
+        assert os.listdir(os.path.join(sshd.home(hosts[1].user), "bin")) == []
+
+        # The failed copy was retried once
+        assert len([cmd for cmd in sshd.commands if cmd.startswith("echo corrupt")]) == 2
+
+
+    def test_seed_failure(self, sshd, artifact):
+        """
+        copy the artifact to a host whose upload failed once the region is seeded
+        """
+        pool = ConnectionPool()
+        hosts = make_fleet(sshd, [("us-east-1", 3)])
+        distribution = Distribution(artifact, "bin/alia", pool=pool, copy=COPY)
+
+        upload = distribution.upload
+
+        def flaky_upload(host):
+            if distribution.uploads == 0:
+                distribution.uploads += 1
+                return Result(host, error="connection reset")
+            return upload(host)
+
+        distribution.upload = flaky_upload
+        try:
+            results = distribution.run(hosts)
+        finally:
+            pool.close()
+
+        assert all(result.ok for result in results)
+        assert [result.output for result in results] == ["copied", "uploaded", "copied"]
+        assert distribution.uploads == 2
+        for host in hosts:
+            assert installed(sshd, host) == distribution.digest
+
+
+    def test_width(self, sshd, artifact):
+        """
+        copy to at most width hosts at once across all of the regions
+        """
+        pool = ConnectionPool()
+        hosts = make_fleet(sshd, [("us-east-1", 5), ("eu-west-1", 5), ("ap-south-1", 5)])
+        distribution = Distribution(artifact, "bin/alia", pool=pool, width=2, copy=COPY)
+
+        lock, active, peak = threading.Lock(), [0], [0]
+        copy_to = distribution.copy_to
+
+        def counted(source, target):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            try:
+                return copy_to(source, target)
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        distribution.copy_to = counted
+        try:
+            results = distribution.run(hosts)
+        finally:
+            pool.close()
+
+        assert all(result.ok for result in results)
+        assert peak[0] == 2
+
+    def test_retry_source(self, sshd, artifact):
+        """
+        retry a failed copy from a different host than the one that failed
+        """
+        pool = ConnectionPool()
+        hosts = make_fleet(sshd, [("us-east-1", 4)])
+        distribution = Distribution(artifact, "bin/alia", pool=pool, copy=COPY)
+
+        copies = []
+        copy_to = distribution.copy_to
+
+        def flaky(source, target):
+            copies.append((source.name, target.name))
+            if source is hosts[0] and target is hosts[2]:
+                return Result(target, error="copy failed")
+            return copy_to(source, target)
+
+        distribution.copy_to = flaky
+        try:
+            results = distribution.run(hosts)
+        finally:
+            pool.close()
+
+        assert all(result.ok for result in results)
+        retries = [copy for copy in copies if copy[1] == hosts[2].name]
+        assert len(retries) == 2 and retries[1][0] != hosts[0].name
+
+
+def test_distribute_command():
+    """
+    Test the distribute command parses the source before the destination
+    """
+    utility = GeoNetUtility.load()
+    argv = ["distribute", "-c", "geonet.config", "-H", "alia-1", "build/alia", "bin/alia"]
+    utility.prepare(argv)
+    args = utility.parser.parse_args(argv)
+    assert (args.local, args.remote) == ("build/alia", "bin/alia")
+    assert args.hosts == ["alia-1"]
@@ -0,0 +1,301 @@
+# tests.test_fake_ec2
+# Tests for the in-process fake EC2 service
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Thu Oct 22 11:32:50 2026 -0400
+#
+# ID: test_fake_ec2.py [] benjamin@bengfort.com $
+
+"""
+Tests for the in-process fake EC2 service
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import time
+import pytest
+
+from botocore.exceptions import ClientError
+
+from geonet import ec2
+from geonet.region import Region, Regions
+from geonet.utils.stats import CallRecorder
+
+from tests.fake_ec2 import *
+
+
+REGIONS = ["us-east-1", "eu-west-1", "ap-southeast-2"]
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture
+def fake():
+    with FakeEC2(REGIONS) as fake:
+        yield fake
+
+
+def error_code(excinfo):
+    return excinfo.value.response["Error"]["Code"]
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_paginate():
+    """
+    Test pages are limited by MaxResults and the page size
+    """
+    items = list(range(10))
+    assert paginate(items, {}) == (items, None)
+    assert paginate(items, {}, page_size=4) == ([0, 1, 2, 3], "4")
+    assert paginate(items, {"NextToken": "8"}, page_size=4) == ([8, 9], None)
+    assert paginate(items, {"MaxResults": 6}, page_size=4) == ([0, 1, 2, 3], "4")
+    assert paginate(items, {"MaxResults": 3, "NextToken": "3"}) == ([3, 4, 5], "6")
+
+
+def test_matches():
+    """
+    Test filtering resources by fields, tags and wildcards
+    """
+    instance = {"InstanceId": "i-1", "Tags": [{"Key": "Name", "Value": "alia-virginia-1"}]}
+    fields = {"instance-id": lambda i: [i["InstanceId"]]}
+
+    assert matches(instance, None, fields)
+    assert matches(instance, [{"Name": "tag:Name", "Values": ["alia-*"]}], fields)
+    assert matches(instance, [{"Name": "tag-key", "Values": ["Name"]}], fields)
+    assert not matches(instance, [{"Name": "instance-id", "Values": ["i-2"]}], fields)
+
+    with pytest.raises(FakeError):
+        matches(instance, [{"Name": "unknown", "Values": ["x"]}], fields)
+
+
+class TestFakeEC2(object):
+    """
+    FakeEC2 should
+    """
+
+    def test_install(self):
+        """
+        replace the clients created by geonet.ec2.connect
+        """
+        fake = FakeEC2()
+        fake["us-east-1"].add_instances(3)
+
+        with fake:
+            region = Region({"RegionName": "us-east-1"})
+            assert len(region.instances()) == 3
+            assert fake.calls["describe_instances"] == 1
+
+        assert ec2._client_factory is None
+
+    def test_instances(self, fake):
+        """
+        describe the instances of every region
+        """
+        for idx, name in enumerate(REGIONS):
+            fake[name].add_instances(idx + 1)
+
+        regions = Regions([{"RegionName": name} for name in REGIONS])
+        instances = regions.instances(status=True)
+        assert len(instances) == 6
+        assert all(instance.state == "running" for instance in instances)
+        assert all(instance.status["InstanceStatus"]["Status"] == "ok" for instance in instances)
+        assert len(set(str(instance) for instance in instances)) == 6
+
+        instance = instances[0]
+        assert instance.zone.startswith(str(instance.region))
+        assert instance.hostname.endswith(".compute.amazonaws.com")
+        assert instance.uptime() is not None
+
+    def test_filters(self, fake):
+        """
+        filter instances by state and by id
+        """
+        region = fake["us-east-1"]
+        running = region.add_instances(3)
+        stopped = region.add_instances(2, state="stopped")
+
+        conn = ec2.connect("us-east-1")
+        resp = conn.describe_instances(Filters=[
+            {"Name": "instance-state-name", "Values": ["stopped"]}
+        ])
+        ids = [i["InstanceId"] for r in resp["Reservations"] for i in r["Instances"]]
+        assert ids == stopped
+
+        resp = conn.describe_instances(InstanceIds=running[:2])
+        ids = [i["InstanceId"] for r in resp["Reservations"] for i in r["Instances"]]
+        assert ids == running[:2]
+
+        with pytest.raises(ClientError) as excinfo:
+            conn.describe_instances(InstanceIds=["i-missing"])
+        assert error_code(excinfo) == "InvalidInstanceID.NotFound"
+
+    def test_pagination(self):
+        """
+        return pages of results limited by the page size
+        """
+        with FakeEC2(page_size=40) as fake:
+            fake["us-east-1"].add_instances(100)
+            conn = ec2.connect("us-east-1")
+
+            pages = list(conn.get_paginator("describe_instances").paginate())
+            sizes = [sum(len(r["Instances"]) for r in page["Reservations"]) for page in pages]
+            assert sizes == [40, 40, 20]
+
+            resp = conn.describe_instances(MaxResults=10)
+            assert sum(len(r["Instances"]) for r in resp["Reservations"]) == 10
+            assert resp["NextToken"] == "10"
+
+    def test_lifecycle(self, fake):
+        """
+        launch, tag, stop, start and terminate instances from a template
+        """
+        conn = ec2.connect("eu-west-1")
+        image = fake["eu-west-1"].add_image("alia-image")
+        conn.create_launch_template(LaunchTemplateName="alia", LaunchTemplateData={
+            "ImageId": image, "InstanceType": "t2.micro", "KeyName": "alia",
+            "TagSpecifications": [{"ResourceType": "instance", "Tags": [{"Key": "Service", "Value": "Alia"}]}],
+        })
+        template = conn.describe_launch_templates()["LaunchTemplates"][0]
+
+        resp = conn.run_instances(
+            MinCount=2, MaxCount=2,
+            LaunchTemplate={"LaunchTemplateId": template["LaunchTemplateId"]},
+        )
+        ids = [instance["InstanceId"] for instance in resp["Instances"]]
+        assert all(instance["State"]["Name"] == "pending" for instance in resp["Instances"])
+        assert all(instance["ImageId"] == image for instance in resp["Instances"])
+
+        conn.create_tags(Resources=ids[:1], Tags=[{"Key": "Name", "Value": "alia-1"}])
+        region = Region({"RegionName": "eu-west-1"}, conn=conn)
+        instances = region.instances()
+        assert [instance.state for instance in instances] == ["running", "running"]
+        assert instances[0].name == "alia-1"
+        assert instances[0]["KeyName"] == "alia"
+
+        resp = conn.stop_instances(InstanceIds=ids)
+        assert [c["CurrentState"]["Name"] for c in resp["StoppingInstances"]] == ["stopping"] * 2
+        assert [instance.state for instance in region.instances()] == ["stopped"] * 2
+        resp = conn.start_instances(InstanceIds=ids)
+        assert [c["PreviousState"]["Name"] for c in resp["StartingInstances"]] == ["stopped"] * 2
+
+        conn.terminate_instances(InstanceIds=ids)
+        assert [instance.state for instance in region.instances()] == ["terminated"] * 2
+
+        with pytest.raises(ClientError) as excinfo:
+            conn.stop_instances(InstanceIds=ids)
+        assert error_code(excinfo) == "IncorrectInstanceState"
+
+    def test_launch_templates(self, fake):
+        """
+        version launch templates
+        """
+        conn = ec2.connect("us-east-1")
+        conn.create_launch_template(LaunchTemplateName="alia", LaunchTemplateData={"ImageId": "ami-1"})
+        for image in ("ami-2", "ami-3"):
+            conn.create_launch_template_version(LaunchTemplateName="alia", LaunchTemplateData={"ImageId": image})
+
+        resp = conn.modify_launch_template(LaunchTemplateName="alia", DefaultVersion="3")
+        assert resp["LaunchTemplate"]["LatestVersionNumber"] == 3
+
+        resp = conn.run_instances(MinCount=1, MaxCount=1, LaunchTemplate={"LaunchTemplateName": "alia"})
+        assert resp["Instances"][0]["ImageId"] == "ami-3"
+
+        resp = conn.delete_launch_template_versions(LaunchTemplateName="alia", Versions=["2", "3"])
+        assert len(resp["SuccessfullyDeletedLaunchTemplateVersions"]) == 1
+        assert len(resp["UnsuccessfullyDeletedLaunchTemplateVersions"]) == 1
+
+    def test_security_groups(self, fake):
+        """
+        create, authorize, revoke and delete security groups
+        """
+        conn = ec2.connect("us-east-1")
+        group = conn.create_security_group(GroupName="alia", Description="alia")["GroupId"]
+
+        rule = dict(GroupName="alia", FromPort=22, ToPort=22, CidrIp="0.0.0.0/0", IpProtocol="tcp")
+        conn.authorize_security_group_ingress(**rule)
+        with pytest.raises(ClientError) as excinfo:
+            conn.authorize_security_group_ingress(**rule)
+        assert error_code(excinfo) == "InvalidPermission.Duplicate"
+
+        groups = Region({"RegionName": "us-east-1"}, conn=conn).security_groups()
+        assert list(groups[group].open_ports()) == [22]
+
+        conn.revoke_security_group_ingress(**rule)
+        conn.delete_security_group(GroupName="alia")
+        assert conn.describe_security_groups()["SecurityGroups"] == []
+
+        with pytest.raises(ClientError) as excinfo:
+            conn.create_security_group(GroupName="alia", Description="alia")
+            conn.create_security_group(GroupName="alia", Description="alia")
+        assert error_code(excinfo) == "InvalidGroup.Duplicate"
+
+    def test_capacity(self):
+        """
+        fail launches beyond the capacity of the region
+        """
+        with FakeEC2(capacity=5) as fake:
+            fake["us-east-1"].add_instances(3)
+            conn = ec2.connect("us-east-1")
+
+            resp = conn.run_instances(ImageId="ami-1", MinCount=1, MaxCount=10)
+            assert len(resp["Instances"]) == 2
+
+            with pytest.raises(ClientError) as excinfo:
+                conn.run_instances(ImageId="ami-1", MinCount=1, MaxCount=1)
+            assert error_code(excinfo) == "InsufficientInstanceCapacity"
+
+    def test_throttling(self):
+        """
+        throttle requests beyond the rate limit
+        """
+        with FakeEC2({"us-east-1": {"rate": 0.001, "burst": 2}}) as fake:
+            conn = ec2.connect("us-east-1")
+            conn.describe_instances()
+            conn.describe_instances()
+
+            with pytest.raises(ClientError) as excinfo:
+                conn.describe_instances()
+            assert error_code(excinfo) == "RequestLimitExceeded"
+            assert fake.calls["describe_instances"] == 3
+
+            # Other regions are not throttled
+            for _ in range(5):
+                ec2.connect("eu-west-1").describe_instances()
+
+    def test_latency(self):
+        """
+        delay calls by the region's latency distribution
+        """
+        with FakeEC2(REGIONS, latency=constant(0.05)) as fake:
+            conn = ec2.connect("us-east-1")
+            recorder = CallRecorder()
+            recorder.instrument(conn)
+
+            started = time.time()
+            conn.describe_instances()
+            assert time.time() - started >= 0.05
+
+            record = list(recorder)[0]
+            assert record["duration"] >= 50
+            assert record["status"] == 200
+            assert record["size"] > 0
+
+            fake.reset_calls()
+            assert sum(fake.calls.values()) == 0
+
+    def test_seeded_latency(self):
+        """
+        draw repeatable latencies for each region
+        """
+        draws = []
+        for _ in range(2):
+            region = FakeRegion("us-east-1", latency=lognormal(0.1))
+            draws.append([region.latency(region.rng) for _ in range(5)])
+        assert draws[0] == draws[1]
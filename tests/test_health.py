@@ -0,0 +1,228 @@
+# tests.test_health
+# Tests for the circuit breakers of region endpoints
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 26 15:20:44 2026 -0400
+#
+# ID: test_health.py [] benjamin@bengfort.com $
+
+"""
+Tests for the circuit breakers of region endpoints
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import json
+import time
+import socket
+import pytest
+import geonet.health
+import geonet.region
+import geonet.managed
+
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from geonet.health import *
+from geonet.region import Region, Regions
+from geonet.utils.timez import utcnow
+from geonet.utils.serialize import Encoder
+from geonet.console import GeoNetUtility
+from geonet.exceptions import RegionUnavailable
+
+from tests.fake_ec2 import FakeEC2
+
+
+def client_error(code, status):
+    return ClientError({
+        "Error": {"Code": code, "Message": "error"},
+        "ResponseMetadata": {"HTTPStatusCode": status},
+    }, "DescribeInstances")
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture
+def regional(monkeypatch):
+    """
+    A region in a fake EC2 with the health of the regions replaced.
+    """
+    health = Health(None, min_calls=2, cooldown=0.1)
+    monkeypatch.setattr(geonet.health, "health", health)
+    monkeypatch.setattr(geonet.region, "health", health)
+
+    with FakeEC2(["us-east-1"]) as fake:
+        fake["us-east-1"].add_instances(2)
+        yield Region({"RegionName": "us-east-1"}), health
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_is_unhealthy():
+    """
+    Test degraded endpoints are distinguished from invalid requests
+    """
+    assert is_unhealthy(socket.timeout("timed out"))
+    assert is_unhealthy(EndpointConnectionError(endpoint_url="https://ec2"))
+    assert is_unhealthy(client_error("InternalError", 500))
+    assert is_unhealthy(client_error("RequestLimitExceeded", 503))
+    assert not is_unhealthy(client_error("InvalidInstanceID.NotFound", 400))
+    assert not is_unhealthy(KeyError("Reservations"))
+
+
+class TestHealth(object):
+    """
+    Health should
+    """
+
+    def test_circuit(self):
+        """
+        open the circuit of an unhealthy region and probe it to close it
+        """
+        health = Health(None, min_calls=4, threshold=0.5, cooldown=0.1)
+        error = socket.timeout("timed out")
+
+        for failed in (True, False, True):
+            health.failure("us-east-1", error) if failed else health.success("us-east-1")
+            assert health.allow("us-east-1")
+
+        health.failure("us-east-1", error)
+        assert health.state("us-east-1") == OPEN
+        assert not health.allow("us-east-1")
+        assert health.status() == {"us-east-1": OPEN}
+
+        # Only one probe is let through once the cooldown has passed
+        time.sleep(0.1)
+        assert health.allow("us-east-1")
+        assert health.state("us-east-1") == HALF_OPEN
+        assert not health.allow("us-east-1")
+
+        # A failed probe doubles the cooldown
+        health.failure("us-east-1", error)
+        assert health.state("us-east-1") == OPEN
+        assert health.circuit("us-east-1").cooldown == 0.2
+
+        time.sleep(0.2)
+        assert health.allow("us-east-1")
+        health.success("us-east-1")
+        assert health.state("us-east-1") == CLOSED
+        assert health.circuit("us-east-1").failures == []
+
+    def test_persist(self, tmpdir):
+        """
+        keep the circuits between runs
+        """
+        path = str(tmpdir.join("health.json"))
+        health = Health(path, min_calls=1)
+        health.failure("ap-south-1", socket.timeout("timed out"))
+        health.success("eu-west-1")
+        health.dump()
+
+        loaded = Health(path)
+        assert loaded.state("ap-south-1") == OPEN
+        assert not loaded.allow("ap-south-1")
+        assert loaded.circuit("ap-south-1").error == "timeout: timed out"
+        assert loaded.circuit("eu-west-1").failures == [False]
+
+        tmpdir.join("health.json").write("{not json")
+        assert Health(path).status() == {}
+
+    def test_region_describe(self, regional, monkeypatch, capsys):
+        """
+        skip an unhealthy region and report that it was skipped
+        """
+        region, health = regional
+        calls = []
+
+        def unreachable(**kwargs):
+            calls.append(kwargs)
+            raise socket.timeout("timed out")
+
+        monkeypatch.setattr(region.conn, "describe_instances", unreachable)
+        for _ in range(3):
+            assert len(region.instances()) == 0
+
+        # The circuit opened after two calls so the third was not made
+        assert len(calls) == 2
+        assert health.state(region) == OPEN
+
+        GeoNetUtility().report_health()
+        assert "us-east-1 skipped: region is unhealthy (timeout: timed out)" in capsys.readouterr()[1]
+        assert health.report() == []
+
+        # Operations without an empty response raise an error instead
+        with pytest.raises(RegionUnavailable):
+            region.describe("describe_account_attributes")
+
+        # The region is restored once a probe succeeds
+        monkeypatch.undo()
+        monkeypatch.setattr(geonet.health, "health", health)
+        monkeypatch.setattr(geonet.region, "health", health)
+        time.sleep(0.1)
+        assert len(region.instances()) == 2
+        assert health.state(region) == CLOSED
+
+    def test_invalid_requests(self, regional, monkeypatch):
+        """
+        raise errors of invalid requests without opening the circuit
+        """
+        region, health = regional
+
+        def invalid(**kwargs):
+            raise client_error("InvalidInstanceID.NotFound", 400)
+
+        monkeypatch.setattr(region.conn, "describe_instances", invalid)
+        for _ in range(3):
+            with pytest.raises(ClientError):
+                region.instances()
+        assert health.state(region) == CLOSED
+
+    def test_table_footer(self, capsys):
+        """
+        mark the regions served from cache and list the skipped regions
+        """
+        health = Health(None)
+        assert health.label("us-east-1") == "us-east-1"
+        assert health.footer() is None
+
+        health.skip("us-east-1", cached=True)
+        health.skip("eu-west-1")
+        assert health.label(Region({"RegionName": "us-east-1"})) == "us-east-1*"
+        assert health.label("eu-west-1") == "eu-west-1"
+        assert health.footer().split("\n") == [
+            "* served from cache, region is unhealthy: us-east-1",
+            "not listed, region is unhealthy: eu-west-1",
+        ]
+
+    def test_status_footer(self, tmpdir, monkeypatch, capsys):
+        """
+        note the unhealthy regions under the status table
+        """
+        regions = str(tmpdir.join("regions.json"))
+        Regions([{"RegionName": "us-east-1"}]).dump(regions)
+        monkeypatch.setattr(geonet.region, "REGIONDATA", regions)
+        monkeypatch.setattr(geonet.managed, "INSTANCES", str(tmpdir.join("instances.json")))
+
+        with FakeEC2(["us-east-1"]) as fake:
+            ids = fake["us-east-1"].add_instances(2)
+            with open(geonet.managed.INSTANCES, 'w') as f:
+                json.dump({"updated": utcnow(), "instances": {"us-east-1": ids}}, f, cls=Encoder)
+
+            geonet.health.health.skip("us-east-1", cached=True)
+            geonet.health.health.skip("eu-west-1")
+
+            utility = GeoNetUtility.load()
+            utility.prepare(["status"])
+            args = utility.parser.parse_args(["status"])
+            args.regions = ["us-east-1"]
+            args.func(args)
+
+        out = capsys.readouterr()[0]
+        assert out.count("us-east-1*") == 2
+        assert "served from cache, region is unhealthy: us-east-1" in out
+        assert "not listed, region is unhealthy: eu-west-1" in out
@@ -0,0 +1,191 @@
+# tests.test_hosts
+# Tests for generating the SSH hosts of the managed instances
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Fri Oct 30 10:14:26 2026 -0400
+#
+# ID: test_hosts.py [] benjamin@bengfort.com $
+
+"""
+Tests for generating the SSH hosts of the managed instances
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import json
+import stat
+import pytest
+import geonet.region
+import geonet.managed
+
+from geonet.health import health
+from geonet.region import Regions
+from geonet.console import GeoNetUtility
+from geonet.utils.ssh import load_ssh_config, diff_hosts
+from geonet.utils.serialize import Encoder
+from geonet.utils.timez import utcnow
+
+from tests.fake_ec2 import FakeEC2
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture
+def fleet(tmpdir, monkeypatch):
+    """
+    Three managed instances in a fake EC2.
+    """
+    regions = str(tmpdir.join("regions.json"))
+    Regions([{"RegionName": "us-east-1"}]).dump(regions)
+    monkeypatch.setattr(geonet.region, "REGIONDATA", regions)
+    monkeypatch.setattr(geonet.managed, "INSTANCES", str(tmpdir.join("instances.json")))
+    with FakeEC2(["us-east-1"]) as fake:
+        fake.ids = fake["us-east-1"].add_instances(3, KeyName="alia")
+        manage(fake.ids)
+        yield fake
+
+
+def manage(ids):
+    with open(geonet.managed.INSTANCES, 'w') as f:
+        json.dump({"updated": utcnow(), "instances": {"us-east-1": ids}}, f, cls=Encoder)
+
+
+def hosts(*argv):
+    """
+    Runs the hosts command with the arguments, returning its message.
+    """
+    utility = GeoNetUtility.load()
+    argv = ["hosts"] + list(argv)
+    utility.prepare(argv)
+    args = utility.parser.parse_args(argv)
+    return args.func(args)
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_diff_hosts():
+    """
+    Test the added, removed and changed hosts are found
+    """
+    current = {"a": {"Port": "22"}, "b": {"Port": "22"}, "c": {"Port": "22"}}
+    hosts = {"d": {"Port": "22"}, "b": {"Port": "2222"}, "a": {"Port": "22"}}
+    assert diff_hosts(current, hosts) == (["d"], ["c"], ["b"])
+    assert diff_hosts(hosts, hosts) == ([], [], [])
+
+
+class TestHostsCommand(object):
+    """
+    HostsCommand should
+    """
+
+    def test_config(self, fleet, tmpdir):
+        """
+        only replace the SSH config when the hosts have changed
+        """
+        path = str(tmpdir.join("geonet.config"))
+        assert hosts("-o", path) == "updated {}: 3 added, 0 removed, 0 changed".format(path)
+
+        config = load_ssh_config(path)
+        assert len(config) == 3
+        for options in config.values():
+            assert options["User"] == "ubuntu"
+            assert options["ForwardAgent"] == "yes"
+            assert options["IdentityFile"] == "~/.ssh/alia.pem"
+
+        # Hosts are written sorted by name
+        with open(path, 'r') as f:
+            names = [line.split()[1] for line in f if line.startswith("Host ")]
+        assert names == sorted(names)
+
+        # The file is not touched if nothing changed
+        inode = os.stat(path).st_ino
+        assert hosts("-o", path) == "{} is up to date".format(path)
+        assert os.stat(path).st_ino == inode
+
+        assert hosts("-o", path, "-u", "admin").endswith("0 added, 0 removed, 3 changed")
+        assert os.stat(path).st_ino != inode
+
+        manage(fleet.ids[1:])
+        assert hosts("-o", path, "-u", "admin").endswith("0 added, 1 removed, 0 changed")
+        assert len(load_ssh_config(path)) == 2
+        assert sorted(os.listdir(str(tmpdir))) == ["geonet.config", "instances.json", "regions.json"]
+
+    def test_global_options(self, fleet, tmpdir):
+        """
+        keep the options before the first host and not rewrite them
+        """
+        path = tmpdir.join("geonet.config")
+        path.write("# geonet hosts\nStrictHostKeyChecking no\n\n")
+        assert hosts("-o", str(path)).endswith("3 added, 0 removed, 0 changed")
+        assert path.read().startswith("# geonet hosts\nStrictHostKeyChecking no\n\nHost ")
+        assert load_ssh_config(str(path))[None] == {"StrictHostKeyChecking": "no"}
+        assert hosts("-o", str(path)).endswith("is up to date")
+
+    def test_json(self, fleet, tmpdir):
+        """
+        write the JSON hosts deterministically
+        """
+        path = tmpdir.join("hosts.json")
+        hosts("-f", "json", "-o", str(path))
+        data = json.loads(path.read())
+        assert len(data) == 3
+        assert path.read() == json.dumps(data, indent=2, sort_keys=True) + "\n"
+        assert hosts("-f", "json", "-o", str(path)).endswith("is up to date")
+
+        # A corrupt file is rewritten
+        path.write("{not json")
+        assert hosts("-f", "json", "-o", str(path)).endswith("3 added, 0 removed, 0 changed")
+
+    def test_stdout(self, fleet, capsys):
+        """
+        write the hosts to stdout without comparing them
+        """
+        assert hosts() is None
+        out = capsys.readouterr()[0]
+        assert out.count("Host ") == 3
+        assert "ForwardAgent yes" in out
+
+    def test_mode(self, fleet, tmpdir, monkeypatch):
+        """
+        keep the mode of the SSH config and remove the temporary file on errors
+        """
+        path = tmpdir.join("geonet.config")
+        path.write("")
+        path.chmod(0o600)
+
+        hosts("-o", str(path))
+        assert stat.S_IMODE(os.stat(str(path)).st_mode) == 0o600
+
+        def fail(*args):
+            raise OSError("rename failed")
+
+        monkeypatch.setattr(os, "rename", fail)
+        with pytest.raises(OSError):
+            hosts("-o", str(path), "-u", "admin")
+        assert sorted(os.listdir(str(tmpdir))) == ["geonet.config", "instances.json", "regions.json"]
+
+    @pytest.mark.parametrize("format", ["config", "json"])
+    def test_skipped_region(self, fleet, tmpdir, monkeypatch, format):
+        """
+        not remove the hosts of a region that was skipped because it is unhealthy
+        """
+        path = str(tmpdir.join("hosts"))
+        hosts("-f", format, "-o", path)
+
+        monkeypatch.setattr(health, "allow", lambda region: False)
+        message = hosts("-f", format, "-o", path)
+        assert message == "{} is up to date (kept 3 hosts of skipped regions)".format(path)
+        assert health.skipped == {"us-east-1": False}
+
+        # Once the region is healthy again its missing hosts are removed
+        monkeypatch.delattr(health, "allow")
+        monkeypatch.setattr(health, "skipped", {})
+        manage(fleet.ids[1:])
+        assert hosts("-f", format, "-o", path).endswith("0 added, 1 removed, 0 changed")
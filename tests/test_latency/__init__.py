@@ -0,0 +1,15 @@
+# tests.test_latency
+# Tests for the network latency analysis package.
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 09:40:12 2026 -0400
+#
+# ID: __init__.py [] benjamin@bengfort.com $
+
+"""
+Tests for the network latency analysis package.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
@@ -0,0 +1,195 @@
+# tests.test_latency.test_aggregate
+# Tests for the streaming latency aggregator
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 09:41:27 2026 -0400
+#
+# ID: test_aggregate.py [] benjamin@bengfort.com $
+
+"""
+Tests for the streaming latency aggregator
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import math
+import gzip
+import random
+import pytest
+
+from geonet.config import FIXTURES
+from geonet.latency.aggregate import *
+
+
+LATENCIES = os.path.join(FIXTURES, "network_latencies.csv.gz")
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def exact_stats(values):
+    """
+    Two pass computation of the mean and sample standard deviation.
+    """
+    mean = sum(values) / float(len(values))
+    var = sum((v - mean) ** 2 for v in values) / float(len(values) - 1)
+    return mean, math.sqrt(var)
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+class TestLinkStats(object):
+    """
+    LinkStats should
+    """
+
+    def test_welford(self):
+        """
+        match the exact mean and standard deviation
+        """
+        rng = random.Random(42)
+        values = [rng.gauss(120.0, 18.0) for _ in range(5000)]
+
+        stats = LinkStats()
+        for value in values:
+            stats.update(value)
+        stats.update(None)
+
+        mean, stddev = exact_stats(values)
+        assert stats.messages == 5001
+        assert stats.timeouts == 1
+        assert stats.mean == pytest.approx(mean)
+        assert stats.stddev == pytest.approx(stddev)
+        assert stats.fastest == min(values)
+        assert stats.slowest == max(values)
+
+    def test_merge(self):
+        """
+        merge partial statistics exactly
+        """
+        rng = random.Random(23)
+        values = [rng.expovariate(0.01) for _ in range(3000)]
+
+        parts = [LinkStats(), LinkStats(), LinkStats(), LinkStats()]
+        for idx, value in enumerate(values):
+            parts[idx % 3 if idx < 2000 else 3].update(value)
+
+        merged = LinkStats()
+        for part in parts:
+            merged += part
+
+        mean, stddev = exact_stats(values)
+        assert merged.messages == len(values)
+        assert merged.mean == pytest.approx(mean)
+        assert merged.stddev == pytest.approx(stddev)
+        assert merged.fastest == min(values)
+        assert merged.slowest == max(values)
+
+    def test_merge_empty(self):
+        """
+        merge with links that have only timeouts
+        """
+        stats = LinkStats()
+        stats.update(None)
+        other = LinkStats()
+        other.update(12.0)
+        other.update(14.0)
+
+        stats += other
+        stats += LinkStats(messages=3, timeouts=3)
+        assert stats.messages == 6
+        assert stats.timeouts == 4
+        assert stats.mean == 13.0
+        assert stats.fastest == 12.0
+
+    def test_from_summary(self):
+        """
+        round trip from summary statistics
+        """
+        stats = LinkStats()
+        for value in (10.0, 12.0, 17.0, 21.0):
+            stats.update(value)
+        stats.update(None)
+
+        data = stats.serialize()
+        other = LinkStats.from_summary(**data)
+        assert other.samples == stats.samples
+        assert other.mean == pytest.approx(stats.mean)
+        assert other.m2 == pytest.approx(stats.m2)
+
+
+class TestLatencyAggregator(object):
+    """
+    LatencyAggregator should
+    """
+
+    def test_load_fixture(self):
+        """
+        load the network latencies fixture
+        """
+        aggregator = LatencyAggregator.load(LATENCIES)
+        assert len(aggregator) == 182
+        assert len(aggregator.hosts) == 14
+        assert aggregator.hosts["frankfurt"]["location"] == "eu-central-1b"
+
+        link = aggregator.links[("sedna", "frankfurt")]
+        assert link.messages == 8258
+        assert link.mean == pytest.approx(227.7886763601352)
+        assert link.stddev == pytest.approx(39.82225973062719)
+
+    def test_consume_log(self, tmpdir):
+        """
+        stream a gzipped raw probe log
+        """
+        path = str(tmpdir.join("sedna.csv.gz"))
+        with gzip.open(path, 'wb') as f:
+            f.write("ts,src,dst,rtt\n")
+            f.write("1,sedna,frankfurt,210.0\n")
+            f.write("2,sedna,frankfurt,\n")
+            f.write("3,sedna,frankfurt,230.0\n")
+            f.write("4,sedna,london,-1\n")
+
+        aggregator = LatencyAggregator().consume_log(path)
+        assert len(aggregator) == 2
+        assert aggregator.links[("sedna", "frankfurt")].messages == 3
+        assert aggregator.links[("sedna", "frankfurt")].timeouts == 1
+        assert aggregator.links[("sedna", "frankfurt")].mean == 220.0
+        assert aggregator.links[("sedna", "london")].timeouts == 1
+
+    def test_merge_and_dump(self, tmpdir):
+        """
+        merge aggregators and dump them in the fixture schema
+        """
+        alpha = LatencyAggregator(hosts={"a": {"location": "us-east-1a"}})
+        alpha.update("a", "b", 10.0)
+        bravo = LatencyAggregator(hosts={"b": {"latitude": 1.0, "longitude": 2.0}})
+        bravo.update("a", "b", 20.0)
+        bravo.update("b", "a", None)
+
+        alpha += bravo
+        assert alpha.links[("a", "b")].mean == 15.0
+
+        path = str(tmpdir.join("latencies.csv.gz"))
+        alpha.dump(path)
+
+        loaded = LatencyAggregator.load(path)
+        assert loaded.hosts == alpha.hosts
+        assert loaded.links[("a", "b")].stddev == pytest.approx(alpha.links[("a", "b")].stddev)
+        assert loaded.links[("b", "a")].timeouts == 1
+        assert list(row["src_hostname"] for row in loaded.rows()) == ["a", "b"]
+
+    def test_missing_column(self, tmpdir):
+        """
+        raise an error if the raw log is missing a column
+        """
+        path = tmpdir.join("bad.csv")
+        path.write("src,dst,latency\nsedna,frankfurt,12.0\n")
+
+        with pytest.raises(ValueError):
+            list(read_records(str(path)))
@@ -0,0 +1,187 @@
+# tests.test_latency.test_cluster
+# Tests for the hierarchical clustering of latency tiers
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 20 18:54:21 2026 -0400
+#
+# ID: test_cluster.py [] benjamin@bengfort.com $
+
+"""
+Tests for the hierarchical clustering of latency tiers
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import numpy as np
+import pytest
+
+from geonet.config import FIXTURES
+from geonet.region import Regions
+from geonet.latency.cluster import *
+from geonet.latency.dataset import LatencyDataset
+
+
+LATENCIES = os.path.join(FIXTURES, "network_latencies.csv.gz")
+
+
+def reference(distances, method):
+    """
+    Naive agglomerative clustering that merges the closest pair of clusters
+    by recomputing every cluster distance from the host distances.
+    """
+    clusters = [[idx] for idx in range(len(distances))]
+    trees = list(range(len(distances)))
+    heights = []
+
+    while len(clusters) > 1:
+        best = None
+        for i in range(len(clusters)):
+            for j in range(i + 1, len(clusters)):
+                block = distances[np.ix_(clusters[i], clusters[j])]
+                if method == "single":
+                    dist = block.min()
+                elif method == "complete":
+                    dist = block.max()
+                elif method == "average":
+                    dist = block.mean()
+                else:
+                    dist = weighted(trees[i], trees[j], distances)
+                if best is None or dist < best[0]:
+                    best = (dist, i, j)
+
+        dist, i, j = best
+        heights.append(dist)
+        clusters[i] = clusters[i] + clusters[j]
+        trees[i] = (trees[i], trees[j])
+        del clusters[j], trees[j]
+
+    return heights
+
+
+def weighted(a, b, distances):
+    """
+    WPGMA distance between two (nested tuple) trees of hosts.
+    """
+    if not isinstance(a, tuple) and not isinstance(b, tuple):
+        return distances[a, b]
+    if isinstance(a, tuple):
+        return (weighted(a[0], b, distances) + weighted(a[1], b, distances)) / 2
+    return (weighted(a, b[0], distances) + weighted(a, b[1], distances)) / 2
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+@pytest.mark.parametrize("method", LINKAGES)
+def test_linkage(method):
+    """
+    Test the merge heights match naive agglomerative clustering
+    """
+    rng = np.random.RandomState(34)
+    points = rng.uniform(0, 100, (25, 2))
+    distances = np.sqrt(((points[:, None] - points[None, :]) ** 2).sum(axis=2))
+
+    Z = linkage(distances, method=method)
+    assert Z.shape == (24, 4)
+    assert Z[-1, 3] == 25
+    assert (np.diff(Z[:, 2]) >= 0).all()
+    np.testing.assert_allclose(Z[:, 2], reference(distances, method))
+
+
+def test_linkage_invalid():
+    """
+    Test linkage requires a known method and a complete matrix
+    """
+    with pytest.raises(ValueError):
+        linkage(np.ones((3, 3)), method="ward")
+
+    distances = np.ones((3, 3))
+    distances[0, 1] = distances[1, 0] = np.nan
+    with pytest.raises(ValueError):
+        linkage(distances)
+
+
+def test_fcluster():
+    """
+    Test cutting the tree by cluster count and threshold
+    """
+    distances = np.array([
+        [0, 1, 9, 10, 30],
+        [1, 0, 8, 9, 31],
+        [9, 8, 0, 2, 29],
+        [10, 9, 2, 0, 28],
+        [30, 31, 29, 28, 0],
+    ], dtype=float)
+    Z = linkage(distances, method="complete")
+
+    assert fcluster(Z, n_clusters=1).tolist() == [0, 0, 0, 0, 0]
+    assert fcluster(Z, n_clusters=2).tolist() == [0, 0, 0, 0, 1]
+    assert fcluster(Z, n_clusters=3).tolist() == [0, 0, 1, 1, 2]
+    assert fcluster(Z, n_clusters=5).tolist() == [0, 1, 2, 3, 4]
+    assert fcluster(Z, threshold=5.0).tolist() == [0, 0, 1, 1, 2]
+
+    with pytest.raises(ValueError):
+        fcluster(Z)
+
+    with pytest.raises(ValueError):
+        fcluster(Z, n_clusters=6)
+
+
+def test_symmetrize():
+    """
+    Test directed latencies are averaged in both directions
+    """
+    distances = symmetrize([[np.nan, 10.0, np.nan], [20.0, np.nan, 5.0], [7.0, 5.0, np.nan]])
+    np.testing.assert_allclose(distances, [[0, 15, 7], [15, 0, 5], [7, 5, 0]])
+
+
+def test_annotate_regions():
+    """
+    Test regions are annotated with the tier of matching hosts
+    """
+    regions = Regions([
+        {"RegionName": "us-east-1", "LocaleName": "virginia"},
+        {"RegionName": "eu-west-2", "LocaleName": "london"},
+    ])
+    unmatched = annotate_regions(regions, {"virginia": 0, "eu-west-2": 1, "seoul": 2})
+    assert unmatched == ["seoul"]
+    assert regions.find("virginia")[TIER_KEY] == 0
+    assert regions.find("london")[TIER_KEY] == 1
+
+
+class TestLatencyTiers(object):
+    """
+    LatencyTiers should
+    """
+
+    def test_from_dataset(self):
+        """
+        split the dataset hosts into tiers
+        """
+        dataset = LatencyDataset.from_csv(LATENCIES)
+        tiers = LatencyTiers.from_dataset(dataset)
+        assert len(tiers) == len(dataset)
+
+        assignments = tiers.assign(n_clusters=3)
+        assert set(assignments) == set(dataset.hostnames)
+        assert set(assignments.values()) == {0, 1, 2}
+
+        # A tiny threshold leaves every host in its own tier
+        assert len(set(tiers.clusters(threshold=0.001))) == len(dataset)
+
+    def test_fleet_scale(self):
+        """
+        cluster thousands of hosts
+        """
+        rng = np.random.RandomState(12)
+        centers = rng.uniform(0, 200, (6, 2))
+        points = centers[rng.randint(0, 6, 2000)] + rng.normal(0, 2, (2000, 2))
+        latencies = np.sqrt(((points[:, None] - points[None, :]) ** 2).sum(axis=2))
+
+        tiers = LatencyTiers(latencies, method="average")
+        labels = tiers.clusters(n_clusters=6)
+        assert len(set(labels)) == 6
@@ -0,0 +1,89 @@
+# tests.test_latency.test_dataset
+# Tests for the memory-mapped latency dataset format
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 13:52:10 2026 -0400
+#
+# ID: test_dataset.py [] benjamin@bengfort.com $
+
+"""
+Tests for the memory-mapped latency dataset format
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import numpy as np
+import pytest
+
+from geonet.config import FIXTURES
+from geonet.latency.dataset import *
+
+
+LATENCIES = os.path.join(FIXTURES, "network_latencies.csv.gz")
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+class TestLatencyDataset(object):
+    """
+    LatencyDataset should
+    """
+
+    def test_from_csv(self):
+        """
+        convert the network latencies fixture
+        """
+        dataset = LatencyDataset.from_csv(LATENCIES)
+        assert len(dataset) == 14
+        assert dataset.mean.shape == (14, 14)
+        assert np.count_nonzero(dataset.messages) == 182
+
+        link = dataset.link("sedna", "frankfurt")
+        assert link["messages"] == 8258
+        assert link["mean"] == pytest.approx(227.7886763601352)
+
+        idx = dataset.index["frankfurt"]
+        assert dataset.locations[idx] == "eu-central-1b"
+        assert dataset.latitude[idx] == pytest.approx(50.1167)
+
+    def test_unmeasured_links(self):
+        """
+        mark links that were not measured as missing
+        """
+        dataset = LatencyDataset.from_csv(LATENCIES)
+        missing = dataset.messages == 0
+        assert np.isnan(dataset.mean[missing]).all()
+        assert not np.isnan(dataset.mean[~missing]).any()
+
+    def test_dump_load(self, tmpdir):
+        """
+        round trip through disk as memory maps
+        """
+        path = str(tmpdir.join("latencies"))
+        dataset = LatencyDataset.from_csv(LATENCIES)
+        dataset.dump(path)
+
+        loaded = LatencyDataset.load(path)
+        assert isinstance(loaded.mean, np.memmap)
+        assert loaded.hostnames == dataset.hostnames
+        for name, _ in MATRICES + tuple((c, None) for c in COORDINATES):
+            np.testing.assert_array_equal(loaded.arrays[name], dataset.arrays[name])
+
+        with pytest.raises(ValueError):
+            loaded.mean[0, 0] = 1.0
+
+        loaded = LatencyDataset.load(path, mmap_mode=None)
+        assert not isinstance(loaded.mean, np.memmap)
+
+    def test_missing_attribute(self):
+        """
+        raise attribute errors for unknown arrays
+        """
+        dataset = LatencyDataset.from_csv(LATENCIES)
+        with pytest.raises(AttributeError):
+            dataset.median
@@ -0,0 +1,106 @@
+# tests.test_latency.test_distance
+# Tests for the great-circle distance latency model
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 20 11:52:26 2026 -0400
+#
+# ID: test_distance.py [] benjamin@bengfort.com $
+
+"""
+Tests for the great-circle distance latency model
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import numpy as np
+import pytest
+
+from geonet.config import FIXTURES
+from geonet.latency.distance import *
+from geonet.latency.dataset import LatencyDataset
+
+
+LATENCIES = os.path.join(FIXTURES, "network_latencies.csv.gz")
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_haversine():
+    """
+    Test great-circle distances between known points
+    """
+    # London to New York
+    assert haversine(51.5074, -0.1278, 40.7128, -74.0060) == pytest.approx(5570, rel=0.005)
+
+    # Antipodal points are half the circumference apart
+    assert haversine(0, 0, 0, 180) == pytest.approx(np.pi * EARTH_RADIUS)
+
+
+def test_pairwise_distances():
+    """
+    Test the pairwise distance matrix is symmetric with a zero diagonal
+    """
+    lat = np.array([38.9827, 50.1167, 51.5142, -33.8688])
+    lon = np.array([-77.004, 8.6833, -0.0931, 151.2093])
+    distances = pairwise_distances(lat, lon)
+
+    assert distances.shape == (4, 4)
+    np.testing.assert_allclose(distances, distances.T)
+    np.testing.assert_allclose(np.diag(distances), 0, atol=1e-9)
+    assert distances[1, 3] == pytest.approx(haversine(lat[1], lon[1], lat[3], lon[3]))
+
+
+class TestDistanceModel(object):
+    """
+    DistanceModel should
+    """
+
+    def test_fit(self):
+        """
+        recover the coefficients of a linear relationship
+        """
+        rng = np.random.RandomState(4)
+        distances = rng.uniform(0, 15000, 500)
+        latencies = 5.0 + 0.02 * distances + rng.normal(0, 3, 500)
+        latencies[::10] = np.nan
+
+        model = DistanceModel().fit(distances, latencies)
+        assert model.n == 450
+        assert model.intercept == pytest.approx(5.0, abs=1.0)
+        assert model.slope == pytest.approx(0.02, rel=0.01)
+        assert model.sigma == pytest.approx(3.0, rel=0.1)
+
+        # Prediction error is smallest near the mean distance
+        assert model.stderr(model._xbar) < model.stderr(30000)
+
+    def test_fit_requires_links(self):
+        """
+        require enough measured links to fit
+        """
+        with pytest.raises(ValueError):
+            DistanceModel().fit([1.0, 2.0, np.nan], [10.0, 12.0, 13.0])
+
+    def test_fill(self):
+        """
+        fill unmeasured links with predictions and their error
+        """
+        dataset = LatencyDataset.from_csv(LATENCIES)
+        model = DistanceModel.from_dataset(dataset)
+        assert model.slope > 0
+
+        # Forget a link and make sure it is predicted
+        i, j = dataset.index["sedna"], dataset.index["sydney"]
+        dataset.mean[i, j] = np.nan
+
+        filled, stderr = model.fill(dataset)
+        assert np.isnan(np.diag(filled)).all()
+        assert np.isfinite(filled[~np.eye(len(dataset), dtype=bool)]).all()
+        assert filled[i, j] > 100
+        assert stderr[i, j] > 0
+        assert stderr[j, i] == 0
+        assert filled[j, i] == dataset.mean[j, i]
@@ -0,0 +1,161 @@
+# tests.test_latency.test_ingest
+# Tests for the parallel latency log ingestion pipeline
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 12:02:51 2026 -0400
+#
+# ID: test_ingest.py [] benjamin@bengfort.com $
+
+"""
+Tests for the parallel latency log ingestion pipeline
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import gzip
+import random
+import pytest
+
+from StringIO import StringIO
+from geonet.latency.ingest import *
+from geonet.latency.aggregate import LatencyAggregator
+
+
+HOSTS = ("sedna", "frankfurt", "london", "seoul", "ohio")
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture(scope="module")
+def logs(tmpdir_factory):
+    """
+    Write a gzipped raw probe log for every host
+    """
+    rng = random.Random(1018)
+    tmpdir = tmpdir_factory.mktemp("logs")
+    paths = []
+
+    for src in HOSTS:
+        path = str(tmpdir.join("{}.csv.gz".format(src)))
+        with gzip.open(path, 'wb') as f:
+            f.write("ts,src,dst,rtt\n")
+            for idx in range(2000):
+                dst = rng.choice(HOSTS)
+                rtt = "" if rng.random() < 0.02 else "{:0.6f}".format(rng.gammavariate(9, 12))
+                f.write("{},{},{},{}\n".format(idx, src, dst, rtt))
+        paths.append(path)
+
+    return paths
+
+
+def assert_aggregates_equal(actual, expected):
+    assert set(actual.links) == set(expected.links)
+    for link, stats in expected.links.items():
+        other = actual.links[link]
+        assert other.messages == stats.messages
+        assert other.timeouts == stats.timeouts
+        assert other.mean == pytest.approx(stats.mean)
+        assert other.stddev == pytest.approx(stats.stddev)
+        assert other.fastest == stats.fastest
+        assert other.slowest == stats.slowest
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_read_chunks():
+    """
+    Test that chunks always end on complete lines
+    """
+    data = "".join("{},a,b,{}\n".format(idx, idx * 3) for idx in range(500))
+    chunks = list(read_chunks(StringIO(data), size=64))
+    assert len(chunks) > 1
+    assert "".join(chunks) == data
+    for chunk in chunks:
+        assert chunk.endswith("\n")
+
+
+def test_aggregate_log(logs):
+    """
+    Test the vectorized aggregation matches streaming aggregation
+    """
+    for path in logs:
+        expected = LatencyAggregator().consume_log(path)
+        actual, nbytes, nrecords = aggregate_log(path, chunk_size=4096)
+        assert nrecords == 2000
+        assert nbytes > 0
+        assert_aggregates_equal(actual, expected)
+
+
+def test_aggregate_log_blank_lines(tmpdir):
+    """
+    Test blank lines and a missing final newline are read as serially
+    """
+    path = str(tmpdir.join("sedna.csv"))
+    with open(path, 'w') as f:
+        f.write("ts,src,dst,rtt\n1,sedna,ohio,12.5\n\n2,sedna,ohio,\n\n\n3,sedna,seoul,80.1")
+
+    expected = LatencyAggregator().consume_log(path)
+    actual, _, nrecords = aggregate_log(path)
+    assert nrecords == 3
+    assert_aggregates_equal(actual, expected)
+
+
+def test_ingest_parallel(logs):
+    """
+    Test parallel ingestion merges the partial aggregates of every log
+    """
+    expected = LatencyAggregator()
+    for path in logs:
+        expected.consume_log(path)
+
+    reports = []
+    actual = ingest(logs, processes=2, callback=lambda p: reports.append(str(p)))
+    assert_aggregates_equal(actual, expected)
+    assert len(reports) >= len(logs)
+    assert reports[-1].startswith("ingested 5/5 logs")
+
+
+def test_ingest_chunk_progress(logs):
+    """
+    Test progress is reported after every chunk with the records read
+    """
+    for processes in (1, 2):
+        reports = []
+        ingest(
+            logs[:2], processes=processes, chunk_size=4096,
+            callback=lambda p: reports.append((p.completed, p.nbytes, p.nrecords)),
+        )
+        assert len(reports) > 4
+        assert reports[0][0] == 0 and reports[0][2] > 0
+        assert reports[-1][0] == 2 and reports[-1][2] == 4000
+        assert [report[1] for report in reports] == sorted(report[1] for report in reports)
+
+
+def test_aggregate_log_quoted(tmpdir):
+    """
+    Test quoted fields are parsed as by the csv module
+    """
+    path = str(tmpdir.join("sedna.csv"))
+    with open(path, 'w') as f:
+        f.write('ts,src,dst,rtt\n1,sedna,"ohio, us",12.5\n2,"sedna","ohio, us",""\n3,sedna,seoul,80.1\n')
+
+    expected = LatencyAggregator().consume_log(path)
+    actual, _, nrecords = aggregate_log(path)
+    assert nrecords == 3
+    assert ("sedna", "ohio, us") in actual.links
+    assert_aggregates_equal(actual, expected)
+
+
+def test_find_logs(logs, tmpdir):
+    """
+    Test logs are found in directories
+    """
+    assert find_logs([str(tmpdir)]) == []
+    assert find_logs(logs[:2]) == sorted(logs[:2])
+    assert len(find_logs([str(tmpdir.dirpath())])) >= len(logs)
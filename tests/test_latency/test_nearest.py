@@ -0,0 +1,154 @@
+# tests.test_latency.test_nearest
+# Tests for the nearest replica spatial index
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 20 14:48:09 2026 -0400
+#
+# ID: test_nearest.py [] benjamin@bengfort.com $
+
+"""
+Tests for the nearest replica spatial index
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import numpy as np
+import pytest
+
+from geonet.region import Region
+from geonet.latency.nearest import *
+from geonet.latency.distance import haversine, DistanceModel
+
+
+# Two replicas in Virginia, one each in Frankfurt, Sydney and Sao Paulo
+LATITUDE = np.array([38.13, 38.13, 50.11, -33.87, -23.55])
+LONGITUDE = np.array([-78.45, -78.45, 8.68, 151.21, -46.63])
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+class MockManager(object):
+
+    def regions(self):
+        yield Region({"RegionName": "us-east-1"}), ("i-2", "i-1")
+        yield Region({"RegionName": "eu-west-2", "Latitude": 51.0, "Longitude": 0.0}), ("i-3",)
+
+
+@pytest.fixture(scope="module")
+def clients():
+    rng = np.random.RandomState(32)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, 20000)))
+    lon = rng.uniform(-180, 180, 20000)
+    return lat, lon
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+class TestReplicaIndex(object):
+    """
+    ReplicaIndex should
+    """
+
+    def test_sites(self):
+        """
+        deduplicate co-located replicas into sites
+        """
+        index = ReplicaIndex(LATITUDE, LONGITUDE)
+        assert len(index) == 5
+        assert index.sites.shape == (4, 3)
+        assert index.site_of[0] == index.site_of[1]
+        np.testing.assert_allclose(np.linalg.norm(index.sites, axis=1), 1.0)
+
+    def test_nearest(self, clients):
+        """
+        match a brute force haversine search
+        """
+        lat, lon = clients
+        index = ReplicaIndex(LATITUDE, LONGITUDE)
+        distances, indices = index.query(lat, lon, k=2, chunk=4096)
+        assert distances.shape == indices.shape == (len(lat), 2)
+
+        brute = haversine(lat[:, None], lon[:, None], LATITUDE[None, :], LONGITUDE[None, :])
+        expected = np.sort(brute, axis=1)[:, :2]
+        np.testing.assert_allclose(distances, expected, atol=1e-3)
+        np.testing.assert_allclose(
+            np.take_along_axis(brute, indices, axis=1), expected, atol=1e-3
+        )
+        assert (indices[:, 0] != indices[:, 1]).all()
+
+    def test_balanced_ties(self, clients):
+        """
+        spread clients across co-located replicas
+        """
+        lat, lon = clients
+        index = ReplicaIndex(LATITUDE, LONGITUDE)
+        loads = index.loads(index.assign(lat, lon))
+        assert loads.sum() == len(lat)
+        assert abs(loads[0] - loads[1]) < 0.05 * loads[:2].sum()
+
+    def test_model(self, clients):
+        """
+        report predicted latencies in the same order
+        """
+        lat, lon = clients
+        model = DistanceModel()
+        model.intercept, model.slope = 2.0, 0.02
+
+        distances, indices = ReplicaIndex(LATITUDE, LONGITUDE).query(lat, lon, k=3)
+        latencies, lindices = ReplicaIndex(LATITUDE, LONGITUDE, model=model).query(lat, lon, k=3)
+        np.testing.assert_array_equal(indices, lindices)
+        np.testing.assert_allclose(latencies, 2.0 + 0.02 * distances)
+
+    def test_many_replicas(self, clients):
+        """
+        expand the nearest sites into all of their co-located replicas
+        """
+        lat, lon = clients
+        rng = np.random.RandomState(42)
+        sites = rng.randint(0, 5, 300)
+        index = ReplicaIndex(LATITUDE[sites], LONGITUDE[sites])
+        distances, indices = index.query(lat, lon, k=70, chunk=1000)
+
+        brute = haversine(lat[:, None], lon[:, None], LATITUDE[None, sites], LONGITUDE[None, sites])
+        np.testing.assert_allclose(distances, np.sort(brute, axis=1)[:, :70], atol=1e-3)
+        np.testing.assert_allclose(np.take_along_axis(brute, indices, axis=1), distances, atol=1e-3)
+        assert all(len(set(row)) == 70 for row in indices[:100])
+
+        # Every replica of a site that is nearest to clients gets some of them
+        loads = index.loads(indices[:, 0])
+        for site in np.unique(index.site_of[indices[:, 0]]):
+            assert (loads[index.site_of == site] > 0).all()
+
+    def test_decreasing_model(self):
+        """
+        not rank replicas with a model that does not increase with distance
+        """
+        model = DistanceModel()
+        model.intercept, model.slope = 2.0, -0.02
+        with pytest.raises(ValueError):
+            ReplicaIndex(LATITUDE, LONGITUDE, model=model).query([0.0], [0.0])
+
+    def test_from_managed(self):
+        """
+        index managed instances at their region coordinates
+        """
+        index = ReplicaIndex.from_managed(MockManager())
+        assert index.labels == ["i-1", "i-2", "i-3"]
+        assert index.regions == ["us-east-1", "us-east-1", "eu-west-2"]
+
+        assert index.assign([52.0], [1.0])[0] == 2
+        assert index.labels[index.assign([39.0], [-77.0])[0]] in {"i-1", "i-2"}
+
+    def test_invalid_k(self):
+        """
+        raise an error for an invalid number of neighbors
+        """
+        index = ReplicaIndex(LATITUDE, LONGITUDE)
+        with pytest.raises(ValueError):
+            index.query([0.0], [0.0], k=6)
@@ -0,0 +1,169 @@
+# tests.test_latency.test_paths
+# Tests for the all-pairs relay paths
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 20 17:03:44 2026 -0400
+#
+# ID: test_paths.py [] benjamin@bengfort.com $
+
+"""
+Tests for the all-pairs relay paths
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import time
+import numpy as np
+import pytest
+
+from geonet.config import FIXTURES
+from geonet.latency.paths import *
+from geonet.latency.dataset import LatencyDataset
+
+
+LATENCIES = os.path.join(FIXTURES, "network_latencies.csv.gz")
+NAN = np.nan
+
+# The direct link from a to d is slow and c to a is unmeasured
+GRAPH = np.array([
+    [NAN,  10.0, 50.0, 100.0],
+    [10.0, NAN,  15.0, 60.0],
+    [NAN,  15.0, NAN,  20.0],
+    [100.0, 60.0, 20.0, NAN],
+])
+
+
+def reference(weights):
+    """
+    Straightforward scalar Floyd-Warshall to check the vectorized version.
+    """
+    dist = np.where(np.isnan(weights), np.inf, weights)
+    np.fill_diagonal(dist, 0)
+    n = len(dist)
+    for k in range(n):
+        for i in range(n):
+            for j in range(n):
+                dist[i, j] = min(dist[i, j], dist[i, k] + dist[k, j])
+    return dist
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_shortest_paths():
+    """
+    Test shortest paths and next hops of a small graph
+    """
+    dist, nexthop = shortest_paths(GRAPH)
+    np.testing.assert_allclose(dist, reference(GRAPH))
+    assert dist[0, 3] == 45.0
+    assert dist[2, 0] == 25.0
+
+    assert follow(nexthop, 0, 3) == [0, 1, 2, 3]
+    assert follow(nexthop, 2, 0) == [2, 1, 0]
+    assert follow(nexthop, 1, 0) == [1, 0]
+    assert follow(nexthop, 0, 0) == [0]
+
+
+def test_shortest_paths_unreachable():
+    """
+    Test hosts without a path have no next hop
+    """
+    dist, nexthop = shortest_paths([[0, 5.0], [NAN, 0]])
+    assert np.isinf(dist[1, 0])
+    assert nexthop[1, 0] == -1
+    assert follow(nexthop, 1, 0) is None
+
+
+def test_shortest_paths_random():
+    """
+    Test shortest paths match a reference on a random graph
+    """
+    rng = np.random.RandomState(33)
+    weights = rng.uniform(1, 100, (40, 40))
+    weights[rng.rand(40, 40) < 0.2] = NAN
+
+    dist, nexthop = shortest_paths(weights)
+    np.testing.assert_allclose(dist, reference(weights))
+
+    # Following the next hops must add up to the shortest path
+    for i, j in zip(*np.nonzero(np.isfinite(dist))):
+        path = follow(nexthop, i, j)
+        total = sum(weights[a, b] for a, b in zip(path, path[1:]))
+        assert total == pytest.approx(dist[i, j])
+
+
+@pytest.mark.parametrize("block", [1, 7, 40, 64])
+def test_shortest_paths_blocks(block):
+    """
+    Test shortest paths do not depend on the size of the relay blocks
+    """
+    rng = np.random.RandomState(12)
+    weights = rng.uniform(1, 100, (40, 40))
+    weights[rng.rand(40, 40) < 0.3] = NAN
+
+    dist, nexthop = shortest_paths(weights, block=block)
+    np.testing.assert_allclose(dist, reference(weights))
+    for i, j in zip(*np.nonzero(np.isfinite(dist))):
+        assert follow(nexthop, i, j)[-1] == j
+
+
+def test_shortest_paths_invalid():
+    """
+    Test shortest paths require a square non-negative matrix
+    """
+    with pytest.raises(ValueError):
+        shortest_paths(np.ones((2, 3)))
+
+    with pytest.raises(ValueError):
+        shortest_paths([[0, -1.0], [1.0, 0]])
+
+
+def test_shortest_paths_speed():
+    """
+    Test shortest paths over hundreds of hosts finishes quickly
+    """
+    weights = np.random.RandomState(7).uniform(1, 300, (500, 500))
+    started = time.time()
+    shortest_paths(weights)
+    assert time.time() - started < 5.0
+
+
+class TestRelayPaths(object):
+    """
+    RelayPaths should
+    """
+
+    def test_relays(self):
+        """
+        report relayed pairs above the threshold by savings
+        """
+        paths = RelayPaths(GRAPH, hosts=list("abcd"))
+        assert paths.path("a", "d") == ["a", "b", "c", "d"]
+
+        relays = paths.relays(threshold=10.0)
+        assert [(row["src"], row["dst"]) for row in relays] == [
+            ("c", "a"), ("a", "d"), ("d", "a"), ("a", "c"), ("b", "d"), ("d", "b"),
+        ]
+        assert relays[0]["direct"] == np.inf
+        assert relays[1]["savings"] == 55.0
+        assert relays[1]["path"] == ["a", "b", "c", "d"]
+
+        assert len(paths.relays(threshold=50.0)) == 3
+
+    def test_from_dataset(self):
+        """
+        compute relays of the mean RTTs of a dataset
+        """
+        dataset = LatencyDataset.from_csv(LATENCIES)
+        paths = RelayPaths.from_dataset(dataset)
+        assert len(paths) == len(dataset)
+
+        for row in paths.relays():
+            assert row["relayed"] < row["direct"]
+            assert len(row["path"]) > 2
+            assert row["path"] == paths.path(row["src"], row["dst"])
@@ -0,0 +1,130 @@
+# tests.test_latency.test_simulate
+# Tests for the Monte Carlo quorum round simulator
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 20 09:30:02 2026 -0400
+#
+# ID: test_simulate.py [] benjamin@bengfort.com $
+
+"""
+Tests for the Monte Carlo quorum round simulator
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import time
+import numpy as np
+import pytest
+
+from geonet.config import FIXTURES
+from geonet.latency.simulate import *
+from geonet.latency.sketch import quorum_quantiles
+from geonet.latency.dataset import LatencyDataset
+from geonet.latency.aggregate import LatencyAggregator
+
+
+LATENCIES = os.path.join(FIXTURES, "network_latencies.csv.gz")
+REPLICAS = ["london", "ohio", "frankfurt", "seoul", "california"]
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture(scope="module")
+def dataset():
+    return LatencyDataset.from_csv(LATENCIES)
+
+
+@pytest.fixture(scope="module")
+def sketched():
+    rng = np.random.RandomState(19)
+    aggregator = LatencyAggregator(sketches=True)
+    for idx, loc in enumerate((30, 60, 90, 120)):
+        for rtt in rng.gamma(16, loc / 16.0, 20000):
+            aggregator.update("leader", "r{}".format(idx), rtt)
+    return LatencyDataset.from_aggregator(aggregator)
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+class TestQuorumSimulator(object):
+    """
+    QuorumSimulator should
+    """
+
+    def test_reproducible(self, dataset):
+        """
+        return the same rounds for the same seed
+        """
+        alpha = QuorumSimulator(dataset, "virginia", REPLICAS, seed=42)
+        bravo = QuorumSimulator(dataset, "virginia", REPLICAS, seed=42)
+        np.testing.assert_array_equal(alpha.simulate(10000), bravo.simulate(10000))
+
+    def test_majority(self, dataset):
+        """
+        wait for a majority including the leader
+        """
+        simulator = QuorumSimulator(dataset, "virginia", REPLICAS + ["virginia"], seed=1)
+        assert simulator.replicas == REPLICAS
+        assert simulator.quorum == 4
+
+        # A round can never beat the third smallest fastest RTT
+        fastest = sorted(dataset.link("virginia", r)["fastest"] for r in REPLICAS)
+        assert simulator.simulate(10000).min() >= fastest[2]
+
+        solo = QuorumSimulator(dataset, "virginia", REPLICAS, quorum=1)
+        assert (solo.simulate(100) == 0).all()
+
+        with pytest.raises(ValueError):
+            QuorumSimulator(dataset, "virginia", REPLICAS, quorum=7)
+
+    def test_unmeasured_link(self):
+        """
+        raise a lookup error if a link has not been measured
+        """
+        aggregator = LatencyAggregator()
+        aggregator.update("alpha", "bravo", 12.0)
+        dataset = LatencyDataset.from_aggregator(aggregator)
+        with pytest.raises(LookupError):
+            QuorumSimulator(dataset, "bravo", ["alpha"])
+
+    def test_timeouts(self, dataset):
+        """
+        drop responses at the measured timeout rate
+        """
+        simulator = QuorumSimulator(dataset, "sedna", ["hyperion"], timeouts=True, seed=3)
+        rounds = simulator.simulate(200000)
+        link = dataset.link("sedna", "hyperion")
+        rate = np.isinf(rounds).mean()
+        assert rate == pytest.approx(link["timeouts"] / float(link["messages"]), abs=0.002)
+
+    def test_empirical(self, sketched):
+        """
+        sample from sketches to match the analytic quorum quantiles
+        """
+        replicas = ["r0", "r1", "r2", "r3"]
+        simulator = QuorumSimulator(sketched, "leader", replicas, seed=8)
+        assert all(isinstance(link, EmpiricalLink) for link in simulator.links)
+
+        sketches = [sketched.sketch("leader", r) for r in replicas]
+        expected = quorum_quantiles(sketches, 2, (0.5, 0.99))
+        np.testing.assert_allclose(simulator.quantiles((0.5, 0.99), 200000), expected, rtol=0.03)
+
+        normal = QuorumSimulator(sketched, "leader", replicas, empirical=False)
+        assert all(isinstance(link, NormalLink) for link in normal.links)
+
+    def test_million_trials(self, dataset):
+        """
+        simulate a million rounds quickly
+        """
+        simulator = QuorumSimulator(dataset, "virginia", REPLICAS, seed=42)
+        started = time.time()
+        quantiles = simulator.quantiles(trials=1000000)
+        assert time.time() - started < 2.0
+        assert quantiles[0] <= quantiles[1] <= quantiles[2]
@@ -0,0 +1,177 @@
+# tests.test_latency.test_sketch
+# Tests for the latency quantile sketches
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 19 15:28:44 2026 -0400
+#
+# ID: test_sketch.py [] benjamin@bengfort.com $
+
+"""
+Tests for the latency quantile sketches
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import gzip
+import numpy as np
+import pytest
+
+from geonet.latency.sketch import *
+from geonet.latency.dataset import LatencyDataset
+from geonet.latency.ingest import aggregate_log
+from geonet.latency.aggregate import LatencyAggregator
+from geonet.console import GeoNetUtility
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+class TestLogHistogram(object):
+    """
+    LogHistogram should
+    """
+
+    def test_relative_accuracy(self):
+        """
+        report quantiles within the relative accuracy
+        """
+        rng = np.random.RandomState(42)
+        values = rng.lognormal(4.5, 0.6, 20000)
+
+        sketch = LogHistogram()
+        sketch.update_many(values)
+        assert sketch.count == len(values)
+
+        for q in (0.5, 0.9, 0.99, 0.999):
+            expected = np.percentile(values, q * 100, interpolation="lower")
+            assert sketch.quantile(q) == pytest.approx(expected, rel=0.011)
+
+    def test_update_matches_update_many(self):
+        """
+        bucket scalar and array values identically
+        """
+        values = [0.001, 0.01, 0.5, 12.0, 230.5, 1e7]
+        alpha, bravo = LogHistogram(), LogHistogram()
+        for value in values:
+            alpha.update(value)
+        bravo.update_many(values)
+        np.testing.assert_array_equal(alpha.counts, bravo.counts)
+        assert alpha.counts[0] == 2
+        assert alpha.counts[-1] == 1
+
+    def test_merge(self):
+        """
+        merge sketches exactly
+        """
+        rng = np.random.RandomState(7)
+        values = rng.gamma(9, 12, 5000)
+
+        whole, alpha, bravo = LogHistogram(), LogHistogram(), LogHistogram()
+        whole.update_many(values)
+        alpha.update_many(values[:1200])
+        bravo.update_many(values[1200:])
+
+        alpha += bravo
+        np.testing.assert_array_equal(alpha.counts, whole.counts)
+
+        with pytest.raises(ValueError):
+            alpha.merge(LogHistogram(accuracy=0.02))
+
+    def test_empty(self):
+        """
+        return NaN quantiles when empty
+        """
+        assert np.isnan(LogHistogram().quantile(0.5))
+
+
+class TestQuorumQuantiles(object):
+    """
+    Quorum quantiles should
+    """
+
+    def test_single_response(self):
+        """
+        equal the link quantiles for a quorum of one follower
+        """
+        sketch = LogHistogram()
+        sketch.update_many(np.random.RandomState(3).gamma(9, 12, 5000))
+        np.testing.assert_allclose(
+            quorum_quantiles([sketch], 1), sketch.quantile()
+        )
+
+    def test_order_statistics(self):
+        """
+        match the order statistics of independent samples
+        """
+        rng = np.random.RandomState(11)
+        samples = [rng.normal(loc, 5, 20000).clip(1) for loc in (40, 80, 160)]
+        sketches = []
+        for values in samples:
+            sketch = LogHistogram()
+            sketch.update_many(values)
+            sketches.append(sketch)
+
+        # Time to receive 2 of 3 responses
+        second = np.sort(np.vstack(samples), axis=0)[1]
+        for q in (0.5, 0.99):
+            expected = np.percentile(second, q * 100)
+            assert quorum_quantiles(sketches, 2, q) == pytest.approx(expected, rel=0.03)
+
+        assert quorum_quantiles(sketches, 0, 0.5) == 0.0
+        with pytest.raises(ValueError):
+            quorum_quantiles(sketches, 4)
+
+
+class TestSketchedDataset(object):
+    """
+    Latency datasets with sketches should
+    """
+
+    def test_ingest_sketches(self, tmpdir):
+        """
+        store ingested sketches and query link and quorum quantiles
+        """
+        rng = np.random.RandomState(5)
+        path = str(tmpdir.join("leader.csv.gz"))
+        with gzip.open(path, 'wb') as f:
+            f.write("src,dst,rtt\n")
+            for idx in range(3000):
+                dst = ("alpha", "bravo", "charlie", "delta")[idx % 4]
+                f.write("leader,{},{:0.4f}\n".format(dst, rng.gamma(9, 12)))
+
+        streamed = LatencyAggregator(sketches=True).consume_log(path)
+        aggregator, _, _ = aggregate_log(path, chunk_size=1024, sketches=True)
+        for link, stats in streamed.links.items():
+            np.testing.assert_array_equal(aggregator.links[link].sketch.counts, stats.sketch.counts)
+
+        outpath = str(tmpdir.join("dataset"))
+        LatencyDataset.from_aggregator(aggregator).dump(outpath)
+        dataset = LatencyDataset.load(outpath)
+
+        expected = streamed.links[("leader", "bravo")].sketch.quantile()
+        np.testing.assert_allclose(dataset.quantiles("leader", "bravo"), expected)
+        assert dataset.sketch("alpha", "leader") is None
+
+        replicas = ["alpha", "bravo", "charlie", "delta"]
+        quorum = dataset.quorum_quantiles("leader", replicas)
+        assert (quorum >= dataset.quorum_quantiles("leader", replicas, quorum=2)).all()
+        assert (quorum <= dataset.quorum_quantiles("leader", replicas, quorum=5)).all()
+
+        with pytest.raises(LookupError):
+            dataset.quorum_quantiles("alpha", ["leader", "bravo"])
+
+
+def test_ingest_sketches_csv(tmpdir):
+    """
+    Test ingesting sketches into a latencies csv fails before reading the logs
+    """
+    utility = GeoNetUtility.load()
+    argv = ["latency:ingest", "-s", "-o", str(tmpdir.join("latencies.csv")), str(tmpdir.join("missing"))]
+    utility.prepare(argv)
+    args = utility.parser.parse_args(argv)
+    with pytest.raises(ValueError) as excinfo:
+        args.func(args)
+    assert "cannot write sketches" in str(excinfo.value)
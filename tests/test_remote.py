@@ -0,0 +1,161 @@
+# tests.test_remote
+# Tests for running commands on hosts over pooled SSH connections
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Tue Oct 27 11:52:30 2026 -0400
+#
+# ID: test_remote.py [] benjamin@bengfort.com $
+
+"""
+Tests for running commands on hosts over pooled SSH connections
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import pytest
+
+from geonet.remote import *
+from geonet.console import GeoNetUtility
+from geonet.exceptions import RemoteCommandFailed
+
+from tests.fake_sshd import FakeSSHD
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture
+def sshd():
+    with FakeSSHD() as sshd:
+        yield sshd
+
+
+def make_fleet(sshd, n=4):
+    return [
+        Host("alia-{}".format(idx), "127.0.0.1", port=sshd.port, key=sshd.key)
+        for idx in range(n)
+    ]
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_make_hosts():
+    """
+    Test hosts are created from host data and SSH config sorted by name
+    """
+    hosts = make_hosts({
+        "b": {"hostname": "b.aws", "user": "ubuntu", "port": 22, "key": "~/.ssh/k.pem", "forward_agent": True},
+        "a": {"hostname": "a.aws", "user": "ubuntu", "port": 22, "key": "~/.ssh/k.pem", "forward_agent": True},
+    })
+    assert [host.name for host in hosts] == ["a", "b"]
+
+    host = Host.from_config("c", {"HostName": "10.0.0.1", "Port": "2222", "ForwardAgent": "yes"})
+    assert host.address() == ("ubuntu", "10.0.0.1", 2222)
+    assert host.forward_agent and host.key is None
+
+
+class TestExecutor(object):
+    """
+    Executor should
+    """
+
+    def test_run(self, sshd):
+        """
+        run commands on every host over one connection per host
+        """
+        lines = []
+        pool = ConnectionPool()
+        executor = Executor(pool, width=2, stream=lambda host, line: lines.append((str(host), line)))
+        hosts = make_fleet(sshd)
+
+        try:
+            results = executor.run(hosts, "echo hello; echo world 1>&2")
+            assert [result.host for result in results] == hosts
+            assert all(result.ok for result in results)
+            assert results[0].output == "hello\nworld\n"
+            assert sorted(lines)[:2] == [("alia-0", "hello"), ("alia-0", "world")]
+
+            results = executor.run(hosts, "echo again")
+            assert all(result.output == "again\n" for result in results)
+            assert sshd.connections == 4
+            assert len(sshd.commands) == 8
+            assert len(pool) == 4
+
+            # Dropped connections are reopened by the next command
+            sshd.disconnect()
+            assert all(result.ok for result in executor.run(hosts, "true"))
+            assert sshd.connections == 8
+        finally:
+            pool.close()
+
+    def test_failures(self, sshd):
+        """
+        report failed, unreachable and timed out hosts in the results
+        """
+        pool = ConnectionPool(timeout=1)
+        executor = Executor(pool, timeout=0.5)
+        hosts = make_fleet(sshd, 2) + [Host("gone", "127.0.0.1", port=1, key=sshd.key)]
+
+        try:
+            failed, _, gone = executor.run(hosts, "echo failed; exit 3")
+            assert not failed.ok and failed.status == 3
+            assert failed.summary() == "exit 3: failed"
+            assert not gone.ok and gone.status is None
+            assert gone.error is not None
+
+            slow = executor.run(hosts[:1], "echo started; sleep 5")[0]
+            assert slow.error == "timeout: timed out after 0.5s"
+            assert slow.output == "started\n"
+            assert slow.summary() == "error: timeout: timed out after 0.5s"
+        finally:
+            pool.close()
+
+    def test_summarize(self, sshd):
+        """
+        count the hosts with each distinct output
+        """
+        pool = ConnectionPool()
+        hosts = make_fleet(sshd)
+        try:
+            results = Executor(pool).run(hosts, "echo go1.10")
+            results[-1].status = 1
+            assert summarize(results) == [
+                ["Output", "Hosts", "Percent"],
+                ["go1.10", 3, 75.0],
+                ["exit 1: go1.10", 1, 25.0],
+            ]
+        finally:
+            pool.close()
+
+
+def test_exec_command(sshd, tmpdir, capsys):
+    """
+    Test the exec command runs a command on the hosts of an SSH config
+    """
+    config = tmpdir.join("geonet.config")
+    for host in make_fleet(sshd, 3):
+        config.write((
+            "Host {}\n    HostName {}\n    Port {}\n    IdentityFile {}\n\n"
+        ).format(host.name, host.hostname, host.port, host.key), mode="a")
+
+    utility = GeoNetUtility.load()
+    argv = ["exec", "-c", str(config), "-H", "alia-0", "-H", "alia-2", "echo", "hi"]
+    utility.prepare(argv)
+    args = utility.parser.parse_args(argv)
+    assert args.func(args) is None
+
+    out = capsys.readouterr()[0]
+    assert "[alia-0] hi" in out and "[alia-2] hi" in out
+    assert "[alia-1]" not in out
+    assert "100.0" in out
+
+    args = utility.parser.parse_args(["exec", "-c", str(config), "-q", "exit", "2"])
+    with pytest.raises(RemoteCommandFailed) as excinfo:
+        args.func(args)
+    assert "command failed on 3 of 3 hosts" in str(excinfo.value)
+    pool.close()
@@ -0,0 +1,188 @@
+# tests.test_rollout
+# Tests for rolling maintenance tasks out to hosts in waves
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Wed Oct 28 11:17:53 2026 -0400
+#
+# ID: test_rollout.py [] benjamin@bengfort.com $
+
+"""
+Tests for rolling maintenance tasks out to hosts in waves
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import pytest
+
+from geonet.rollout import *
+from geonet.remote import Host, Result, pool
+from geonet.console import GeoNetUtility
+from geonet.exceptions import RemoteCommandFailed
+
+from tests.fake_sshd import FakeSSHD
+
+
+REGIONS = ("us-east-1", "eu-west-1", "ap-south-1")
+
+
+class Task(object):
+    """
+    Records the waves it is run on and fails the named hosts.
+    """
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.waves = []
+
+    def __call__(self, hosts):
+        self.waves.append([host.name for host in hosts])
+        return [
+            Result(host, status=1 if host.name in self.fail else 0)
+            for host in hosts
+        ]
+
+
+def make_fleet(n=12):
+    return [
+        Host("alia-{:02d}".format(idx), "127.0.0.1", region=REGIONS[idx % len(REGIONS)])
+        for idx in range(n)
+    ]
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_parse_window():
+    """
+    Test windows are parsed from a number or percent of the hosts
+    """
+    assert parse_window(5, 100) == 5
+    assert parse_window("10%", 100) == 10
+    assert parse_window("10%", 5) == 1
+    assert parse_window("0", 5) == 1
+    assert parse_window("10%", 5, minimum=0) == 0
+
+    with pytest.raises(ValueError):
+        parse_window("-1", 5)
+
+
+class TestRollout(object):
+    """
+    Rollout should
+    """
+
+    def test_waves(self):
+        """
+        split the hosts into windows that do not cross regions by region
+        """
+        hosts = make_fleet()
+        waves = Rollout(Task(), window="25%").waves(hosts)
+        assert [len(wave) for wave in waves] == [3, 3, 3, 3]
+
+        waves = Rollout(Task(), window=3, by_region=True).waves(hosts)
+        assert [len(wave) for wave in waves] == [3, 1, 3, 1, 3, 1]
+        for wave in waves:
+            assert len(set(host.region for host in wave)) == 1
+        assert waves[0][0].region == "ap-south-1"
+
+    def test_run(self):
+        """
+        run the task on every host a wave at a time
+        """
+        task = Task()
+        progress = []
+        rollout = Rollout(task, window=5, callback=lambda *args: progress.append(args[:2]))
+        report = rollout.run(make_fleet())
+
+        assert [len(wave) for wave in task.waves] == [5, 5, 2]
+        assert progress == [(0, 3), (1, 3), (2, 3)]
+        assert report.waves == 3 and not report.halted
+        assert len(report.succeeded) == 12
+        assert report.failed == report.skipped == []
+
+    def test_failure_budget(self):
+        """
+        halt the rollout once more hosts have failed than the budget allows
+        """
+        task = Task(fail=("alia-01", "alia-05"))
+        report = Rollout(task, window=2, max_failures=1).run(make_fleet())
+
+        assert report.halted and report.waves == 3
+        assert [host.name for host in report.failed] == ["alia-01", "alia-05"]
+        assert len(report.succeeded) == 4
+        assert len(report.skipped) == 6
+
+        # A percent budget of the hosts
+        report = Rollout(Task(fail=("alia-01", "alia-05")), window=2, max_failures="20%").run(make_fleet())
+        assert not report.halted and len(report.failed) == 2
+
+    def test_health_check(self):
+        """
+        wait for the health check of each wave to pass before the next wave
+        """
+        attempts = []
+
+        def check(hosts):
+            attempts.append([host.name for host in hosts])
+            return [
+                Result(host, status=0 if len(attempts) > 1 or host.name != "alia-00" else 255)
+                for host in hosts
+            ]
+
+        task = Task(fail=("alia-01",))
+        rollout = Rollout(
+            task, window=2, check=check, check_interval=0.01, warn_only=True,
+        )
+        report = rollout.run(make_fleet(4))
+        assert not report.halted and len(report.succeeded) == 4
+
+        # The hosts that did not pass are checked again, then the next wave
+        assert attempts == [["alia-00", "alia-01"], ["alia-00"], ["alia-02", "alia-03"]]
+
+    def test_check_timeout(self):
+        """
+        fail the hosts that do not pass the health check in time
+        """
+        def check(hosts):
+            return [Result(host, error="timeout: timed out") for host in hosts]
+
+        rollout = Rollout(Task(), window=2, check=check, check_timeout=0.05, check_interval=0.02)
+        report = rollout.run(make_fleet(4))
+        assert report.halted and report.waves == 1
+        assert report.results["alia-00"].error == "timeout: timed out"
+
+
+def test_rollout_command(tmpdir, capsys):
+    """
+    Test the rollout command runs a command on the hosts of an SSH config in waves
+    """
+    with FakeSSHD() as sshd:
+        config = tmpdir.join("geonet.config")
+        for idx in range(4):
+            config.write((
+                "Host alia-{}\n    HostName 127.0.0.1\n    Port {}\n    IdentityFile {}\n\n"
+            ).format(idx, sshd.port, sshd.key), mode="a")
+
+        utility = GeoNetUtility.load()
+        argv = [
+            "rollout", "-c", str(config), "-q", "--window", "50%",
+            "--check", "true", "--", "echo", "updated",
+        ]
+        utility.prepare(argv)
+        args = utility.parser.parse_args(argv)
+        try:
+            assert args.func(args) is None
+            out = capsys.readouterr()[0]
+            assert "wave 1/2 (unknown): 2 ok, 0 failed" in out
+            assert "wave 2/2 (unknown): 2 ok, 0 failed" in out
+            assert len(sshd.commands) == 8
+
+            args = utility.parser.parse_args(["rollout", "-c", str(config), "-q", "exit", "1"])
+            with pytest.raises(RemoteCommandFailed) as excinfo:
+                args.func(args)
+            assert "rollout halted after 1 hosts failed, 3 hosts were skipped" in str(excinfo.value)
+        finally:
+            pool.close()
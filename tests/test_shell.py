@@ -0,0 +1,135 @@
+# tests.test_shell
+# Tests for the interactive geonet shell
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Sun Oct 25 10:40:17 2026 -0400
+#
+# ID: test_shell.py [] benjamin@bengfort.com $
+
+"""
+Tests for the interactive geonet shell
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import pytest
+import geonet.region
+import geonet.managed
+
+from StringIO import StringIO
+
+from geonet.shell import *
+from geonet.config import settings
+from geonet.console import GeoNetUtility
+
+from tests.fake_ec2 import FakeEC2
+
+
+REGIONS = ["us-east-1", "eu-west-1"]
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture
+def fake(tmpdir, monkeypatch):
+    """
+    Configures the regions with instances in a fake EC2 and no data on disk.
+    """
+    monkeypatch.setattr(geonet.region, "REGIONDATA", str(tmpdir.join("regions.json")))
+    monkeypatch.setattr(geonet.managed, "INSTANCES", str(tmpdir.join("instances.json")))
+
+    configured = settings.regions[:]
+    settings.regions[:] = REGIONS
+    with FakeEC2(REGIONS) as fake:
+        fake["us-east-1"].add_instances(2, TagSpecifications=[{
+            "ResourceType": "instance", "Tags": [{"Key": "Name", "Value": "alia-1"}],
+        }])
+        fake["eu-west-1"].add_instances(1)
+        yield fake
+    settings.regions[:] = configured
+
+
+def run_shell(*lines, **kwargs):
+    """
+    Runs the lines in a shell, returning the shell and what it wrote.
+    """
+    stdout = StringIO()
+    stdin = StringIO("\n".join(lines + ("exit",)) + "\n")
+    shell = GeoNetShell(GeoNetUtility.load(), stdin=stdin, stdout=stdout, **kwargs)
+    shell.use_rawinput = False
+    shell.loop()
+    return shell, stdout.getvalue()
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+class TestGeoNetShell(object):
+    """
+    GeoNetShell should
+    """
+
+    def test_warm_caches(self, fake, capsys):
+        """
+        run commands repeatedly with warm regions and describe calls
+        """
+        path = daemon.path
+        shell, output = run_shell("descr instances", "descr -f plain instances")
+
+        assert fake.calls["describe_instances"] == len(REGIONS)
+        assert capsys.readouterr()[0].count("alia-1") == 4
+        assert INTRO in output
+
+        # The shell cleans up after itself
+        assert daemon.path == path
+        assert shell.server is None
+        assert geonet.region._registry is None
+
+    def test_no_inventory(self, fake):
+        """
+        call EC2 directly without the inventory and keep the regions
+        """
+        run_shell("descr instances", "descr instances", inventory=False)
+        assert fake.calls["describe_instances"] == 2 * len(REGIONS)
+
+        # Loaded regions keep their connections while the shell runs
+        keep_regions()
+        try:
+            first = [region.conn for region in Regions.load()]
+            assert [region.conn for region in Regions.load()] == first
+        finally:
+            keep_regions(False)
+
+    def test_errors(self, fake):
+        """
+        report errors and usage without exiting
+        """
+        _, output = run_shell(
+            "unknown", "descr", "descr 'unclosed", "shell", "descr instances -x"
+        )
+        assert output.count("unknown command") == 2
+        assert "No closing quotation" in output
+
+    def test_completion(self, fake):
+        """
+        complete commands, options, regions and instances
+        """
+        shell, _ = run_shell()
+        assert shell.completenames("latency:r") == ["latency:relays"]
+        assert shell.completenames("sta") == ["start", "status"]
+        assert "shell" not in shell.completenames("")
+        assert shell.completedefault("--a", "descr --a", 6, 9) == ["--all-regions"]
+
+        shell.start()
+        try:
+            shell.execute(["descr", "instances"])
+            assert shell.completedefault("us", "status us", 7, 9) == ["us-east-1"]
+            assert shell.completedefault("alia", "status alia", 7, 11) == ["alia-1"]
+            assert len(shell.completedefault("i-", "status i-", 7, 9)) == 3
+        finally:
+            shell.stop()
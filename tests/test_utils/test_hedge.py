@@ -0,0 +1,161 @@
+# tests.test_utils.test_hedge
+# Tests for hedging slow idempotent calls
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Mon Oct 26 10:36:15 2026 -0400
+#
+# ID: test_hedge.py [] benjamin@bengfort.com $
+
+"""
+Tests for hedging slow idempotent calls
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import time
+import pytest
+import threading
+import geonet.region
+
+from geonet.config import settings, HedgeConfiguration
+from geonet.region import Region
+from geonet.utils.hedge import *
+
+from tests.fake_ec2 import FakeEC2
+
+
+KEY = ("us-east-1", "describe_instances")
+
+
+class Endpoint(object):
+    """
+    Answers calls after the given delays in order, then after the last one.
+    """
+
+    def __init__(self, *delays, **kwargs):
+        self.delays = list(delays)
+        self.fail = kwargs.get("fail", ())
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            call = self.calls
+            self.calls += 1
+        time.sleep(self.delays[min(call, len(self.delays) - 1)])
+        if call in self.fail:
+            raise IOError("call {} failed".format(call))
+        return call
+
+
+def make_hedger(budget=0.05, burst=2, latency=0.01):
+    """
+    Returns a hedger whose calls with KEY have observed the latency.
+    """
+    config = HedgeConfiguration()
+    config.budget = budget
+    config.burst = burst
+
+    hedger = Hedger(config, Latencies(None))
+    for _ in range(MIN_SAMPLES):
+        hedger.latencies.observe(KEY, latency)
+    return hedger
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_latencies():
+    """
+    Test only the recent latencies are used to estimate the quantile
+    """
+    latencies = Latencies(None, window=40)
+    for idx in range(MIN_SAMPLES - 1):
+        latencies.observe(KEY, 1.0)
+    assert latencies.quantile(KEY, 95) is None
+
+    for idx in range(40):
+        latencies.observe(KEY, (idx + 1) / 100.0)
+    assert len(latencies.durations[KEY]) == 40
+    assert latencies.quantile(KEY, 95) == 0.38
+    assert latencies.quantile(KEY, 50) == 0.2
+
+
+class TestHedger(object):
+    """
+    Hedger should
+    """
+
+    def test_hedge(self):
+        """
+        use the duplicate call if the first call is slow
+        """
+        hedger = make_hedger()
+        endpoint = Endpoint(0.5, 0.01)
+
+        started = time.time()
+        assert hedger.call(KEY, endpoint) == 1
+        assert time.time() - started < 0.25
+        assert hedger.hedges == 1 and hedger.wins == 1
+
+        # Fast calls are not hedged
+        assert hedger.call(KEY, Endpoint(0.0)) == 0
+        assert hedger.calls == 2 and hedger.hedges == 1
+
+    def test_unknown(self):
+        """
+        not hedge calls without enough observed latencies
+        """
+        hedger = make_hedger()
+        endpoint = Endpoint(0.1, 0.0)
+        assert hedger.call(("eu-west-1", "describe_instances"), endpoint) == 0
+        assert endpoint.calls == 1
+        assert len(hedger.latencies.durations[("eu-west-1", "describe_instances")]) == 1
+
+    def test_budget(self):
+        """
+        cap the number of hedges with the budget
+        """
+        hedger = make_hedger(budget=0.0, burst=1)
+        assert hedger.call(KEY, Endpoint(0.2, 0.0)) == 1
+
+        endpoint = Endpoint(0.2, 0.0)
+        assert hedger.call(KEY, endpoint) == 0
+        assert endpoint.calls == 1
+        assert hedger.hedges == 1
+
+    def test_errors(self):
+        """
+        raise an error only if every call failed
+        """
+        hedger = make_hedger()
+        assert hedger.call(KEY, Endpoint(0.2, 0.0, fail=(0,))) == 1
+
+        with pytest.raises(IOError):
+            hedger.call(KEY, Endpoint(0.2, 0.0, fail=(0, 1)))
+
+        # Errors before the quantile latency are not hedged
+        endpoint = Endpoint(0.0, fail=(0,))
+        with pytest.raises(IOError):
+            hedger.call(KEY, endpoint)
+        time.sleep(0.05)
+        assert endpoint.calls == 1
+
+    def test_region_describe(self, monkeypatch):
+        """
+        hedge region describe calls when enabled
+        """
+        hedger = make_hedger()
+        monkeypatch.setattr(geonet.region, "hedger", hedger)
+        monkeypatch.setattr(settings.hedge, "enabled", True)
+
+        with FakeEC2(["us-east-1"]) as fake:
+            fake["us-east-1"].add_instances(2)
+            region = Region({"RegionName": "us-east-1"})
+            assert len(region.instances()) == 2
+
+        assert hedger.calls == 1
+        assert len(hedger.latencies.durations[KEY]) == MIN_SAMPLES + 1
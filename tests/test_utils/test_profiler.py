@@ -0,0 +1,116 @@
+# tests.test_utils.test_profiler
+# Tests for the CPU and memory profiler
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Fri Oct 23 11:40:12 2026 -0400
+#
+# ID: test_profiler.py [] benjamin@bengfort.com $
+
+"""
+Tests for the CPU and memory profiler
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import pstats
+import pytest
+import threading
+
+from geonet.utils.async import wait
+from geonet.utils.profiler import *
+
+
+class Allocated(object):
+    pass
+
+
+def fanout_task():
+    return sum(range(1000))
+
+
+def allocate(n):
+    return [Allocated() for _ in range(n)]
+
+
+def after_stop():
+    return sum(range(1000))
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+class TestProfiler(object):
+    """
+    Profiler should
+    """
+
+    def test_threads(self, tmpdir):
+        """
+        combine the profiles of threads started by wait
+        """
+        with Profiler() as profiler:
+            results = wait([fanout_task] * 4)
+        assert results == [499500] * 4
+        assert len(profiler.profiles) > 1
+
+        path = str(tmpdir.join("geonet.prof"))
+        profiler.dump(path)
+        functions = [func[2] for func in pstats.Stats(path).stats]
+        assert "fanout_task" in functions
+        assert "profiled" in profiler.summary()
+
+    def test_stop_threads(self):
+        """
+        stop collecting the profiles of threads still running
+        """
+        stopped = threading.Event()
+
+        def straggler():
+            stopped.wait()
+            after_stop()
+
+        with Profiler() as profiler:
+            thread = threading.Thread(target=straggler)
+            thread.start()
+
+        stopped.set()
+        thread.join()
+
+        assert len(profiler.profiles) > 1
+        functions = [func[2] for func in profiler.stats().stats]
+        assert "after_stop" not in functions
+
+    def test_memory(self):
+        """
+        report the top allocations
+        """
+        with Profiler(cpu=False, memory=True) as profiler:
+            objects = allocate(5000)
+
+        assert not profiler.profiles
+        allocations = profiler.allocations()
+        assert allocations
+        if tracemalloc is None:
+            names = [name for name, _, _ in allocations]
+            assert "Allocated" in names
+            assert dict((row[0], row[2]) for row in allocations)["Allocated"] >= len(objects)
+
+        summary = profiler.summary()
+        assert "peak memory" in summary
+
+    def test_not_collected(self):
+        """
+        raise an error if a profile was not collected
+        """
+        profiler = Profiler(cpu=False)
+        profiler.start()
+        profiler.stop()
+
+        with pytest.raises(ValueError):
+            profiler.stats()
+
+        with pytest.raises(ValueError):
+            profiler.allocations()
@@ -0,0 +1,182 @@
+# tests.test_utils.test_schedule
+# Tests for scheduling jobs by their expected duration
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Sun Oct 25 15:12:40 2026 -0400
+#
+# ID: test_schedule.py [] benjamin@bengfort.com $
+
+"""
+Tests for scheduling jobs by their expected duration
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import json
+import time
+import pytest
+
+from functools import partial
+
+from geonet.utils import async
+from geonet.region import Region
+from geonet.ec2 import Instances
+from geonet.utils.schedule import *
+
+
+class Job(object):
+    """
+    Sleeps for a duration in a region.
+    """
+
+    def __init__(self, region, duration):
+        self.region = region
+        self.duration = duration
+
+    def run(self):
+        self.started = time.time()
+        time.sleep(self.duration)
+        self.finished = time.time()
+        return self.region
+
+
+def makespan(jobs):
+    return max(job.finished for job in jobs) - min(job.started for job in jobs)
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_job_key():
+    """
+    Test jobs are identified by their region and operation
+    """
+    region = Region({"RegionName": "ap-southeast-2"})
+    assert job_key(region.instances) == ("ap-southeast-2", "Region.instances")
+
+    instances = Instances([], region=region)
+    assert job_key(instances.update_statuses) == ("ap-southeast-2", "Instances.update_statuses")
+
+    def handle_region(region, args):
+        pass
+
+    assert job_key(partial(handle_region, region)) == ("ap-southeast-2", "handle_region")
+    assert job_key(handle_region, (region, None)) == ("ap-southeast-2", "handle_region")
+    assert job_key(handle_region, ("us-east-1",)) is None
+    assert job_key(time.time) is None
+
+
+def test_job_key_region_attribute():
+    """
+    Test region attributes that are names are used and methods are ignored
+    """
+    class Entry(object):
+        region = "eu-west-1"
+
+    class Poller(object):
+        def region(self, name):
+            pass
+
+        def refresh(self, entry):
+            pass
+
+    poller = Poller()
+    assert region_of(Entry()) == "eu-west-1"
+    assert region_of(poller) is None
+    assert job_key(poller.refresh) is None
+    assert job_key(partial(poller.refresh, Entry())) == ("eu-west-1", "Poller.refresh")
+
+
+class TestHistory(object):
+    """
+    History should
+    """
+
+    def test_observe(self, tmpdir):
+        """
+        average the observed durations of jobs and persist them
+        """
+        path = str(tmpdir.join("history.json"))
+        history = History(path, alpha=0.5)
+        assert history.expected(("us-east-1", "Region.instances")) is None
+
+        history.observe(("us-east-1", "Region.instances"), 1.0)
+        history.observe(("us-east-1", "Region.instances"), 2.0)
+        history.observe(("eu-west-1", "Region.zones"), 0.5)
+        assert history.expected(("us-east-1", "Region.instances")) == 1.5
+
+        history.dump()
+        with open(path) as f:
+            assert json.load(f)["us-east-1"] == {"Region.instances": 1.5}
+
+        loaded = History(path)
+        assert len(loaded) == 2
+        assert loaded.expected(("eu-west-1", "Region.zones")) == 0.5
+
+    def test_missing(self, tmpdir):
+        """
+        not write the history to a missing directory or read a corrupt one
+        """
+        history = History(str(tmpdir.join("missing", "history.json")))
+        history.observe(("us-east-1", "Region.instances"), 1.0)
+        history.dump()
+        assert not tmpdir.join("missing").exists()
+
+        path = tmpdir.join("history.json")
+        path.write("{not json")
+        assert len(History(str(path))) == 0
+
+    def test_order(self):
+        """
+        order jobs longest first with unknown jobs before known ones
+        """
+        history = History(None)
+        history.observe(("us-east-1", "Region.instances"), 0.1)
+        history.observe(("ap-south-1", "Region.instances"), 0.9)
+        history.observe(("eu-west-1", "Region.instances"), 0.4)
+
+        keys = [
+            ("us-east-1", "Region.instances"),
+            ("eu-west-1", "Region.instances"),
+            ("ap-south-1", "Region.instances"),
+            ("sa-east-1", "Region.instances"),
+            None,
+        ]
+        assert history.order(keys) == [3, 4, 2, 1, 0]
+        assert History(None).order(keys) == [0, 1, 2, 3, 4]
+
+
+def test_wait_longest_first(monkeypatch):
+    """
+    Test bounded fan outs start the longest jobs first once they are known
+    """
+    monkeypatch.setattr(async, "history", History(None))
+    jobs = [Job("us-east-1", 0.1), Job("us-east-2", 0.1), Job("us-west-1", 0.1), Job("ap-south-1", 0.3)]
+
+    # The first fan out starts the slow job last since it is unknown
+    results = async.wait([job.run for job in jobs], width=2)
+    assert results == [job.region for job in jobs]
+    assert makespan(jobs) == pytest.approx(0.4, abs=0.05)
+
+    # Once observed, the slow job is started first
+    results = async.wait([job.run for job in jobs], width=2)
+    assert results == [job.region for job in jobs]
+    assert makespan(jobs) == pytest.approx(0.3, abs=0.05)
+
+
+def test_wait_unscheduled(monkeypatch):
+    """
+    Test jobs that are not scheduled are neither ordered nor recorded
+    """
+    history = History(None)
+    monkeypatch.setattr(async, "history", history)
+    jobs = [Job("us-east-1", 0.01), Job("eu-west-1", 0.01)]
+
+    assert async.wait([job.run for job in jobs], schedule=False) == ["us-east-1", "eu-west-1"]
+    assert len(history) == 0
+
+    async.wait([job.run for job in jobs])
+    assert len(history) == 2
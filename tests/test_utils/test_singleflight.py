@@ -0,0 +1,140 @@
+# tests.test_utils.test_singleflight
+# Tests for coalescing identical concurrent calls
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Fri Oct 23 15:10:26 2026 -0400
+#
+# ID: test_singleflight.py [] benjamin@bengfort.com $
+
+"""
+Tests for coalescing identical concurrent calls
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import time
+import pytest
+import threading
+
+from geonet.region import Region
+from geonet.utils.async import wait
+from geonet.utils.singleflight import *
+
+from tests.fake_ec2 import FakeEC2, constant
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_normalize():
+    """
+    Test parameters are normalized regardless of key order
+    """
+    assert normalize({"a": 1, "b": [1, 2]}) == normalize({"b": [1, 2], "a": 1})
+    assert normalize({"a": [1, 2]}) != normalize({"a": [2, 1]})
+
+
+class TestSingleFlight(object):
+    """
+    SingleFlight should
+    """
+
+    def test_coalesce(self):
+        """
+        share one call between concurrent callers with the same key
+        """
+        group = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def slow(value):
+            calls.append(value)
+            started.set()
+            time.sleep(0.2)
+            return {"value": value}
+
+        def call():
+            return group.do("key", slow, 42)
+
+        def follow():
+            started.wait()
+            return call()
+
+        results = wait([call] + [follow] * 4)
+        assert calls == [42]
+        assert group.shared == 4
+        assert len(group) == 0
+        assert all(result == {"value": 42} for result in results)
+
+        # Every caller has its own copy of the result
+        assert len(set(id(result) for result in results)) == 5
+
+        # Calls are not cached once they land
+        assert group.do("key", slow, 7) == {"value": 7}
+        assert calls == [42, 7]
+
+    def test_errors(self):
+        """
+        raise the error of the in-flight call in every caller
+        """
+        group = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.2)
+            raise KeyError("missing")
+
+        def follow():
+            started.wait()
+            return group.do("key", fail)
+
+        def call(func):
+            try:
+                func()
+            except KeyError as e:
+                return e
+
+        errors = wait([
+            lambda: call(lambda: group.do("key", fail)),
+            lambda: call(follow),
+        ])
+        assert all(isinstance(error, KeyError) for error in errors)
+        assert group.shared == 1
+
+    def test_region_describe(self):
+        """
+        coalesce identical concurrent describe calls to a region
+        """
+        with FakeEC2(["us-east-1"], latency=constant(0.2)) as fake:
+            fake["us-east-1"].add_instances(3)
+            region = Region({"RegionName": "us-east-1"})
+
+            results = wait([region.instances] * 5)
+            assert fake.calls["describe_instances"] == 1
+            assert all(len(instances) == 3 for instances in results)
+
+            # Calls with different parameters are not coalesced
+            wait([
+                region.instances,
+                lambda: region.instances(Filters=[{"Name": "instance-state-name", "Values": ["running"]}]),
+            ])
+            assert fake.calls["describe_instances"] == 3
+
+    def test_distinct_keys(self):
+        """
+        not coalesce calls with different keys
+        """
+        group = SingleFlight()
+        results = wait([
+            lambda: group.do("a", lambda: time.sleep(0.1) or "a"),
+            lambda: group.do("b", lambda: time.sleep(0.1) or "b"),
+        ])
+        assert results == ["a", "b"]
+        assert group.shared == 0
+
+        with pytest.raises(ValueError):
+            group.do("c", int, "not a number")
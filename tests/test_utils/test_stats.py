@@ -0,0 +1,188 @@
+# tests.test_utils.test_stats
+# Tests for the AWS API call recorder
+#
+# Author:  Benjamin Bengfort <benjamin@bengfort.com>
+# Created: Wed Oct 21 11:48:31 2026 -0400
+#
+# ID: test_stats.py [] benjamin@bengfort.com $
+
+"""
+Tests for the AWS API call recorder
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import json
+import boto3
+import pytest
+import threading
+
+from StringIO import StringIO
+from botocore.stub import Stubber
+from geonet.utils.stats import *
+from geonet.utils.timer import tracer
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture
+def client():
+    client = boto3.client(
+        "ec2", region_name="eu-west-1",
+        aws_access_key_id="testing", aws_secret_access_key="testing",
+    )
+    return client
+
+
+##########################################################################
+## Test Cases
+##########################################################################
+
+def test_percentile():
+    """
+    Test nearest-rank percentiles of sorted values
+    """
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 100) == 100
+    assert percentile([7], 1) == 7
+    assert percentile([], 50) is None
+
+
+class TestCallRecorder(object):
+    """
+    CallRecorder should
+    """
+
+    def test_instrument(self, client):
+        """
+        record the calls made by an instrumented client
+        """
+        recorder = CallRecorder()
+        recorder.instrument(client)
+
+        with Stubber(client) as stub:
+            stub.add_response("describe_regions", {"Regions": []})
+            stub.add_client_error(
+                "describe_instances", "RequestLimitExceeded", http_status_code=503
+            )
+
+            client.describe_regions()
+            with pytest.raises(Exception):
+                client.describe_instances()
+
+        records = list(recorder)
+        assert len(records) == 2
+        assert [r["operation"] for r in records] == ["DescribeRegions", "DescribeInstances"]
+        assert all(r["service"] == "ec2" and r["region"] == "eu-west-1" for r in records)
+        assert all(r["duration"] > 0 for r in records)
+        assert records[0]["status"] == 200 and records[0]["error"] is None
+        assert records[1]["status"] == 503
+        assert records[1]["error"] == "RequestLimitExceeded"
+
+    def test_trace_spans(self, client):
+        """
+        record calls as spans when tracing is enabled
+        """
+        recorder = CallRecorder()
+        recorder.instrument(client)
+
+        tracer.clear()
+        tracer.enabled = True
+        try:
+            with Stubber(client) as stub:
+                stub.add_response("describe_regions", {"Regions": []})
+                with tracer.span("command") as root:
+                    client.describe_regions()
+        finally:
+            tracer.enabled = False
+
+        span = tracer.spans[0]
+        tracer.clear()
+        assert span.name == "ec2.DescribeRegions"
+        assert span.parent is root
+        assert span.attributes["region"] == "eu-west-1"
+        assert span.attributes["operation"] == "DescribeRegions"
+        assert span.attributes["status"] == 200
+
+    def test_call_error(self):
+        """
+        record calls that fail without a response
+        """
+        recorder = CallRecorder()
+        context = {"client_region": "us-east-1"}
+        recorder.start_call(context=context)
+        recorder.after_call_error(
+            exception=IOError("connection reset"), context=context,
+            event_name="after-call-error.ec2.DescribeVolumes",
+        )
+
+        record = list(recorder)[0]
+        assert record["operation"] == "DescribeVolumes"
+        assert record["error"] == "IOError"
+        assert record["status"] is None
+
+    def test_thread_safe(self):
+        """
+        record calls made concurrently from many threads
+        """
+        recorder = CallRecorder()
+
+        def calls():
+            for _ in range(500):
+                recorder.record(None, {"client_region": "us-east-1"}, operation="Op")
+
+        threads = [threading.Thread(target=calls) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(recorder) == 4000
+        recorder.clear()
+        assert len(recorder) == 0
+
+    def test_summary(self):
+        """
+        summarize calls by region and operation
+        """
+        recorder = CallRecorder()
+        for idx in range(1, 21):
+            region = "us-east-1" if idx % 2 else "eu-west-1"
+            recorder.record(None, {"client_region": region}, operation="Op", duration=idx)
+        recorder.record(None, {"client_region": "eu-west-1"}, operation="Fail", duration=1, error="Err", retries=2)
+
+        summary = recorder.summary("region")
+        assert [row["region"] for row in summary] == ["eu-west-1", "us-east-1"]
+        assert summary[0]["calls"] == 11
+        assert summary[0]["errors"] == 1
+        assert summary[0]["retries"] == 2
+        assert summary[1]["p50"] == 9
+        assert summary[1]["p95"] == 19
+        assert summary[1]["max"] == 19
+
+        operations = recorder.summary("operation")
+        assert [row["operation"] for row in operations] == ["Fail", "Op"]
+        assert "eu-west-1" in recorder.report()
+
+    def test_dump(self):
+        """
+        dump the raw records as NDJSON
+        """
+        recorder = CallRecorder()
+        recorder.record(None, {"client_region": "us-east-1"}, operation="A")
+        recorder.record(None, {"client_region": "us-east-2"}, operation="B")
+
+        f = StringIO()
+        recorder.dump(f)
+        lines = f.getvalue().strip().split("\n")
+        assert len(lines) == 2
+
+        record = json.loads(lines[1])
+        assert record["region"] == "us-east-2"
+        assert set(record) == set(FIELDS)
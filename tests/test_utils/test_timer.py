@@ -15,8 +15,26 @@ Tests for the timer utility
 ##########################################################################
 
 import time
+import json
+import pytest
+import threading
 
+from StringIO import StringIO
 from geonet.utils.timer import *
+from geonet.utils.async import wait
+
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+@pytest.fixture
+def tracing():
+    tracer.clear()
+    tracer.enabled = True
+    yield tracer
+    tracer.enabled = False
+    tracer.clear()
 
 
 ##########################################################################
@@ -52,3 +70,132 @@ def test_timeit():
     result, timer = output
     assert result == 42
     assert isinstance(timer, Timer)
+
+
+def test_clocks():
+    """
+    Test the timer uses high resolution clocks
+    """
+    assert Timer().time is perf_counter
+    assert Timer(wall_clock=False).time is process_time
+
+
+##########################################################################
+## Tracing Tests
+##########################################################################
+
+def test_nested_spans(tracing):
+    """
+    Test spans nest within the active span of the thread
+    """
+    with tracing.span("root", region="us-east-1") as root:
+        assert current_span() is root
+        with tracing.span("child") as child:
+            child.set(operation="DescribeInstances")
+        assert current_span() is root
+
+    assert current_span() is None
+    assert child.parent is root
+    assert root.parent is None
+    assert child.attributes == {"operation": "DescribeInstances"}
+    assert root.started <= child.started <= child.finished <= root.finished
+    assert [span.name for span in tracing.spans] == ["child", "root"]
+
+
+def test_span_error(tracing):
+    """
+    Test spans record the exception that finished them
+    """
+    with pytest.raises(ValueError):
+        with tracing.span("failure"):
+            raise ValueError("bad")
+
+    assert tracing.spans[0].attributes["error"] == "ValueError"
+
+
+def test_disabled_tracer():
+    """
+    Test a disabled tracer does not record spans
+    """
+    tracer = Tracer()
+    with tracer.span("ignored") as span:
+        pass
+    assert len(tracer) == 0
+    assert span.elapsed >= 0
+
+
+def test_trace_decorator(tracing):
+    """
+    Test the trace decorator records a span per call
+    """
+    @trace(operation="answer")
+    def answer():
+        return 42
+
+    assert answer() == 42
+    assert answer() == 42
+    assert [span.name for span in tracing.spans] == ["answer", "answer"]
+    assert tracing.spans[0].attributes == {"operation": "answer"}
+
+
+class Region(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+    def instances(self):
+        with tracer.span("ec2.DescribeInstances", region=self.name):
+            time.sleep(0.01)
+        return threading.current_thread().name
+
+
+def test_wait_propagation(tracing):
+    """
+    Test spans propagate to the threads spawned by wait
+    """
+    regions = [Region("us-east-1"), Region("eu-west-1"), Region("ap-south-1")]
+    with tracing.span("geonet status") as root:
+        threads = wait(region.instances for region in regions)
+
+    assert all(thread != threading.current_thread().name for thread in threads)
+
+    tasks = [span for span in tracing.spans if span.name == "Region.instances"]
+    calls = [span for span in tracing.spans if span.name == "ec2.DescribeInstances"]
+    assert len(tasks) == len(calls) == 3
+    assert all(task.parent is root for task in tasks)
+    assert sorted(task.attributes["target"] for task in tasks) == sorted(map(str, regions))
+    assert all(call.parent in tasks for call in calls)
+    assert all(call.thread is call.parent.thread for call in calls)
+
+
+def test_export(tracing):
+    """
+    Test exporting spans as Chrome trace events
+    """
+    def describe():
+        with tracer.span("task", region="eu-west-1"):
+            pass
+
+    with tracing.span("root"):
+        wait([describe])
+
+    f = StringIO()
+    tracing.export(f)
+    trace = json.loads(f.getvalue())
+
+    events = trace["traceEvents"]
+    spans = {e["name"]: e for e in events if e["ph"] == "X"}
+    assert set(spans) == {"root", "task", "describe"}
+    assert spans["task"]["args"]["region"] == "eu-west-1"
+    assert spans["task"]["args"]["parent"] == spans["describe"]["args"]["id"]
+    assert spans["root"]["ts"] <= spans["task"]["ts"]
+    assert spans["task"]["dur"] >= 0
+
+    # A flow links the root to the task running in another thread
+    flows = [e for e in events if e["ph"] in ("s", "f")]
+    assert len(flows) == 2
+    assert {e["tid"] for e in flows} == {spans["root"]["tid"], spans["describe"]["tid"]}
+    assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in events)